@@ -1,20 +1,16 @@
 """
 LCS-based word-level answer checker for dictation practice.
-Includes proper-noun leniency via fuzzy matching and AI semantic equivalence
-via LLM proxy (OpenAI-compatible API).
+Includes proper-noun leniency via fuzzy matching and semantic equivalence via
+local rules, a persistent verdict cache and an LLM proxy (OpenAI-compatible API).
 """
 import json
 import re
-import ssl
-import urllib.error
-import urllib.request
 from difflib import SequenceMatcher
+from typing import NamedTuple
 
-from django.conf import settings
+from vocabulary import llm_client
 
-_SSL_CTX = ssl.create_default_context()
-_SSL_CTX.check_hostname = False
-_SSL_CTX.verify_mode = ssl.CERT_NONE
+from .equivalence import cached_verdicts, store_verdicts
 
 _STRIP_PUNCT = re.compile(r"[.,!?;:'\"\-\(\)\[\]]")
 
@@ -67,35 +63,73 @@ def _get_proper_noun_set(reference_raw: str) -> set[str]:
     return proper
 
 
+class PreparedReference(NamedTuple):
+    """Everything the checker derives from a reference transcript alone."""
+    words: tuple[str, ...]
+    proper_nouns: frozenset[str]
+
+
+def prepare_reference(reference: str) -> PreparedReference:
+    return PreparedReference(tuple(normalize(reference)), frozenset(_get_proper_noun_set(reference)))
+
+
 def _similar(a: str, b: str, threshold: float = 0.72) -> bool:
     """True if two strings are sufficiently similar (for proper-noun leniency)."""
     if not a or not b:
         return False
-    return SequenceMatcher(None, a, b).ratio() >= threshold
+    matcher = SequenceMatcher(None, a, b)
+    # The quick ratios are cheap upper bounds on ratio(); most misses stop there.
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
 
+# ── Bit-parallel LCS + backtracking ────────────────────────────────────────
+#
+# Row i of the classic LCS table is encoded as one integer V_i with a bit per
+# user word: bit j-1 of V_i is 0 exactly where dp[i][j] = dp[i][j-1] + 1
+# (Allison-Dix / Hyyrö). Each row costs a handful of big-int operations, so
+# the table is built in O(m * n / word size) instead of m * n Python steps,
+# and dp[i][j] is recovered as the number of zero bits below position j.
 
-# ── LCS table + backtracking ───────────────────────────────────────────────
+def _match_masks(user: list) -> dict:
+    """Bitmask of the positions of every distinct word in `user`."""
+    masks: dict = {}
+    for j, word in enumerate(user):
+        masks[word] = masks.get(word, 0) | (1 << j)
+    return masks
 
-def _lcs_table(a: list, b: list) -> list[list[int]]:
-    m, n = len(a), len(b)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if a[i - 1] == b[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-            else:
-                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-    return dp
 
+def _lcs_rows(ref: list, user: list) -> list[int]:
+    full = (1 << len(user)) - 1
+    masks = _match_masks(user)
+    v = full
+    rows = [v]
+    for word in ref:
+        u = v & masks.get(word, 0)
+        v = ((v + u) | (v - u)) & full
+        rows.append(v)
+    return rows
 
-def _backtrack(dp, ref, user):
+
+def _lcs_at(rows: list[int], i: int, j: int) -> int:
+    """dp[i][j] of the LCS table encoded by `rows`."""
+    return j - (rows[i] & ((1 << j) - 1)).bit_count()
+
+
+def _backtrack(rows, ref, user):
+    # Same walk and tie-breaking as a full-table backtrack: take a match when
+    # the current words are equal, otherwise prefer an extra user word unless
+    # dropping the reference word keeps a longer LCS.
     alignment = []
     i, j = len(ref), len(user)
     while i > 0 or j > 0:
         if i > 0 and j > 0 and ref[i - 1] == user[j - 1]:
             alignment.append((ref[i - 1], user[j - 1]))
             i -= 1; j -= 1
-        elif j > 0 and (i == 0 or dp[i][j - 1] >= dp[i - 1][j]):
+        elif j > 0 and (i == 0 or _lcs_at(rows, i, j - 1) >= _lcs_at(rows, i - 1, j)):
             alignment.append((None, user[j - 1]))  # extra
             j -= 1
         else:
@@ -105,6 +139,16 @@ def _backtrack(dp, ref, user):
     return alignment
 
 
+def align(ref: list, user: list) -> list[tuple]:
+    """
+    Align two word lists along a longest common subsequence.
+
+    Returns (ref_word, user_word) pairs in order; ref_word is None for an
+    extra user word and user_word is None for a missing reference word.
+    """
+    return _backtrack(_lcs_rows(ref, user), ref, user)
+
+
 # ── Semantic equivalence via LM Studio ────────────────────────────────────
 
 def _collect_wrong_spans(tokens: list[dict]) -> list[tuple[int, int, str, str]]:
@@ -134,14 +178,32 @@ def _collect_wrong_spans(tokens: list[dict]) -> list[tuple[int, int, str, str]]:
 
 def _batch_semantic_check(pairs: list[tuple[str, str]]) -> list[bool]:
     """
-    Send a batch of (ref_phrase, user_phrase) pairs to LM Studio and return
-    a list of booleans — True if semantically equivalent.
+    Return a list of booleans for (ref_phrase, user_phrase) pairs — True if
+    semantically equivalent.
 
-    Falls back to all-False if LM Studio is unavailable.
+    Pairs are resolved by the local rule table and the verdict cache first;
+    only unknown pairs are sent to the LLM, and its answers are cached.
+    Unknown pairs count as not equivalent if the LLM is unavailable.
     """
     if not pairs:
         return []
 
+    verdicts = cached_verdicts(pairs)
+    unknown = list(dict.fromkeys(pair for pair in pairs if pair not in verdicts))
+    if unknown:
+        results = _ask_llm(unknown)
+        if results is not None:
+            fresh = dict(zip(unknown, results))
+            store_verdicts(fresh)
+            verdicts.update(fresh)
+    return [verdicts.get(pair, False) for pair in pairs]
+
+
+def _ask_llm(pairs: list[tuple[str, str]]) -> list[bool] | None:
+    """
+    Send a batch of pairs to the LLM and return its verdicts, or None if it
+    is unavailable or its reply cannot be parsed.
+    """
     lines = "\n".join(
         f'{i}. reference: "{ref}" | student: "{usr}"'
         for i, (ref, usr) in enumerate(pairs, 1)
@@ -160,26 +222,8 @@ def _batch_semantic_check(pairs: list[tuple[str, str]]) -> list[bool]:
         f"{str([True] * n).lower().replace('true', 'true').replace('false', 'false')}"
     )
 
-    payload = {
-        "model": settings.LLM_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0,
-        "max_tokens": max(16, n * 8),
-    }
-
     try:
-        req = urllib.request.Request(
-            settings.LLM_URL,
-            data=json.dumps(payload).encode(),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {settings.LLM_API_KEY}",
-            },
-            method="POST",
-        )
-        with urllib.request.urlopen(req, timeout=settings.LLM_TIMEOUT, context=_SSL_CTX) as resp:
-            data = json.loads(resp.read())
-        content = data["choices"][0]["message"]["content"].strip()
+        content = llm_client.chat(prompt, temperature=0, max_tokens=max(16, n * 8))
         start = content.find('[')
         end   = content.rfind(']') + 1
         if start >= 0 and end > start:
@@ -195,39 +239,20 @@ def _batch_semantic_check(pairs: list[tuple[str, str]]) -> list[bool]:
                         for i in range(n)
                     ]
     except Exception:
-        pass  # LM Studio not running or bad response — degrade gracefully
+        pass  # LLM unavailable (or breaker open) or bad response — degrade gracefully
 
-    return [False] * len(pairs)
+    return None
 
 
 # ── Main compare ───────────────────────────────────────────────────────────
 
-def compare(reference: str, user_input: str) -> dict:
-    """
-    Compare user input against reference transcript.
-
-    Statuses per token:
-      'correct'  — exact match
-      'proper'   — proper noun accepted via fuzzy match (counts as correct)
-      'semantic' — semantically equivalent per AI check (counts as correct)
-      'wrong'    — substitution (incorrect)
-      'missing'  — word absent from user input
-      'extra'    — word typed by user that has no match in reference
-
-    Returns:
-    {
-        "score":          float,
-        "correct_count":  int,
-        "total_count":    int,
-        "proper_count":   int,
-        "semantic_count": int,
-        "tokens":         list[dict],
-        "transcript":     str,   # added by view
-    }
-    """
-    ref_words  = normalize(reference)
+def _align_tokens(reference: str, user_input: str, prepared: PreparedReference | None = None) -> dict:
+    """Score an answer by alignment and proper-noun leniency only."""
+    if prepared is None:
+        prepared = prepare_reference(reference)
+    ref_words  = list(prepared.words)
     user_words = normalize(user_input)
-    proper_set = _get_proper_noun_set(reference)
+    proper_set = prepared.proper_nouns
 
     if not ref_words:
         return {"score": 1.0, "correct_count": 0, "total_count": 0,
@@ -239,8 +264,7 @@ def compare(reference: str, user_input: str) -> dict:
         return {"score": 0.0, "correct_count": 0, "total_count": len(ref_words),
                 "proper_count": 0, "semantic_count": 0, "tokens": tokens}
 
-    dp        = _lcs_table(ref_words, user_words)
-    alignment = _backtrack(dp, ref_words, user_words)
+    alignment = align(ref_words, user_words)
 
     # Raw tokens before substitution merging
     raw: list[dict] = []
@@ -289,31 +313,90 @@ def compare(reference: str, user_input: str) -> dict:
             correct_count += 1
             proper_count  += 1
 
-    # Semantic equivalence pass — batch-check remaining wrong spans via LM Studio
-    semantic_count = 0
-    spans = _collect_wrong_spans(merged)
-    if spans:
-        pairs   = [(ref_phrase, usr_phrase) for _, _, ref_phrase, usr_phrase in spans]
-        results = _batch_semantic_check(pairs)
-        for (start, end, _, _), is_equiv in zip(spans, results):
-            if is_equiv:
-                # Count reference words in this span before marking
-                ref_token_count = sum(
-                    1 for t in merged[start:end]
-                    if t['status'] in ('wrong', 'missing')
-                )
-                for tok in merged[start:end]:
-                    tok['status'] = 'semantic'
-                correct_count  += ref_token_count
-                semantic_count += ref_token_count
-
-    score = round(correct_count / len(ref_words), 4) if ref_words else 1.0
-
     return {
-        "score":          score,
+        "score":          round(correct_count / len(ref_words), 4),
         "correct_count":  correct_count,
         "total_count":    len(ref_words),
         "proper_count":   proper_count,
-        "semantic_count": semantic_count,
+        "semantic_count": 0,
         "tokens":         merged,
     }
+
+
+def _apply_semantic(result: dict, spans: list, verdicts: list[bool]) -> None:
+    """Mark the spans judged equivalent as 'semantic' and update the counts and score."""
+    tokens = result['tokens']
+    for (start, end, _, _), is_equiv in zip(spans, verdicts):
+        if is_equiv:
+            # Count reference words in this span before marking
+            ref_token_count = sum(
+                1 for t in tokens[start:end]
+                if t['status'] in ('wrong', 'missing')
+            )
+            for tok in tokens[start:end]:
+                tok['status'] = 'semantic'
+            result['correct_count']  += ref_token_count
+            result['semantic_count'] += ref_token_count
+    if result['total_count']:
+        result['score'] = round(result['correct_count'] / result['total_count'], 4)
+
+
+def compare(reference: str, user_input: str) -> dict:
+    """
+    Compare user input against reference transcript.
+
+    Statuses per token:
+      'correct'  — exact match
+      'proper'   — proper noun accepted via fuzzy match (counts as correct)
+      'semantic' — semantically equivalent per AI check (counts as correct)
+      'wrong'    — substitution (incorrect)
+      'missing'  — word absent from user input
+      'extra'    — word typed by user that has no match in reference
+
+    Returns:
+    {
+        "score":          float,
+        "correct_count":  int,
+        "total_count":    int,
+        "proper_count":   int,
+        "semantic_count": int,
+        "tokens":         list[dict],
+        "transcript":     str,   # added by view
+    }
+    """
+    result = _align_tokens(reference, user_input)
+
+    # Semantic equivalence pass — batch-check remaining wrong spans via LM Studio
+    spans = _collect_wrong_spans(result['tokens'])
+    if spans:
+        pairs = [(ref_phrase, usr_phrase) for _, _, ref_phrase, usr_phrase in spans]
+        _apply_semantic(result, spans, _batch_semantic_check(pairs))
+    return result
+
+
+def compare_fast(reference: str, user_input: str, prepared: PreparedReference | None = None) -> dict:
+    """
+    First phase of a two-phase check: everything compare() does without
+    waiting for the LLM.
+
+    Wrong spans are settled by the local rules and the verdict cache; spans
+    still undecided are listed in "pending_spans" for finish_semantic().
+    `prepared` skips re-deriving the reference words and proper nouns.
+    """
+    result = _align_tokens(reference, user_input, prepared)
+
+    spans = _collect_wrong_spans(result['tokens'])
+    known = cached_verdicts([(ref_phrase, usr_phrase) for _, _, ref_phrase, usr_phrase in spans])
+    settled = [span for span in spans if (span[2], span[3]) in known]
+    _apply_semantic(result, settled, [known[(span[2], span[3])] for span in settled])
+    result['pending_spans'] = [list(span) for span in spans if (span[2], span[3]) not in known]
+    return result
+
+
+def finish_semantic(result: dict) -> dict:
+    """Second phase: judge a compare_fast() result's pending spans with the LLM."""
+    spans = result.pop('pending_spans', [])
+    if spans:
+        pairs = [(ref_phrase, usr_phrase) for _, _, ref_phrase, usr_phrase in spans]
+        _apply_semantic(result, spans, _batch_semantic_check(pairs))
+    return result
@@ -0,0 +1,84 @@
+"""
+Two-phase dictation answer checking.
+
+The first phase (checker.compare_fast) aligns the answer, applies proper-noun
+leniency and settles wrong spans from the local rules and the verdict cache,
+so the user sees a score immediately. Spans nobody has judged yet are stored
+on a DictationCheck and sent to the LLM in the background; the client polls
+the check for the upgraded tokens. Attempts saved against a check (and the
+user's progress on the segment) are rescored when its semantic pass finishes.
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from vocabulary import jobs
+
+from .checker import compare_fast, finish_semantic
+from .models import DictationCheck
+from .progress import rescore_attempts
+from .references import SegmentReference
+
+logger = logging.getLogger(__name__)
+
+
+def public_result(result: dict) -> dict:
+    """Checker output as sent to the client (without the internal span list)."""
+    return {key: value for key, value in result.items() if key != 'pending_spans'}
+
+
+def start_check(user, reference: SegmentReference, user_input: str):
+    """
+    Run the fast pass; returns (result, check).
+
+    `check` is None when the fast pass already settled every span, otherwise
+    a pending DictationCheck whose semantic pass has been queued.
+    """
+    result = compare_fast(reference.transcript, user_input, reference.prepared)
+    if not result['pending_spans']:
+        return public_result(result), None
+
+    check = DictationCheck.objects.create(
+        user=user, segment_id=reference.segment_id, user_input=user_input, result=result,
+    )
+    # The user is waiting on the result, so it goes ahead of imports and quiz top-ups
+    jobs.enqueue(run_semantic_pass, check.pk, priority=jobs.INTERACTIVE_PRIORITY)
+    return public_result(result), check
+
+
+def run_semantic_pass(check_id: int):
+    """Judge a check's pending spans, store the final result and rescore its attempts."""
+    check = DictationCheck.objects.get(pk=check_id)
+    status = DictationCheck.STATUS_DONE
+    result = check.result
+    try:
+        result = finish_semantic(dict(result))
+    except Exception:
+        logger.exception("Semantic pass for dictation check %s failed", check.pk)
+        status = DictationCheck.STATUS_FAILED
+        result = public_result(result)
+
+    with transaction.atomic():
+        DictationCheck.objects.filter(pk=check.pk).update(
+            status=status, result=result, finished_at=timezone.now(),
+        )
+        rescore_attempts(check, result['score'])
+
+
+def final_score(check: DictationCheck):
+    """The check's final score, or None while its semantic pass is running."""
+    check.refresh_from_db(fields=['status', 'result'])
+    if check.status == DictationCheck.STATUS_PENDING:
+        return None
+    return check.result['score']
+
+
+def check_status(check: DictationCheck) -> dict:
+    return {
+        'check_id': check.pk,
+        'status': check.status,
+        'semantic_pending': check.status == DictationCheck.STATUS_PENDING,
+        **public_result(check.result),
+    }
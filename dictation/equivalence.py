@@ -0,0 +1,173 @@
+"""
+Semantic-equivalence verdicts for dictation checking.
+
+A (reference phrase, student phrase) pair is resolved in three steps:
+
+1. Local rules: both phrases are rewritten to a canonical form (contractions
+   and informal forms expanded, titles and units spelled one way, number words
+   turned into digits). Pairs with the same canonical form are equivalent.
+2. The persistent verdict cache (SemanticVerdict), keyed by the canonical
+   pair, so an answer judged once by the model is never sent again.
+3. Whatever is left goes to the LLM; its verdicts are stored in the cache.
+"""
+
+import hashlib
+import re
+
+from .models import SemanticVerdict
+
+# Single normalised tokens (lowercase, apostrophes and hyphens already
+# stripped by checker.normalize) and what they mean.
+_TOKEN_RULES = {
+    # Informal forms and contractions
+    'gonna': 'going to', 'wanna': 'want to', 'gotta': 'got to', 'kinda': 'kind of',
+    'sorta': 'sort of', 'outta': 'out of', 'lotta': 'lot of', 'dunno': 'do not know',
+    'gimme': 'give me', 'lemme': 'let me', 'ya': 'you', 'ok': 'okay',
+    'dont': 'do not', 'doesnt': 'does not', 'didnt': 'did not', 'cant': 'can not',
+    'cannot': 'can not', 'wont': 'will not', 'isnt': 'is not', 'arent': 'are not',
+    'wasnt': 'was not', 'werent': 'were not', 'havent': 'have not', 'hasnt': 'has not',
+    'hadnt': 'had not', 'wouldnt': 'would not', 'couldnt': 'could not',
+    'shouldnt': 'should not', 'mustnt': 'must not', 'neednt': 'need not',
+    'im': 'i am', 'youre': 'you are', 'theyre': 'they are', 'ive': 'i have',
+    'youve': 'you have', 'weve': 'we have', 'theyve': 'they have', 'youll': 'you will',
+    'theyll': 'they will', 'itll': 'it will', 'hes': 'he is', 'shes': 'she is',
+    'thats': 'that is', 'theres': 'there is', 'whats': 'what is', 'wheres': 'where is',
+    'whos': 'who is', 'hows': 'how is', 'yall': 'you all',
+    # Titles
+    'mr': 'mister', 'mrs': 'missus', 'ms': 'miss', 'dr': 'doctor', 'prof': 'professor',
+    # Units and symbols, each spelled one way
+    '%': 'percent', '°': 'degrees', '°c': 'degrees celsius', '°f': 'degrees fahrenheit',
+    'degree': 'degrees', 'centigrade': 'celsius', '&': 'and',
+    'km': 'kilometres', 'kilometre': 'kilometres', 'kilometer': 'kilometres', 'kilometers': 'kilometres',
+    'm': 'metres', 'metre': 'metres', 'meter': 'metres', 'meters': 'metres',
+    'cm': 'centimetres', 'centimetre': 'centimetres', 'centimeter': 'centimetres', 'centimeters': 'centimetres',
+    'mm': 'millimetres', 'millimetre': 'millimetres', 'millimeter': 'millimetres', 'millimeters': 'millimetres',
+    'kg': 'kilograms', 'kilogram': 'kilograms', 'kilo': 'kilograms', 'kilos': 'kilograms',
+    'g': 'grams', 'gram': 'grams', 'lb': 'pounds', 'lbs': 'pounds',
+    'mph': 'miles per hour', 'kmh': 'kilometres per hour', 'min': 'minutes', 'mins': 'minutes',
+    'hr': 'hours', 'hrs': 'hours', 'sec': 'seconds', 'secs': 'seconds',
+}
+
+# A number glued to a unit or symbol: "80°c", "5km", "50%"
+_NUMBER_WITH_UNIT = re.compile(r'^(\d+(?:\.\d+)?)([a-z°%]+)$')
+
+_UNITS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17,
+    'eighteen': 18, 'nineteen': 19,
+}
+_TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+_SCALES = {'hundred': 100, 'thousand': 1000, 'million': 1_000_000}
+
+# "twentyfive" — what normalize() leaves of "twenty-five"
+_NUMBER_WORDS = dict(_UNITS, **_TENS)
+for _tens_word, _tens in _TENS.items():
+    for _unit_word, _unit in list(_UNITS.items())[1:10]:
+        _NUMBER_WORDS[_tens_word + _unit_word] = _tens + _unit
+
+
+def _expand(words: list[str]) -> list[str]:
+    out = []
+    for word in words:
+        match = _NUMBER_WITH_UNIT.match(word)
+        if match and (match.group(2) in _TOKEN_RULES or match.group(2) in ('percent', 'degrees')):
+            out.append(match.group(1))
+            word = match.group(2)
+        out.extend(_TOKEN_RULES.get(word, word).split())
+    return out
+
+
+def _collapse_numbers(words: list[str]) -> list[str]:
+    """Replace runs of number words ("two hundred and five") with digits."""
+    out = []
+    total = current = 0
+    in_number = False
+
+    def flush():
+        nonlocal total, current, in_number
+        if in_number:
+            out.append(str(total + current))
+        total = current = 0
+        in_number = False
+
+    for idx, word in enumerate(words):
+        if word in _NUMBER_WORDS:
+            last = current % 100
+            value = _NUMBER_WORDS[word]
+            if in_number and last and not (last in _TENS.values() and value < 10):
+                flush()  # "two three" is two numbers, not 5
+            current += _NUMBER_WORDS[word]
+            in_number = True
+        elif word in _SCALES and in_number:
+            scale = _SCALES[word]
+            if scale == 100:
+                current *= 100
+            else:
+                total += current * scale
+                current = 0
+        elif (
+            word == 'and' and in_number
+            and idx + 1 < len(words) and words[idx + 1] in _NUMBER_WORDS
+        ):
+            continue
+        else:
+            flush()
+            out.append(word)
+    flush()
+    return out
+
+
+def canonical(phrase: str) -> str:
+    """Canonical form of a normalised phrase under the local rule table."""
+    return ' '.join(_collapse_numbers(_expand(phrase.split())))
+
+
+def rule_equivalent(reference: str, student: str) -> bool:
+    """True when the local rules alone show the two phrases mean the same."""
+    return canonical(reference) == canonical(student)
+
+
+def _key(reference: str, student: str) -> str:
+    return hashlib.sha256(f"{canonical(reference)}\x00{canonical(student)}".encode()).hexdigest()
+
+
+def cached_verdicts(pairs: list[tuple[str, str]]) -> dict:
+    """
+    Verdicts known without asking the model, keyed by pair.
+
+    Pairs the rules accept are equivalent; other pairs are looked up in the
+    verdict cache in one query. Pairs missing from the result are unknown.
+    """
+    verdicts = {}
+    keys = {}
+    for pair in pairs:
+        if rule_equivalent(*pair):
+            verdicts[pair] = True
+        else:
+            keys[_key(*pair)] = pair
+    if keys:
+        for key, is_equivalent in SemanticVerdict.objects.filter(key__in=list(keys)).values_list(
+            'key', 'is_equivalent'
+        ):
+            verdicts[keys[key]] = is_equivalent
+    return verdicts
+
+
+def store_verdicts(verdicts: dict) -> None:
+    """Persist model verdicts ({(reference, student): bool}) to the cache."""
+    SemanticVerdict.objects.bulk_create(
+        [
+            SemanticVerdict(
+                key=_key(reference, student),
+                reference_phrase=canonical(reference),
+                student_phrase=canonical(student),
+                is_equivalent=is_equivalent,
+            )
+            for (reference, student), is_equivalent in verdicts.items()
+        ],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,163 @@
+"""
+Background ingestion of YouTube videos for dictation practice.
+
+api_process_video only registers the video and queues it; a background
+worker fetches the subtitles, segments them, reads the oembed metadata and
+inserts the segments in chunks, recording its progress on the DictationVideo
+row for the status endpoint to report. Once the video is ready its quiz pool
+is filled in the background as well.
+
+Each video is ingested once even when several users submit it at the same
+time: the row is unique per video_id, so only the request that creates it
+(or that claims a failed or unconfirmed one) queues a job, and the worker
+runs under a per-video single-flight lock. A video left queued or processing
+after its job is gone (the worker died and the job ran out of attempts) is
+claimed again the same way.
+"""
+
+import logging
+
+from django.conf import settings
+
+from vocabulary import jobs
+from vocabulary.concurrency import SingleFlight
+
+from .models import DictationSegment, DictationVideo
+from .quiz_pool import queue_fill
+from .youtube_service import build_segments, fetch_oembed_metadata, fetch_subtitles
+
+logger = logging.getLogger(__name__)
+
+LONG_VIDEO_SECONDS = 1800
+SEGMENT_CHUNK_SIZE = 200
+
+_ingest_flight = SingleFlight()
+
+
+def _update(video_pk: int, **fields):
+    DictationVideo.objects.filter(pk=video_pk).update(**fields)
+
+
+def _job_key(video_pk: int) -> str:
+    return f'dictation.ingest:{video_pk}'
+
+
+def start_ingestion(video_id: str, user, confirm_long: bool = False) -> DictationVideo:
+    """
+    Register a video and queue its ingestion unless it is already queued,
+    running or done. Returns the video row.
+    """
+    video, created = DictationVideo.objects.get_or_create(
+        video_id=video_id,
+        defaults={'title': video_id, 'added_by': user, 'confirm_long': confirm_long},
+    )
+    if not created:
+        # Retry a failed ingestion, or resume one waiting for the long-video confirmation
+        retryable = [DictationVideo.STATUS_FAILED]
+        if confirm_long:
+            retryable.append(DictationVideo.STATUS_NEEDS_CONFIRMATION)
+        if jobs.active_job(_job_key(video.pk)) is None:
+            retryable += [DictationVideo.STATUS_QUEUED, DictationVideo.STATUS_PROCESSING]
+        fields = {'status': DictationVideo.STATUS_QUEUED, 'progress': 0.0, 'error': ''}
+        if confirm_long:
+            fields['confirm_long'] = True
+        claimed = DictationVideo.objects.filter(pk=video.pk, status__in=retryable).update(**fields)
+        video.refresh_from_db()
+        if not claimed:
+            return video
+
+    jobs.enqueue(run_ingestion, video.pk, dedup_key=_job_key(video.pk), priority=5)
+    video.refresh_from_db()  # The job may already have run (eager mode, or outside a transaction)
+    return video
+
+
+def run_ingestion(video_pk: int):
+    video_id = DictationVideo.objects.values_list('video_id', flat=True).get(pk=video_pk)
+    return _ingest_flight.do(video_id, _ingest, video_pk)
+
+
+def _ingest(video_pk: int):
+    video = DictationVideo.objects.get(pk=video_pk)
+    if video.status not in (DictationVideo.STATUS_QUEUED, DictationVideo.STATUS_PROCESSING):
+        return
+    _update(video.pk, status=DictationVideo.STATUS_PROCESSING, progress=0.05)
+
+    try:
+        transcript_entries, source = fetch_subtitles(video.video_id)
+        total_duration = sum(float(e.get('duration', 0)) for e in transcript_entries)
+        if total_duration > LONG_VIDEO_SECONDS and not video.confirm_long:
+            _update(video.pk, status=DictationVideo.STATUS_NEEDS_CONFIRMATION, progress=0.0,
+                    duration_seconds=int(total_duration))
+            return
+        _update(video.pk, progress=0.4)
+
+        segment_dicts = build_segments(
+            transcript_entries,
+            max_duration=settings.DICTATION_SEGMENT_MAX,
+            min_duration=settings.DICTATION_SEGMENT_MIN,
+            target_duration=settings.DICTATION_SEGMENT_TARGET,
+        )
+        if not segment_dicts:
+            raise ValueError('No segments could be extracted from subtitles')
+        _update(video.pk, progress=0.5)
+
+        title, thumbnail, channel = fetch_oembed_metadata(video.video_id)
+        _update(video.pk, progress=0.6)
+
+        for start in range(0, len(segment_dicts), SEGMENT_CHUNK_SIZE):
+            chunk = segment_dicts[start:start + SEGMENT_CHUNK_SIZE]
+            segments = [
+                DictationSegment(
+                    video_id=video.pk,
+                    order=s['order'],
+                    start_time=s['start_time'],
+                    end_time=s['end_time'],
+                    transcript=s['transcript'],
+                    word_count=s['word_count'],
+                )
+                for s in chunk
+            ]
+            for segment in segments:
+                segment.prepare_reference()
+            DictationSegment.objects.bulk_create(segments, ignore_conflicts=True)
+            done = min(start + SEGMENT_CHUNK_SIZE, len(segment_dicts))
+            _update(video.pk, progress=0.6 + 0.4 * done / len(segment_dicts))
+    except Exception as e:
+        logger.warning('Ingestion failed for %s: %s', video.video_id, e)
+        _update(video.pk, status=DictationVideo.STATUS_FAILED, error=str(e))
+        return
+
+    _update(
+        video.pk,
+        title=title,
+        thumbnail_url=thumbnail,
+        channel_name=channel,
+        duration_seconds=int(total_duration) if total_duration else None,
+        subtitle_source=source,
+        segment_count=len(segment_dicts),
+        is_processed=True,
+        status=DictationVideo.STATUS_READY,
+        progress=1.0,
+    )
+    queue_fill(video.pk)
+
+
+def ingestion_status(video: DictationVideo) -> dict:
+    data = {
+        'video_id': video.video_id,
+        'status': video.status,
+        'progress': round(video.progress, 3),
+        'error': video.error,
+        'title': video.title,
+        'thumbnail_url': video.thumbnail_url,
+        'channel_name': video.channel_name,
+        'segment_count': video.segment_count,
+        'subtitle_source': video.subtitle_source,
+        'finished': video.status in (DictationVideo.STATUS_READY, DictationVideo.STATUS_FAILED),
+    }
+    if video.status == DictationVideo.STATUS_NEEDS_CONFIRMATION:
+        minutes = int((video.duration_seconds or 0) // 60)
+        data['duration_seconds'] = video.duration_seconds
+        data['warning'] = (f'This video is {minutes} minutes long and will generate many segments. '
+                           f'Re-submit with confirm_long=true to proceed.')
+    return data
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictation', '0003_quiz_video_fk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemanticVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('reference_phrase', models.TextField()),
+                ('student_phrase', models.TextField()),
+                ('is_equivalent', models.BooleanField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictation', '0004_semanticverdict'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DictationCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_input', models.TextField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('result', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('segment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checks', to='dictation.dictationsegment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dictation_checks', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dictationattempt',
+            name='answer_check',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attempts', to='dictation.dictationcheck'),
+        ),
+    ]
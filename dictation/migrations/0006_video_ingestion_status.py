@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:09
+
+from django.db import migrations, models
+
+
+def mark_processed_videos_ready(apps, schema_editor):
+    DictationVideo = apps.get_model('dictation', 'DictationVideo')
+    DictationVideo.objects.filter(is_processed=True).update(status='ready', progress=1.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictation', '0005_dictationcheck'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dictationvideo',
+            name='confirm_long',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='dictationvideo',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='dictationvideo',
+            name='progress',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='dictationvideo',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('confirm', 'Waiting for long-video confirmation'), ('ready', 'Ready'), ('failed', 'Failed')], default='queued', max_length=12),
+        ),
+        migrations.RunPython(mark_processed_videos_ready, migrations.RunPython.noop),
+    ]
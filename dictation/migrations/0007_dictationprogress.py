@@ -0,0 +1,59 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_progress(apps, schema_editor):
+    DictationAttempt = apps.get_model('dictation', 'DictationAttempt')
+    DictationProgress = apps.get_model('dictation', 'DictationProgress')
+
+    progress = {}
+    attempts = DictationAttempt.objects.order_by('created_at', 'id').values_list(
+        'id', 'user_id', 'segment_id', 'segment__video_id', 'score', 'revealed_answer',
+    )
+    for attempt_id, user_id, segment_id, video_id, score, revealed in attempts.iterator(chunk_size=2000):
+        row = progress.get((user_id, segment_id))
+        if row is None:
+            row = progress[(user_id, segment_id)] = DictationProgress(
+                user_id=user_id, segment_id=segment_id, video_id=video_id,
+                best_score=score, attempt_count=0,
+            )
+        row.latest_attempt_id = attempt_id
+        row.latest_score = score
+        row.best_score = max(row.best_score, score)
+        row.revealed = revealed
+        row.attempt_count += 1
+    DictationProgress.objects.bulk_create(progress.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictation', '0006_video_ingestion_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DictationProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latest_score', models.FloatField()),
+                ('best_score', models.FloatField()),
+                ('revealed', models.BooleanField(default=False)),
+                ('attempt_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('latest_attempt', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='dictation.dictationattempt')),
+                ('segment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_progress', to='dictation.dictationsegment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dictation_progress', to=settings.AUTH_USER_MODEL)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_progress', to='dictation.dictationvideo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'video'], name='dictation_d_user_id_94ce4a_idx')],
+                'unique_together': {('user', 'segment')},
+            },
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
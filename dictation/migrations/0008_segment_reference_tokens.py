@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictation', '0007_dictationprogress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dictationsegment',
+            name='proper_nouns',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='dictationsegment',
+            name='reference_tokens',
+            field=models.TextField(blank=True),
+        ),
+    ]
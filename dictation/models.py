@@ -10,6 +10,20 @@ class DictationVideo(models.Model):
         (SOURCE_AUTO, 'Auto-generated'),
     ]
 
+    # Ingestion state; a video is usable once it is ready (is_processed)
+    STATUS_QUEUED = 'queued'
+    STATUS_PROCESSING = 'processing'
+    STATUS_NEEDS_CONFIRMATION = 'confirm'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_NEEDS_CONFIRMATION, 'Waiting for long-video confirmation'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
     video_id = models.CharField(max_length=20, unique=True)
     title = models.CharField(max_length=500)
     thumbnail_url = models.URLField(blank=True)
@@ -26,6 +40,10 @@ class DictationVideo(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_processed = models.BooleanField(default=False)
     segment_count = models.IntegerField(default=0)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.FloatField(default=0.0)  # 0.0 – 1.0
+    error = models.TextField(blank=True)
+    confirm_long = models.BooleanField(default=False)  # user accepted processing a long video
 
     class Meta:
         ordering = ['-created_at']
@@ -55,6 +73,10 @@ class DictationSegment(models.Model):
     end_time = models.FloatField()
     transcript = models.TextField()
     word_count = models.IntegerField(default=0)
+    # Derived from the transcript at ingestion for the answer checker:
+    # space-separated normalised words and lowercased proper nouns
+    reference_tokens = models.TextField(blank=True)
+    proper_nouns = models.TextField(blank=True)
 
     class Meta:
         ordering = ['order']
@@ -63,11 +85,52 @@ class DictationSegment(models.Model):
     def __str__(self):
         return f'{self.video.title} – Segment {self.order}'
 
+    def prepare_reference(self):
+        """Fill reference_tokens and proper_nouns from the transcript."""
+        from .checker import prepare_reference
+
+        prepared = prepare_reference(self.transcript)
+        self.reference_tokens = ' '.join(prepared.words)
+        self.proper_nouns = ' '.join(sorted(prepared.proper_nouns))
+
     @property
     def duration(self):
         return round(self.end_time - self.start_time, 2)
 
 
+class DictationCheck(models.Model):
+    """
+    A checked answer whose semantic pass runs in the background.
+
+    `result` holds the checker output; while the check is pending it also
+    lists the spans still waiting for the LLM.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='dictation_checks',
+    )
+    segment = models.ForeignKey(DictationSegment, on_delete=models.CASCADE, related_name='checks')
+    user_input = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.user} – Seg {self.segment_id} – {self.status}'
+
+
 class DictationAttempt(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -78,6 +141,14 @@ class DictationAttempt(models.Model):
     user_input = models.TextField()
     score = models.FloatField()
     revealed_answer = models.BooleanField(default=False)
+    # Check whose semantic pass sets the final score, if it was still running when saved
+    answer_check = models.ForeignKey(
+        DictationCheck,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='attempts',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -92,6 +163,44 @@ class DictationAttempt(models.Model):
         return f'{self.user} – Seg {self.segment_id} – {self.score:.0%}'
 
 
+class DictationProgress(models.Model):
+    """
+    A user's standing on one segment, kept up to date as attempts are saved.
+
+    Denormalises the latest and best attempt so a video's progress is a
+    single indexed read instead of a scan of DictationAttempt.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='dictation_progress',
+    )
+    video = models.ForeignKey(DictationVideo, on_delete=models.CASCADE, related_name='user_progress')
+    segment = models.ForeignKey(DictationSegment, on_delete=models.CASCADE, related_name='user_progress')
+    latest_attempt = models.ForeignKey(
+        DictationAttempt,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    latest_score = models.FloatField()
+    best_score = models.FloatField()
+    revealed = models.BooleanField(default=False)  # latest attempt revealed the answer
+    attempt_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'segment']
+        indexes = [
+            models.Index(fields=['user', 'video']),
+        ]
+
+    def __str__(self):
+        return f'{self.user} – Seg {self.segment_id} – {self.latest_score:.0%}'
+
+
 class VideoQuiz(models.Model):
     video = models.ForeignKey(
         DictationVideo,
@@ -142,3 +251,17 @@ class UserQuizAttempt(models.Model):
 
     def __str__(self):
         return f'{self.user} – Quiz {self.quiz_id} – {self.score:.0%}'
+
+
+class SemanticVerdict(models.Model):
+    """Cached LLM verdict on whether a student phrase means the same as a reference phrase."""
+
+    key = models.CharField(max_length=64, unique=True)  # sha256 of the canonical pair
+    reference_phrase = models.TextField()
+    student_phrase = models.TextField()
+    is_equivalent = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        verdict = '=' if self.is_equivalent else '≠'
+        return f'"{self.reference_phrase}" {verdict} "{self.student_phrase}"'
@@ -0,0 +1,72 @@
+"""
+Per-segment dictation progress.
+
+DictationProgress holds each user's latest and best score per segment. It is
+updated whenever an attempt is saved or rescored, so reading the progress
+of a whole video never touches the attempt history.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import DictationAttempt, DictationProgress
+
+
+def record_attempt(attempt: DictationAttempt) -> None:
+    """Fold a newly saved attempt into the user's progress on its segment."""
+    changes = {
+        'latest_attempt': attempt,
+        'latest_score': attempt.score,
+        'best_score': Greatest('best_score', Value(attempt.score)),
+        'revealed': attempt.revealed_answer,
+        'attempt_count': F('attempt_count') + 1,
+        'updated_at': timezone.now(),
+    }
+    rows = DictationProgress.objects.filter(user_id=attempt.user_id, segment_id=attempt.segment_id)
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DictationProgress.objects.create(
+                user_id=attempt.user_id,
+                video_id=attempt.segment.video_id,
+                segment_id=attempt.segment_id,
+                latest_attempt=attempt,
+                latest_score=attempt.score,
+                best_score=attempt.score,
+                revealed=attempt.revealed_answer,
+                attempt_count=1,
+            )
+    except IntegrityError:
+        # Another request created the row first
+        rows.update(**changes)
+
+
+def rescore_attempts(check, score: float) -> None:
+    """Give the attempts saved against a check its final score, and update their progress row."""
+    attempt_ids = list(DictationAttempt.objects.filter(answer_check=check).values_list('id', flat=True))
+    if not attempt_ids:
+        return
+    DictationAttempt.objects.filter(id__in=attempt_ids).update(score=score)
+    DictationProgress.objects.filter(latest_attempt_id__in=attempt_ids).update(latest_score=score)
+    DictationProgress.objects.filter(user_id=check.user_id, segment_id=check.segment_id).update(
+        best_score=Greatest('best_score', Value(score)),
+    )
+
+
+def video_progress(user, video) -> dict:
+    """Progress on every attempted segment of a video, keyed by segment id."""
+    rows = DictationProgress.objects.filter(user=user, video=video).values_list(
+        'segment_id', 'latest_score', 'best_score', 'revealed', 'attempt_count',
+    )
+    return {
+        segment_id: {
+            'score': latest_score,
+            'best_score': best_score,
+            'revealed': revealed,
+            'attempts': attempt_count,
+        }
+        for segment_id, latest_score, best_score, revealed, attempt_count in rows
+    }
@@ -0,0 +1,108 @@
+"""
+Per-video pool of pre-generated comprehension quizzes.
+
+Generating a quiz takes one LLM call over the whole transcript (10–60s), so
+quizzes are generated ahead of time: a few once a video has been ingested,
+and one more in the background whenever a user is served the last quiz they
+have not taken yet. Serving a quiz is then a database read; the request only
+waits for the LLM when the pool for the video is still empty.
+"""
+
+import logging
+
+from django.db import transaction
+
+from vocabulary import jobs
+from vocabulary.concurrency import SingleFlight
+from vocabulary.sampling import random_row
+
+from .models import DictationVideo, QuizQuestion, VideoQuiz
+from .quiz_service import generate_quiz_questions
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 3        # quizzes generated ahead for every video
+MAX_POOL_SIZE = 10   # beyond this, users who took them all are served repeats
+AVOID_QUESTIONS = 30  # earlier questions shown to the model so new quizzes differ
+
+_fill_flight = SingleFlight()
+_create_flight = SingleFlight()
+
+
+def _transcript(video: DictationVideo) -> str:
+    return ' '.join(video.segments.order_by('order').values_list('transcript', flat=True))
+
+
+def create_quiz(video: DictationVideo) -> VideoQuiz:
+    """Generate one quiz with the LLM and add it to the pool. Raises RuntimeError if the LLM fails."""
+    avoid = list(
+        QuizQuestion.objects.filter(quiz__video=video)
+        .order_by('-quiz__created_at', 'order')
+        .values_list('question_text', flat=True)[:AVOID_QUESTIONS]
+    )
+    question_dicts = generate_quiz_questions(_transcript(video), avoid=avoid)
+    with transaction.atomic():
+        quiz = VideoQuiz.objects.create(video=video)
+        QuizQuestion.objects.bulk_create([
+            QuizQuestion(quiz=quiz, **q) for q in question_dicts
+        ])
+    return quiz
+
+
+def fill_pool(video_pk: int, target: int = POOL_SIZE) -> int:
+    """Generate quizzes until the video has `target` of them; returns how many were added."""
+    target = min(target, MAX_POOL_SIZE)
+    return _fill_flight.do((video_pk, target), _fill, video_pk, target)
+
+
+def _fill(video_pk: int, target: int) -> int:
+    video = DictationVideo.objects.get(pk=video_pk)
+    added = 0
+    while video.quizzes.count() < target:
+        try:
+            create_quiz(video)
+        except RuntimeError as e:
+            logger.warning('Quiz pool fill for %s stopped: %s', video.video_id, e)
+            break
+        added += 1
+    return added
+
+
+def queue_fill(video_pk: int, target: int = POOL_SIZE) -> None:
+    """
+    Queue a top-up of the pool, unless one to the same size is already queued
+    or running. A larger top-up runs alongside a smaller one; both stop once
+    the pool reaches their size, so together they never overshoot the larger.
+    """
+    target = min(target, MAX_POOL_SIZE)
+    jobs.enqueue(fill_pool, video_pk, target, dedup_key=f'dictation.quiz_pool:{video_pk}:{target}')
+
+
+def serve_quiz(user, video: DictationVideo) -> VideoQuiz:
+    """
+    A random quiz from the video's pool that the user has not taken yet.
+
+    Falls back to generating one on the spot when the pool is empty, and to
+    a quiz the user has already taken once the pool is full. Queues a top-up
+    when the user is down to their last untaken quiz. Raises RuntimeError if
+    a quiz had to be generated and the LLM failed.
+    """
+    untaken = video.quizzes.exclude(attempts__user=user)
+    untaken_count = untaken.count()
+    quiz = random_row(untaken, count=untaken_count)
+    pool_size = video.quizzes.count()
+
+    if quiz is None:
+        if pool_size < MAX_POOL_SIZE:
+            # Concurrent requests for the same empty pool share one generation
+            quiz = _create_flight.do(video.pk, create_quiz, video)
+            pool_size += 1
+        else:
+            quiz = random_row(video.quizzes.all(), count=pool_size)
+        remaining = 0
+    else:
+        remaining = untaken_count - 1
+
+    if remaining < 1 and pool_size < MAX_POOL_SIZE:
+        queue_fill(video.pk, target=max(POOL_SIZE, pool_size + 1))
+    return quiz
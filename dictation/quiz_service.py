@@ -2,15 +2,8 @@
 LLM integration for generating TOEIC-style comprehension quiz questions.
 """
 import json
-import ssl
-import urllib.error
-import urllib.request
 
-from django.conf import settings
-
-_SSL_CTX = ssl.create_default_context()
-_SSL_CTX.check_hostname = False
-_SSL_CTX.verify_mode = ssl.CERT_NONE
+from vocabulary import llm_client
 
 
 _PROMPT_TEMPLATE = """\
@@ -45,47 +38,41 @@ Respond ONLY with a valid JSON array of exactly 10 objects, no prose:
 """
 
 
-def generate_quiz_questions(transcript: str) -> list[dict]:
+_AVOID_TEMPLATE = """
+Earlier quizzes on this transcript already asked the questions below. Write
+different questions (other details, other inferences):
+{questions}
+"""
+
+
+def generate_quiz_questions(transcript: str, avoid: list[str] | None = None) -> list[dict]:
     """
-    Call LM Studio to generate 10 TOEIC-style multiple-choice questions.
+    Ask the LLM for 10 TOEIC-style multiple-choice questions.
+
+    `avoid` lists question texts from earlier quizzes on the same transcript;
+    the model is asked not to repeat them.
 
     Returns a list of 10 dicts, each with keys:
       order, question_text, choice_a, choice_b, choice_c, choice_d, correct_choice
 
-    Raises RuntimeError if LM Studio is unavailable or returns unparseable output
-    after 2 attempts.
+    Raises RuntimeError if the LLM is unavailable, or returns unparseable
+    output twice.
     """
     prompt = _PROMPT_TEMPLATE.format(transcript=transcript[:12000])  # cap at ~3k tokens
-    payload = {
-        "model": settings.LLM_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.3,
-        "max_tokens": 3000,
-    }
-    encoded = json.dumps(payload).encode()
-
+    if avoid:
+        prompt += _AVOID_TEMPLATE.format(questions='\n'.join(f'- {q}' for q in avoid))
     last_error = None
     for attempt in range(2):
         try:
-            req = urllib.request.Request(
-                settings.LLM_URL,
-                data=encoded,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {settings.LLM_API_KEY}",
-                },
-                method="POST",
-            )
-            with urllib.request.urlopen(req, timeout=settings.LLM_TIMEOUT, context=_SSL_CTX) as resp:
-                data = json.loads(resp.read())
-            content = data["choices"][0]["message"]["content"].strip()
+            # Each reply becomes its own quiz, so concurrent pool fills must not share one
+            content = llm_client.chat(prompt, temperature=0.3, max_tokens=3000, coalesce=False)
             questions = _parse_questions(content)
             if questions:
                 return questions
-            last_error = ValueError("Model returned unparseable or wrong-count response")
-        except (urllib.error.URLError, OSError) as e:
-            last_error = RuntimeError(f"LLM unavailable: {e}")
-        except Exception as e:
+            last_error = RuntimeError("Model returned unparseable or wrong-count response")
+        except llm_client.LLMUnavailable as e:
+            raise RuntimeError(str(e)) from e  # A second attempt would fail the same way
+        except llm_client.LLMError as e:
             last_error = RuntimeError(f"Unexpected error: {e}")
 
     raise last_error or RuntimeError("Failed to generate questions")
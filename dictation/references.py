@@ -0,0 +1,37 @@
+"""
+Reference transcripts for answer checking.
+
+A segment's transcript never changes after ingestion, so the words and
+proper nouns the checker needs are computed once (stored on the segment)
+and the most recently checked segments are kept in memory. A check then
+costs no segment query and no regex work on the reference, only the
+alignment of the user's input.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from .checker import PreparedReference, prepare_reference
+from .models import DictationSegment
+
+CACHE_SIZE = 4096
+
+
+class SegmentReference(NamedTuple):
+    segment_id: int
+    transcript: str
+    prepared: PreparedReference
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def segment_reference(segment_id: int) -> SegmentReference:
+    """Transcript and prepared reference of a segment. Raises DictationSegment.DoesNotExist."""
+    transcript, tokens, proper_nouns = DictationSegment.objects.values_list(
+        'transcript', 'reference_tokens', 'proper_nouns',
+    ).get(pk=segment_id)
+    if tokens:
+        prepared = PreparedReference(tuple(tokens.split()), frozenset(proper_nouns.split()))
+    else:
+        # Segment stored before its tokens were precomputed
+        prepared = prepare_reference(transcript)
+    return SegmentReference(segment_id, transcript, prepared)
@@ -2,15 +2,21 @@ import json
 import logging
 
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
-from django.http import JsonResponse
+from django.db.models import Count, Q
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.views.decorators.http import require_GET, require_POST
 
-from .checker import compare
-from .models import DictationAttempt, DictationSegment, DictationVideo, VideoQuiz, QuizQuestion, UserQuizAttempt
-from .quiz_service import generate_quiz_questions
-from .youtube_service import build_segments, extract_video_id, fetch_subtitles
+from .checks import check_status, final_score, start_check
+from .ingest import ingestion_status, start_ingestion
+from .models import (
+    DictationAttempt, DictationCheck, DictationSegment, DictationVideo, VideoQuiz, UserQuizAttempt,
+)
+from .progress import record_attempt, rescore_attempts, video_progress
+from .quiz_pool import serve_quiz
+from .references import segment_reference
+from .youtube_service import extract_video_id
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +27,11 @@ logger = logging.getLogger(__name__)
 
 @login_required
 def video_list(request):
-    videos = DictationVideo.objects.filter(is_processed=True).select_related('added_by')
+    videos = (
+        DictationVideo.objects.filter(is_processed=True)
+        .select_related('added_by')
+        .annotate(practised_count=Count('user_progress', filter=Q(user_progress__user=request.user)))
+    )
     return render(request, 'dictation/video_list.html', {'videos': videos})
 
 
@@ -65,95 +75,25 @@ def api_process_video(request):
             'already_exists': True,
         })
 
-    # Fetch subtitles
-    try:
-        transcript_entries, source = fetch_subtitles(video_id)
-    except Exception as e:
-        logger.warning('Subtitle fetch failed for %s: %s', video_id, e)
-        return JsonResponse({'error': str(e)}, status=422)
-
-    # Duration warning (>30 min)
-    total_duration = sum(float(e.get('duration', 0)) for e in transcript_entries)
-    if total_duration > 1800:
-        if not data.get('confirm_long'):
-            minutes = int(total_duration // 60)
-            return JsonResponse({
-                'warning': f'This video is {minutes} minutes long and will generate many segments. '
-                           f'Re-submit with confirm_long=true to proceed.',
-                'duration_seconds': int(total_duration),
-            }, status=200)
-
-    # Build segments
-    segment_dicts = build_segments(transcript_entries)
-    if not segment_dicts:
-        return JsonResponse({'error': 'No segments could be extracted from subtitles'}, status=422)
-
-    # Fetch video metadata via oembed (no API key needed)
-    title, thumbnail, channel = _fetch_oembed_metadata(video_id)
-
-    # Persist video
-    video_obj, _ = DictationVideo.objects.get_or_create(
-        video_id=video_id,
-        defaults={
-            'title': title,
-            'thumbnail_url': thumbnail,
-            'channel_name': channel,
-            'duration_seconds': int(total_duration) if total_duration else None,
-            'subtitle_source': source,
-            'added_by': request.user,
-            'segment_count': len(segment_dicts),
-            'is_processed': True,
-        },
-    )
-
-    # Persist segments (bulk create for speed)
-    segment_objs = [
-        DictationSegment(
-            video=video_obj,
-            order=s['order'],
-            start_time=s['start_time'],
-            end_time=s['end_time'],
-            transcript=s['transcript'],
-            word_count=s['word_count'],
-        )
-        for s in segment_dicts
-    ]
-    DictationSegment.objects.bulk_create(segment_objs, ignore_conflicts=True)
-
-    # Update counts in case video already existed without segments
-    video_obj.segment_count = len(segment_dicts)
-    video_obj.is_processed = True
-    video_obj.save(update_fields=['segment_count', 'is_processed'])
+    # Subtitles are fetched and segmented in the background; concurrent
+    # submissions of the same video share one ingestion
+    video = start_ingestion(video_id, request.user, confirm_long=bool(data.get('confirm_long')))
+    if video.status == DictationVideo.STATUS_NEEDS_CONFIRMATION:
+        status = ingestion_status(video)
+        return JsonResponse({'warning': status['warning'], 'duration_seconds': status['duration_seconds']})
 
     return JsonResponse({
-        'video_id': video_obj.video_id,
-        'title': video_obj.title,
-        'thumbnail_url': video_obj.thumbnail_url,
-        'channel_name': video_obj.channel_name,
-        'segment_count': len(segment_dicts),
-        'subtitle_source': source,
+        **ingestion_status(video),
         'already_exists': False,
-    })
+        'status_url': reverse('dictation_video_status', args=[video.video_id]),
+    }, status=202)
 
 
-def _fetch_oembed_metadata(video_id: str) -> tuple[str, str, str]:
-    """Fetch video title and thumbnail via YouTube oembed (no API key needed)."""
-    import requests
-    try:
-        resp = requests.get(
-            'https://www.youtube.com/oembed',
-            params={'url': f'https://www.youtube.com/watch?v={video_id}', 'format': 'json'},
-            timeout=5,
-        )
-        if resp.ok:
-            data = resp.json()
-            title = data.get('title', video_id)
-            thumbnail = data.get('thumbnail_url', '')
-            channel = data.get('author_name', '')
-            return title, thumbnail, channel
-    except Exception:
-        pass
-    return video_id, '', ''
+@login_required
+@require_GET
+def api_video_status(request, video_id):
+    video = get_object_or_404(DictationVideo, video_id=video_id)
+    return JsonResponse(ingestion_status(video))
 
 
 # ---------------------------------------------------------------------------
@@ -186,12 +126,28 @@ def api_check_answer(request):
     if not segment_id:
         return JsonResponse({'error': 'segment_id is required'}, status=400)
 
-    segment = get_object_or_404(DictationSegment, id=segment_id)
-    result = compare(segment.transcript, user_input)
-    result['transcript'] = segment.transcript  # for "show answer"
+    try:
+        reference = segment_reference(int(segment_id))
+    except (DictationSegment.DoesNotExist, TypeError, ValueError):
+        raise Http404('Segment not found')
+    # Returns at once; spans the rules and cache cannot settle are judged in
+    # the background and picked up via api_check_status
+    result, check = start_check(request.user, reference, user_input)
+    result['transcript'] = reference.transcript  # for "show answer"
+    result['check_id'] = check.id if check else None
+    result['semantic_pending'] = check is not None
     return JsonResponse(result)
 
 
+@login_required
+@require_GET
+def api_check_status(request, check_id):
+    check = get_object_or_404(DictationCheck.objects.select_related('segment'), id=check_id, user=request.user)
+    data = check_status(check)
+    data['transcript'] = check.segment.transcript
+    return JsonResponse(data)
+
+
 # ---------------------------------------------------------------------------
 # API: Save attempt
 # ---------------------------------------------------------------------------
@@ -208,11 +164,15 @@ def api_save_attempt(request):
     user_input = data.get('user_input', '')
     score = data.get('score')
     revealed = bool(data.get('revealed_answer', False))
+    check_id = data.get('check_id')
 
     if segment_id is None or score is None:
         return JsonResponse({'error': 'segment_id and score are required'}, status=400)
 
     segment = get_object_or_404(DictationSegment, id=segment_id)
+    check = None
+    if check_id is not None:
+        check = get_object_or_404(DictationCheck, id=check_id, user=request.user, segment=segment)
 
     attempt = DictationAttempt.objects.create(
         user=request.user,
@@ -220,9 +180,23 @@ def api_save_attempt(request):
         user_input=user_input,
         score=float(score),
         revealed_answer=revealed,
+        answer_check=check,
     )
 
-    return JsonResponse({'id': attempt.id, 'score': attempt.score})
+    record_attempt(attempt)
+
+    # Read the check after linking the attempt: a semantic pass finishing
+    # before this point did not see the attempt, one finishing later rescores it
+    semantic_pending = False
+    if check is not None and not revealed:
+        final = final_score(check)
+        if final is None:
+            semantic_pending = True
+        elif final != attempt.score:
+            rescore_attempts(check, final)
+            attempt.score = final
+
+    return JsonResponse({'id': attempt.id, 'score': attempt.score, 'semantic_pending': semantic_pending})
 
 
 # ---------------------------------------------------------------------------
@@ -233,38 +207,11 @@ def api_save_attempt(request):
 @require_GET
 def api_get_progress(request, video_id):
     video = get_object_or_404(DictationVideo, video_id=video_id, is_processed=True)
-    segment_ids = video.segments.values_list('id', flat=True)
-
-    # Latest attempt per segment for this user (SQLite-compatible)
-    from django.db.models import Max
-
-    latest_times = (
-        DictationAttempt.objects
-        .filter(user=request.user, segment_id__in=segment_ids)
-        .values('segment_id')
-        .annotate(latest=Max('created_at'))
-    )
-    time_map = {row['segment_id']: row['latest'] for row in latest_times}
-
-    progress = {}
-    for seg_id, ts in time_map.items():
-        attempt = (
-            DictationAttempt.objects
-            .filter(user=request.user, segment_id=seg_id, created_at=ts)
-            .values('score', 'revealed_answer')
-            .first()
-        )
-        if attempt:
-            progress[seg_id] = {
-                'score': attempt['score'],
-                'revealed': attempt['revealed_answer'],
-            }
-
-    return JsonResponse({'progress': progress})
+    return JsonResponse({'progress': video_progress(request.user, video)})
 
 
 # ---------------------------------------------------------------------------
-# API: Generate a fresh comprehension quiz (always generates new questions)
+# API: Serve a comprehension quiz from the video's pre-generated pool
 # ---------------------------------------------------------------------------
 
 @login_required
@@ -272,22 +219,12 @@ def api_get_progress(request, video_id):
 def api_generate_quiz(request, video_id):
     video = get_object_or_404(DictationVideo, video_id=video_id, is_processed=True)
 
-    # Build full transcript from all segments
-    transcripts = video.segments.order_by('order').values_list('transcript', flat=True)
-    full_transcript = ' '.join(transcripts)
-
     try:
-        question_dicts = generate_quiz_questions(full_transcript)
+        quiz = serve_quiz(request.user, video)
     except Exception as e:
         logger.warning('Quiz generation failed for %s: %s', video_id, e)
         return JsonResponse({'error': 'AI service unavailable, please try again later'}, status=503)
 
-    with transaction.atomic():
-        quiz = VideoQuiz.objects.create(video=video)
-        QuizQuestion.objects.bulk_create([
-            QuizQuestion(quiz=quiz, **q) for q in question_dicts
-        ])
-
     questions = list(quiz.questions.values(
         'order', 'question_text', 'choice_a', 'choice_b', 'choice_c', 'choice_d'
     ))
@@ -88,6 +88,12 @@ def _ends_sentence(text: str) -> bool:
     return bool(stripped) and stripped[-1] in '.?!'
 
 
+def _ends_clause(text: str) -> bool:
+    """Return True if text ends with a clause-level punctuation mark."""
+    stripped = text.rstrip()
+    return bool(stripped) and stripped[-1] in ',;:'
+
+
 def _clean_text(text: str) -> str:
     """Remove HTML tags and extra whitespace from transcript text."""
     text = re.sub(r'<[^>]+>', '', text)
@@ -95,71 +101,136 @@ def _clean_text(text: str) -> str:
     return text.strip()
 
 
+# ── Segmentation ───────────────────────────────────────────────────────────
+#
+# Segment boundaries can only fall between caption entries. Each candidate
+# segment (a run of consecutive entries) gets a cost from how far its
+# duration is from the target, how weak the boundary after it is (no pause,
+# no punctuation) and whether it is too short in words; a dynamic program
+# picks the split with the lowest total cost. Segments never exceed
+# max_duration unless a single entry does, so each entry is only compared
+# with the few entries before it and the whole pass is O(n·k) for k entries
+# per max_duration window.
+
+WORDS_PER_SECOND = 2.5   # typical speaking rate, used to spot pauses in overlapping captions
+PAUSE_SECONDS = 0.8      # a gap this long counts as a full boundary
+MIN_WORDS = 3
+
+_SENTENCE_STRENGTH = 1.0
+_CLAUSE_STRENGTH = 0.5
+_PAUSE_STRENGTH = 0.8
+_BOUNDARY_WEIGHT = 1.5
+_SHORT_SEGMENT_COST = 1.0
+_FEW_WORDS_COST = 0.5
+
+
+def _boundary_strengths(entries: list[tuple[str, float, float, int]]) -> list[float]:
+    """How good a place the end of each entry is to cut (0 = mid-phrase, 1 = clear break)."""
+    strengths = []
+    for i, (text, start, end, words) in enumerate(entries):
+        if i == len(entries) - 1:
+            strengths.append(1.0)
+            continue
+        next_start = entries[i + 1][1]
+        # Auto captions overlap, so also estimate the silence from start-time gaps
+        pause = max(next_start - end, next_start - start - words / WORDS_PER_SECOND, 0.0)
+        strength = _PAUSE_STRENGTH * min(pause / PAUSE_SECONDS, 1.0)
+        if _ends_sentence(text):
+            strength = max(strength, _SENTENCE_STRENGTH)
+        elif _ends_clause(text):
+            strength = max(strength, _CLAUSE_STRENGTH)
+        strengths.append(strength)
+    return strengths
+
+
 def build_segments(
     transcript_entries: list,
     max_duration: float = 12.0,
     min_duration: float = 4.0,
+    target_duration: float = 8.0,
 ) -> list[dict]:
     """
     Merge individual transcript entries into sensible dictation segments.
 
-    Rules:
-    - Flush a segment when accumulated duration >= max_duration
-    - Flush early (>= min_duration) if the last entry ends a sentence (. ? !)
-    - Never produce an empty segment
+    Boundaries are chosen to keep segments near target_duration, cut at
+    pauses and sentence or clause punctuation, and avoid segments shorter
+    than min_duration or MIN_WORDS words. A segment only exceeds
+    max_duration when a single entry does.
 
     Returns list of dicts: {order, start_time, end_time, transcript, word_count}
     """
-    segments = []
-    current_text_parts = []
-    current_start = None
-    current_end = None
-    current_duration = 0.0
-
-    def flush(order_idx):
-        nonlocal current_text_parts, current_start, current_end, current_duration
-        if not current_text_parts:
-            return
-        text = ' '.join(current_text_parts).strip()
-        word_count = len(text.split())
-        segments.append({
-            'order': order_idx,
-            'start_time': round(current_start, 3),
-            'end_time': round(current_end, 3),
-            'transcript': text,
-            'word_count': word_count,
-        })
-        current_text_parts = []
-        current_start = None
-        current_end = None
-        current_duration = 0.0
-
-    order = 1
+    entries = []
     for entry in transcript_entries:
         text = _clean_text(entry.get('text', ''))
         if not text:
             continue
-
         start = float(entry.get('start', 0))
-        duration = float(entry.get('duration', 0))
-        end = start + duration
-
-        if current_start is None:
-            current_start = start
-
-        current_text_parts.append(text)
-        current_end = end
-        current_duration = current_end - current_start
+        end = start + float(entry.get('duration', 0))
+        entries.append((text, start, end, len(text.split())))
+    if not entries:
+        return []
+
+    n = len(entries)
+    strengths = _boundary_strengths(entries)
+    word_prefix = [0]
+    for _, _, _, words in entries:
+        word_prefix.append(word_prefix[-1] + words)
+
+    # best[i]: lowest cost of segmenting entries[:i]; cut[i]: where its last segment starts
+    best = [0.0] + [float('inf')] * n
+    cut = [0] * (n + 1)
+    for i in range(1, n + 1):
+        end = entries[i - 1][2]
+        boundary_cost = _BOUNDARY_WEIGHT * (1.0 - strengths[i - 1])
+        for j in range(i - 1, -1, -1):
+            duration = end - entries[j][1]
+            if duration > max_duration and j < i - 1:
+                break
+            cost = ((duration - target_duration) / target_duration) ** 2 + boundary_cost
+            if duration < min_duration:
+                cost += _SHORT_SEGMENT_COST * (1 + (min_duration - duration) / min_duration)
+            if word_prefix[i] - word_prefix[j] < MIN_WORDS:
+                cost += _FEW_WORDS_COST
+            total = best[j] + cost
+            if total < best[i]:
+                best[i] = total
+                cut[i] = j
+
+    bounds = []
+    i = n
+    while i > 0:
+        bounds.append((cut[i], i))
+        i = cut[i]
+    bounds.reverse()
 
-        # Decide whether to flush
-        if current_duration >= max_duration:
-            flush(order)
-            order += 1
-        elif current_duration >= min_duration and _ends_sentence(text):
-            flush(order)
-            order += 1
+    segments = []
+    for order, (j, i) in enumerate(bounds, 1):
+        text = ' '.join(text for text, _, _, _ in entries[j:i])
+        segments.append({
+            'order': order,
+            'start_time': round(entries[j][1], 3),
+            'end_time': round(entries[i - 1][2], 3),
+            'transcript': text,
+            'word_count': len(text.split()),
+        })
+    return segments
 
-    # Flush remainder
-    flush(order)
 
-    return segments
+def fetch_oembed_metadata(video_id: str) -> tuple[str, str, str]:
+    """Fetch video title and thumbnail via YouTube oembed (no API key needed)."""
+    import requests
+    try:
+        resp = requests.get(
+            'https://www.youtube.com/oembed',
+            params={'url': f'https://www.youtube.com/watch?v={video_id}', 'format': 'json'},
+            timeout=5,
+        )
+        if resp.ok:
+            data = resp.json()
+            title = data.get('title', video_id)
+            thumbnail = data.get('thumbnail_url', '')
+            channel = data.get('author_name', '')
+            return title, thumbnail, channel
+    except Exception:
+        pass
+    return video_id, '', ''
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'learn_english_project.settings_minimal')
 
 application = get_wsgi_application()
+
+# Job housekeeping and the periodic schedule when the web process runs jobs itself
+from vocabulary.jobs import start_in_process_worker  # noqa: E402
+
+start_in_process_worker()
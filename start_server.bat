@@ -1,4 +1,6 @@
 @echo off
 cd /d "D:\My Projects\Web\learn-vocabulary"
 call .venv\Scripts\activate.bat
+rem Background jobs (imports, video ingestion, dictation checks) in their own window
+start "run_workers" cmd /k python manage.py run_workers
 python manage.py runserver 8000
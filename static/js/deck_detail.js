@@ -14,11 +14,57 @@ document.addEventListener("DOMContentLoaded", function () {
 
   let currentSlideIndex = 0;
 
+  // Only the first page of cards is rendered by the server. The carousel
+  // holds a window of at most MAX_LOADED_SLIDES cards: pages are fetched from
+  // the deck cards API on either side as the user nears the window's edges,
+  // and slides far behind are dropped. Counts and positions come from the
+  // server, never from the loaded slides.
+  const PREFETCH_THRESHOLD = 5;
+  const MAX_LOADED_SLIDES = 90; // three pages
+  const MAX_DOTS = 7;
+  let nextCursor = carouselSlides.dataset.nextCursor || ""; // cards after the window
+  let prevCursor = ""; // cards before the window
+  let firstSlidePosition = 0; // position of slides[0] among the cards matching the filter
+  let loadingCards = null;
+  let loadingDirection = null;
+  let audioFilter = "all";
+  // Number of cards in the deck that match the audio filter
+  let totalCards = parseInt(carouselSlides.dataset.totalCards, 10) || slides.length;
+  // Bumped when the window is replaced, so pages requested before are dropped
+  let cardsGeneration = 0;
+
   function showSlide(index) {
+    if (slides.length === 0) {
+      updatePagination();
+      return;
+    }
+
     // Ensure the index loops around
     if (index < 0) {
+      if (prevCursor) {
+        // Earlier cards exist on the server: load them instead of wrapping around
+        currentSlideIndex = 0;
+        loadCards("backward").then((added) => showSlide(Math.max(added - 1, 0)));
+        return;
+      }
+      if (nextCursor) {
+        // Wrap to the deck's last card: fetch the last page in place of the window
+        replaceCards("backward").then(() => showSlide(slides.length - 1));
+        return;
+      }
       currentSlideIndex = slides.length - 1;
     } else if (index >= slides.length) {
+      if (nextCursor) {
+        // More cards exist on the server: load them instead of wrapping around
+        currentSlideIndex = slides.length - 1;
+        loadCards("forward").then(() => showSlide(Math.min(index, slides.length - 1)));
+        return;
+      }
+      if (prevCursor) {
+        // Wrap to the deck's first card
+        replaceCards("forward").then(() => showSlide(0));
+        return;
+      }
       currentSlideIndex = 0;
     } else {
       currentSlideIndex = index;
@@ -48,6 +94,14 @@ document.addEventListener("DOMContentLoaded", function () {
     });
 
     updatePagination();
+
+    if (!loadingCards) {
+      if (nextCursor && currentSlideIndex >= slides.length - PREFETCH_THRESHOLD) {
+        loadCards("forward");
+      } else if (prevCursor && currentSlideIndex < PREFETCH_THRESHOLD) {
+        loadCards("backward");
+      }
+    }
   }
 
   function nextSlide() {
@@ -63,7 +117,14 @@ document.addEventListener("DOMContentLoaded", function () {
   function updatePagination() {
     if (paginationDotsContainer) {
       paginationDotsContainer.innerHTML = "";
-      slides.forEach((_, index) => {
+      if (slides.length === 0) {
+        return;
+      }
+
+      // A fixed number of dots around the current card, then its position in the deck
+      const firstDot = Math.max(0, Math.min(currentSlideIndex - Math.floor(MAX_DOTS / 2), slides.length - MAX_DOTS));
+      const lastDot = Math.min(slides.length, firstDot + MAX_DOTS);
+      for (let index = firstDot; index < lastDot; index++) {
         const dot = document.createElement("span");
         dot.classList.add("pagination-dot");
         if (index === currentSlideIndex) {
@@ -84,8 +145,170 @@ document.addEventListener("DOMContentLoaded", function () {
           showSlide(index);
         });
         paginationDotsContainer.appendChild(dot);
+      }
+
+      const counter = document.createElement("span");
+      counter.className = "pagination-counter text-sm text-gray-400";
+      counter.textContent = `${firstSlidePosition + currentSlideIndex + 1} / ${Math.max(totalCards, slides.length)}`;
+      paginationDotsContainer.appendChild(counter);
+    }
+  }
+
+  // Fetch one page of cards matching the audio filter, starting after the
+  // `after` cursor (before it with direction "backward").
+  // Every page carries the deck's audio stats, which are shown right away.
+  function fetchCardsPage(after, limit, direction) {
+    const params = new URLSearchParams();
+    if (after) params.set("after", after);
+    if (limit) params.set("limit", limit);
+    if (direction === "backward") params.set("direction", direction);
+    if (audioFilter !== "all") params.set("audio", audioFilter);
+
+    const url = `${carouselSlides.dataset.cardsUrl}?${params}`;
+    return fetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } })
+      .then((response) => response.json())
+      .then((data) => {
+        if (!data.success) {
+          throw new Error(data.error || "Failed to load cards");
+        }
+        updateAudioStats(data.stats);
+        return data;
       });
+  }
+
+  // Fetch the page after (or before) the window and add it as slides.
+  // Resolves to the number of slides added.
+  function fetchIntoWindow(direction, cursor) {
+    const generation = cardsGeneration;
+    const backward = direction === "backward";
+    const loading = fetchCardsPage(cursor, null, direction)
+      .then((data) => {
+        if (generation !== cardsGeneration) {
+          // The window was replaced while this page was loading
+          return 0;
+        }
+
+        const template = document.createElement("template");
+        template.innerHTML = data.html;
+        const newSlides = Array.from(template.content.children);
+        const anchor = backward ? slides[0] || null : null;
+        newSlides.forEach((slide) => {
+          carouselSlides.insertBefore(slide, anchor);
+          slide.style.opacity = "0.7";
+          slide.style.transform = "scale(0.9)";
+          slide.style.zIndex = "1";
+          initializeSlide(slide);
+        });
+
+        const cursorAfterPage = data.next_cursor ? String(data.next_cursor) : "";
+        if (backward) {
+          slides.unshift(...newSlides);
+          prevCursor = cursorAfterPage;
+          firstSlidePosition -= newSlides.length;
+          currentSlideIndex += newSlides.length;
+        } else {
+          slides.push(...newSlides);
+          nextCursor = cursorAfterPage;
+        }
+        totalCards = data.total;
+        const dropped = evictSlides(backward);
+        if ((backward && newSlides.length) || (!backward && dropped)) {
+          // Slides before the current one changed: keep it in view
+          keepCurrentSlideInView();
+        }
+        updatePagination();
+        return newSlides.length;
+      })
+      .catch((error) => {
+        console.error("Error loading more cards:", error);
+        return 0;
+      })
+      .finally(() => {
+        if (loadingCards === loading) {
+          loadingCards = null;
+          loadingDirection = null;
+        }
+      });
+    loadingCards = loading;
+    loadingDirection = direction;
+    return loading;
+  }
+
+  function loadCards(direction) {
+    const cursor = direction === "backward" ? prevCursor : nextCursor;
+    if (!cursor) {
+      return Promise.resolve(0);
     }
+    if (loadingCards) {
+      return loadingDirection === direction
+        ? loadingCards
+        : loadingCards.then(() => loadCards(direction));
+    }
+    return fetchIntoWindow(direction, cursor);
+  }
+
+  // Drop the slides furthest from the current one, on the side away from
+  // the page just loaded, so the window stays bounded. Returns how many were dropped.
+  function evictSlides(fromEnd) {
+    if (slides.length <= MAX_LOADED_SLIDES) {
+      return 0;
+    }
+    if (fromEnd) {
+      const keep = Math.max(MAX_LOADED_SLIDES, currentSlideIndex + PREFETCH_THRESHOLD + 1);
+      const dropped = slides.splice(keep);
+      dropped.forEach((slide) => slide.remove());
+      if (dropped.length) {
+        nextCursor = slides[slides.length - 1].dataset.cardId;
+      }
+      return dropped.length;
+    }
+    const count = Math.min(slides.length - MAX_LOADED_SLIDES, Math.max(currentSlideIndex - PREFETCH_THRESHOLD, 0));
+    const dropped = slides.splice(0, count);
+    dropped.forEach((slide) => slide.remove());
+    if (dropped.length) {
+      prevCursor = slides[0].dataset.cardId;
+      firstSlidePosition += dropped.length;
+      currentSlideIndex -= dropped.length;
+    }
+    return dropped.length;
+  }
+
+  function keepCurrentSlideInView() {
+    const currentSlide = slides[currentSlideIndex];
+    if (currentSlide) {
+      carouselSlides.scrollLeft = currentSlide.offsetLeft;
+    }
+  }
+
+  // Replace the window with the first page of the cards matching the filter,
+  // or with the last page for direction "backward"
+  function replaceCards(direction) {
+    cardsGeneration++;
+    loadingCards = null;
+    loadingDirection = null;
+    Array.from(carouselSlides.children).forEach((slide) => slide.remove());
+    slides.length = 0;
+    currentSlideIndex = 0;
+    firstSlidePosition = 0;
+    nextCursor = "";
+    prevCursor = "";
+    return fetchIntoWindow(direction, null).then((added) => {
+      if (direction === "backward") {
+        currentSlideIndex = 0;
+        firstSlidePosition = Math.max(totalCards - added, 0);
+      }
+      return added;
+    });
+  }
+
+  // Bind the per-card handlers that are not delegated through carouselSlides
+  function initializeSlide(slide) {
+    initializeDictionaryLinks(slide);
+    initializeFavorites(slide);
+    initializeBlacklist(slide);
+    initializeDeleteCard(slide);
+    initializeCardHoverEffects(slide);
+    fixTooltipIssues(slide);
   }
 
   // Event listeners for navigation buttons
@@ -986,216 +1209,55 @@ document.addEventListener("DOMContentLoaded", function () {
     const initialCards = document.querySelectorAll("[data-card-id]");
     console.log(`[DEBUG] Initial DOM scan: Found ${initialCards.length} elements with [data-card-id]`);
 
-    updateAudioStats();
+    // The audio stats are rendered with the page
     setupAudioFilter();
     setupAudioUrlFieldHandlers();
 
     console.log(`[DEBUG] ========== AUDIO STATUS FEATURES INITIALIZED ==========`);
   }
 
-  function updateAudioStats() {
-    console.log(`[DEBUG] ========== AUDIO STATS DEBUG START ==========`);
-    console.log(`[DEBUG] Called from:`, new Error().stack.split('\n')[2].trim());
-    console.log(`[DEBUG] Timestamp: ${new Date().toISOString()}`);
-
-    // Get all elements with data-card-id attribute
-    const allElements = document.querySelectorAll("[data-card-id]");
-    console.log(`[DEBUG] DOM Query Result: Found ${allElements.length} elements with [data-card-id]`);
-
-    // Filter to only get card containers (not favorite buttons or other elements)
-    const allCards = Array.from(allElements).filter(element => {
-      const hasViewMode = element.querySelector(".card-view-mode");
-      const isCardContainer = element.classList.contains("flex-shrink-0");
-      console.log(`[DEBUG] Element analysis: tagName=${element.tagName}, hasViewMode=${!!hasViewMode}, isCardContainer=${isCardContainer}, classes="${element.className}"`);
-      return hasViewMode && isCardContainer;
-    });
-
-    console.log(`[DEBUG] Filtered to ${allCards.length} actual card containers`);
-
-    // Check for duplicate card IDs
-    const cardIds = [];
-    const duplicateIds = [];
-    const cardDetails = [];
-
-    allCards.forEach((card, index) => {
-      const cardId = card.getAttribute("data-card-id");
-      const isVisible = card.style.display !== "none";
-      const hasViewMode = !!card.querySelector(".card-view-mode");
-      const hasEditMode = !!card.querySelector(".card-edit-mode");
-      const cardClasses = card.className;
-      const cardPosition = card.getBoundingClientRect();
-
-      // Track card IDs for duplicate detection
-      if (cardIds.includes(cardId)) {
-        duplicateIds.push(cardId);
-      } else {
-        cardIds.push(cardId);
-      }
-
-      // Collect detailed info about each card element
-      cardDetails.push({
-        index: index + 1,
-        cardId: cardId,
-        isVisible: isVisible,
-        hasViewMode: hasViewMode,
-        hasEditMode: hasEditMode,
-        classes: cardClasses,
-        position: `x:${Math.round(cardPosition.x)}, y:${Math.round(cardPosition.y)}, w:${Math.round(cardPosition.width)}, h:${Math.round(cardPosition.height)}`,
-        element: card
-      });
-
-      console.log(`[DEBUG] Element ${index + 1}:`);
-      console.log(`  - Card ID: ${cardId}`);
-      console.log(`  - Visible: ${isVisible} (display: ${card.style.display || 'default'})`);
-      console.log(`  - Has View Mode: ${hasViewMode}`);
-      console.log(`  - Has Edit Mode: ${hasEditMode}`);
-      console.log(`  - Classes: ${cardClasses}`);
-      console.log(`  - Position: ${cardPosition.x}, ${cardPosition.y} (${cardPosition.width}x${cardPosition.height})`);
-    });
-
-    // Report duplicate detection results
-    console.log(`[DEBUG] Unique Card IDs: [${cardIds.join(', ')}]`);
-    if (duplicateIds.length > 0) {
-      console.error(`[ERROR] DUPLICATE CARD IDs DETECTED: [${duplicateIds.join(', ')}]`);
-      console.error(`[ERROR] This explains why counts are wrong!`);
-    } else {
-      console.log(`[DEBUG] ✅ No duplicate card IDs found`);
+  // Show the deck's audio stats. Called without `stats` (after a card's audio
+  // changed) they are fetched again, together with the filtered card total.
+  function updateAudioStats(stats) {
+    if (!stats) {
+      const generation = cardsGeneration;
+      fetchCardsPage(null, 1)
+        .then((data) => {
+          if (generation === cardsGeneration) {
+            totalCards = data.total;
+            updatePagination();
+          }
+        })
+        .catch((error) => console.error("Error updating audio stats:", error));
+      return;
     }
 
-    // Count audio statistics
-    let withAudioCount = 0;
-    let withoutAudioCount = 0;
-    let processedCards = 0;
-
-    allCards.forEach((card, index) => {
-      const cardId = card.getAttribute("data-card-id");
-      const viewMode = card.querySelector(".card-view-mode");
-
-      if (!viewMode) {
-        console.warn(`[WARN] Card ${index + 1} (ID: ${cardId}) has no view mode - skipping`);
-        return;
-      }
-
-      const hasAudioAttr = viewMode.getAttribute("data-has-audio");
-      const hasAudio = hasAudioAttr === "true";
-
-      console.log(`[DEBUG] Processing Card ${index + 1} (ID: ${cardId}):`);
-      console.log(`  - data-has-audio attribute: "${hasAudioAttr}"`);
-      console.log(`  - Parsed hasAudio: ${hasAudio}`);
-
-      if (hasAudio) {
-        withAudioCount++;
-        console.log(`  - ✅ Counted as WITH audio (total with audio: ${withAudioCount})`);
-      } else {
-        withoutAudioCount++;
-        console.log(`  - ❌ Counted as WITHOUT audio (total without audio: ${withoutAudioCount})`);
-      }
-
-      processedCards++;
-    });
-
-    console.log(`[DEBUG] Processing Summary:`);
-    console.log(`  - Total elements found: ${allCards.length}`);
-    console.log(`  - Cards processed: ${processedCards}`);
-    console.log(`  - Cards with audio: ${withAudioCount}`);
-    console.log(`  - Cards without audio: ${withoutAudioCount}`);
-    console.log(`  - Sum: ${withAudioCount + withoutAudioCount}`);
-
-    // Update stats display
     const withAudioElement = document.getElementById("cards-with-audio-count");
     const withoutAudioElement = document.getElementById("cards-without-audio-count");
-
     if (withAudioElement) {
-      withAudioElement.textContent = withAudioCount;
-      console.log(`[DEBUG] Updated display: cards-with-audio-count = ${withAudioCount}`);
+      withAudioElement.textContent = stats.with_audio;
     }
     if (withoutAudioElement) {
-      withoutAudioElement.textContent = withoutAudioCount;
-      console.log(`[DEBUG] Updated display: cards-without-audio-count = ${withoutAudioCount}`);
+      withoutAudioElement.textContent = stats.without_audio;
     }
-
-    // Final validation
-    const totalCalculated = withAudioCount + withoutAudioCount;
-    const uniqueCardCount = cardIds.length;
-
-    console.log(`[DEBUG] Final Validation:`);
-    console.log(`  - DOM elements found: ${allCards.length}`);
-    console.log(`  - Unique card IDs: ${uniqueCardCount}`);
-    console.log(`  - Total calculated: ${totalCalculated}`);
-
-    if (totalCalculated !== uniqueCardCount) {
-      console.error(`[ERROR] MISMATCH: Calculated total (${totalCalculated}) != Unique cards (${uniqueCardCount})`);
-      console.error(`[ERROR] This suggests duplicate DOM elements or counting logic error`);
-    } else if (allCards.length !== uniqueCardCount) {
-      console.error(`[ERROR] DUPLICATE ELEMENTS: Found ${allCards.length} DOM elements but only ${uniqueCardCount} unique card IDs`);
-    } else {
-      console.log(`[DEBUG] ✅ All counts match correctly!`);
-    }
-
-    console.log(`[DEBUG] ========== AUDIO STATS DEBUG END ==========`);
   }
 
   function setupAudioFilter() {
     const filterSelect = document.getElementById("audio-filter");
     if (!filterSelect) return;
 
+    // The server filters the cards, so cards that are not loaded yet are
+    // included; the carousel starts over from the first matching card
     filterSelect.addEventListener("change", function () {
-      const filterValue = this.value;
-      const allElements = document.querySelectorAll("[data-card-id]");
-
-      // Filter to only get card containers (not favorite buttons)
-      const allCards = Array.from(allElements).filter(element => {
-        const hasViewMode = element.querySelector(".card-view-mode");
-        const isCardContainer = element.classList.contains("flex-shrink-0");
-        return hasViewMode && isCardContainer;
-      });
-
-      console.log(`[DEBUG] Audio filter changed to: ${filterValue}, found ${allCards.length} card containers`);
-
-      allCards.forEach((card, index) => {
-        // Use the data-has-audio attribute for consistent detection
-        const viewMode = card.querySelector(".card-view-mode");
-        const hasAudio = viewMode && viewMode.getAttribute("data-has-audio") === "true";
-        let shouldShow = true;
-
-        switch (filterValue) {
-          case "with-audio":
-            shouldShow = hasAudio;
-            break;
-          case "without-audio":
-            shouldShow = !hasAudio;
-            break;
-          case "all":
-          default:
-            shouldShow = true;
-            break;
-        }
-
-        console.log(`[DEBUG] Card ${index + 1}: hasAudio=${hasAudio}, shouldShow=${shouldShow} (filter: ${filterValue})`);
-
-        if (shouldShow) {
-          card.style.display = "";
-        } else {
-          card.style.display = "none";
-        }
-      });
-
-      // Update carousel after filtering
-      updateCarouselAfterFilter();
+      console.log(`[DEBUG] Audio filter changed to: ${this.value}`);
+      audioFilter = this.value;
+      replaceCards("forward").then(() => showSlide(0));
     });
-  }
 
-  function updateCarouselAfterFilter() {
-    // Reset to first visible slide
-    const visibleCards = document.querySelectorAll(
-      '[data-card-id]:not([style*="display: none"])'
-    );
-    if (visibleCards.length > 0) {
-      // Update slides array and current index
-      slides.length = 0;
-      visibleCards.forEach((card) => slides.push(card));
-      currentSlideIndex = 0;
-      showSlide(0);
+    // The browser may restore a previous selection on reload
+    if (filterSelect.value !== "all") {
+      audioFilter = filterSelect.value;
+      replaceCards("forward").then(() => showSlide(0));
     }
   }
 
@@ -1581,7 +1643,7 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Initialize dictionary links with fallback mechanism
-  function initializeDictionaryLinks() {
+  function initializeDictionaryLinks(root = document) {
     console.log("Initializing dictionary links with fallback mechanism...");
 
     // Check if DictionaryUtils is available
@@ -1593,7 +1655,7 @@ document.addEventListener("DOMContentLoaded", function () {
     }
 
     // Find all dictionary word links and enhance them
-    const dictionaryLinks = document.querySelectorAll(".dictionary-word-link");
+    const dictionaryLinks = root.querySelectorAll(".dictionary-word-link");
 
     dictionaryLinks.forEach((link) => {
       const word = link.getAttribute("data-word") || link.textContent.trim();
@@ -1621,14 +1683,14 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Initialize favorites functionality
-  function initializeFavorites() {
+  function initializeFavorites(root = document) {
     console.log("🔍 Initializing favorites functionality...");
 
     // Load favorite status for all cards
-    loadFavoriteStatus();
+    loadFavoriteStatus(root);
 
     // Add event listeners to favorite buttons
-    const favoriteButtons = document.querySelectorAll('.favorite-btn');
+    const favoriteButtons = root.querySelectorAll('.favorite-btn');
     favoriteButtons.forEach(button => {
       button.addEventListener('click', handleFavoriteToggle);
     });
@@ -1637,8 +1699,8 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Load favorite status for all visible cards
-  function loadFavoriteStatus() {
-    const favoriteButtons = document.querySelectorAll('.favorite-btn');
+  function loadFavoriteStatus(root = document) {
+    const favoriteButtons = root.querySelectorAll('.favorite-btn');
     const cardIds = Array.from(favoriteButtons).map(btn => btn.getAttribute('data-card-id'));
 
     if (cardIds.length === 0) {
@@ -1782,14 +1844,14 @@ document.addEventListener("DOMContentLoaded", function () {
   initializeFavorites();
 
   // Initialize blacklist functionality
-  function initializeBlacklist() {
+  function initializeBlacklist(root = document) {
     console.log("🔍 Initializing blacklist functionality...");
 
     // Load blacklist status for all cards
-    loadBlacklistStatus();
+    loadBlacklistStatus(root);
 
     // Add event listeners to blacklist buttons
-    const blacklistButtons = document.querySelectorAll('.blacklist-btn');
+    const blacklistButtons = root.querySelectorAll('.blacklist-btn');
     blacklistButtons.forEach(button => {
       button.addEventListener('click', handleBlacklistToggle);
     });
@@ -1798,8 +1860,8 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Load blacklist status for all visible cards
-  function loadBlacklistStatus() {
-    const blacklistButtons = document.querySelectorAll('.blacklist-btn');
+  function loadBlacklistStatus(root = document) {
+    const blacklistButtons = root.querySelectorAll('.blacklist-btn');
     const cardIds = Array.from(blacklistButtons).map(btn => btn.getAttribute('data-card-id'));
 
     if (cardIds.length === 0) {
@@ -2082,11 +2144,11 @@ document.addEventListener("DOMContentLoaded", function () {
   // Delete Card Functionality
   let cardToDelete = null;
 
-  function initializeDeleteCard() {
+  function initializeDeleteCard(root = document) {
     console.log("🗑️ Initializing delete card functionality...");
 
     // Add event listeners to delete buttons
-    const deleteButtons = document.querySelectorAll('.delete-card-btn');
+    const deleteButtons = root.querySelectorAll('.delete-card-btn');
     deleteButtons.forEach(button => {
       button.addEventListener('click', handleDeleteCardClick);
     });
@@ -2106,8 +2168,8 @@ document.addEventListener("DOMContentLoaded", function () {
       return;
     }
 
-    // Find the card data
-    const cardElement = button.closest('[data-card-id]');
+    // Find the card's slide (the button carries data-card-id too)
+    const cardElement = button.closest('.flex-shrink-0[data-card-id]');
     if (!cardElement) {
       console.error("Could not find card element");
       return;
@@ -2191,34 +2253,33 @@ document.addEventListener("DOMContentLoaded", function () {
       const data = await response.json();
 
       if (data.success) {
-        console.log(`✅ Card ${cardToDelete.id} deleted successfully`);
+        const deletedCard = cardToDelete;
+        console.log(`✅ Card ${deletedCard.id} deleted successfully`);
 
         // Hide modal
         hideDeleteCardModal();
 
         // Remove card from UI with animation
-        if (cardToDelete.element) {
-          cardToDelete.element.style.transition = 'all 0.3s ease';
-          cardToDelete.element.style.transform = 'scale(0.8)';
-          cardToDelete.element.style.opacity = '0';
+        if (deletedCard.element) {
+          deletedCard.element.style.transition = 'all 0.3s ease';
+          deletedCard.element.style.transform = 'scale(0.8)';
+          deletedCard.element.style.opacity = '0';
 
           setTimeout(() => {
-            cardToDelete.element.remove();
+            deletedCard.element.remove();
 
-            // Check if this was the last card
-            const remainingCards = document.querySelectorAll('[data-card-id]');
-            if (remainingCards.length === 0) {
+            // Check if this was the last card of the deck
+            if (slides.length <= 1 && !nextCursor && !prevCursor && audioFilter === "all") {
               // Reload page to show empty state
               window.location.reload();
             } else {
-              // Update pagination if needed
-              updatePaginationAfterDelete();
+              updatePaginationAfterDelete(deletedCard.element);
             }
           }, 300);
         }
 
         // Show success message
-        showDeleteMessage(true, `Card "${cardToDelete.word}" deleted successfully`);
+        showDeleteMessage(true, `Card "${deletedCard.word}" deleted successfully`);
 
       } else {
         console.error("Failed to delete card:", data.error);
@@ -2234,35 +2295,24 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
-  function updatePaginationAfterDelete() {
-    // Update carousel navigation if needed
-    const slides = document.querySelectorAll('#carousel-slides > div');
-    const totalSlides = slides.length;
-
-    if (totalSlides > 0) {
-      // Reset to first slide if current slide was deleted
-      const carousel = document.getElementById('carousel-slides');
-      if (carousel) {
-        carousel.scrollTo({ left: 0, behavior: 'smooth' });
+  function updatePaginationAfterDelete(slide) {
+    const index = slides.indexOf(slide);
+    if (index !== -1) {
+      slides.splice(index, 1);
+      totalCards = Math.max(totalCards - 1, 0);
+      if (index < currentSlideIndex) {
+        currentSlideIndex--;
       }
-
-      // Update pagination dots
-      updatePaginationDots(totalSlides);
     }
-  }
 
-  function updatePaginationDots(totalSlides) {
-    const paginationContainer = document.getElementById('pagination-dots');
-    if (paginationContainer && totalSlides > 1) {
-      paginationContainer.innerHTML = '';
-
-      for (let i = 0; i < totalSlides; i++) {
-        const dot = document.createElement('span');
-        dot.className = `pagination-dot ${i === 0 ? 'active' : ''}`;
-        dot.onclick = () => scrollToSlide(i);
-        paginationContainer.appendChild(dot);
-      }
+    if (slides.length === 0) {
+      // The window emptied but other cards remain on the server
+      replaceCards("forward").then(() => showSlide(0));
+    } else {
+      // Stay on the card that took the deleted card's place
+      showSlide(Math.min(currentSlideIndex, slides.length - 1));
     }
+    updateAudioStats();
   }
 
   function showDeleteMessage(success, message) {
@@ -2296,10 +2346,10 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // Card Hover Effects for Auto-hide Buttons
-  function initializeCardHoverEffects() {
+  function initializeCardHoverEffects(root = document) {
     console.log("👆 Initializing card hover effects...");
 
-    const cardElements = document.querySelectorAll('.card-view-mode');
+    const cardElements = root.querySelectorAll('.card-view-mode');
 
     cardElements.forEach(card => {
       const actionButtons = card.querySelector('.card-action-buttons');
@@ -2324,25 +2374,27 @@ document.addEventListener("DOMContentLoaded", function () {
       });
     });
 
-    // Handle window resize to adjust mobile behavior
-    window.addEventListener('resize', () => {
-      if (window.innerWidth <= 480) {
-        // Show all buttons on mobile
-        document.querySelectorAll('.card-action-buttons').forEach(buttons => {
-          buttons.style.opacity = '1';
-        });
-      }
-    });
+    // Handle window resize to adjust mobile behavior (registered once, covers later pages too)
+    if (root === document) {
+      window.addEventListener('resize', () => {
+        if (window.innerWidth <= 480) {
+          // Show all buttons on mobile
+          document.querySelectorAll('.card-action-buttons').forEach(buttons => {
+            buttons.style.opacity = '1';
+          });
+        }
+      });
+    }
 
     console.log(`✅ Card hover effects initialized for ${cardElements.length} cards`);
   }
 
   // Fix tooltip issues by removing unwanted title attributes
-  function fixTooltipIssues() {
+  function fixTooltipIssues(root = document) {
     console.log(`[AUDIO DEBUG] ========== FIXING TOOLTIP ISSUES ==========`);
 
     // Remove title attributes from elements that shouldn't have tooltips
-    const cardElements = document.querySelectorAll('.card-view-mode');
+    const cardElements = root.querySelectorAll('.card-view-mode');
 
     cardElements.forEach((card, cardIndex) => {
       // Remove title from the card itself if it exists
@@ -390,7 +390,8 @@ async function checkAnswer() {
     await fetch(D.saveUrl, {
       method: 'POST',
       headers: {'Content-Type': 'application/json', 'X-CSRFToken': D.csrfToken},
-      body: JSON.stringify({segment_id: seg.id, user_input: input, score: result.score, revealed_answer: false}),
+      body: JSON.stringify({segment_id: seg.id, user_input: input, score: result.score, revealed_answer: false,
+                            check_id: result.check_id}),
     });
 
     renderResult(result);
@@ -402,12 +403,39 @@ async function checkAnswer() {
     if (activeSegIdx < segments.length - 1) btnNext.style.display = 'inline-flex';
     btnRetry.style.display = 'inline-flex';
 
+    if (result.semantic_pending) pollSemanticCheck(seg.id, result.check_id, input);
+
   } finally {
     btnCheck.disabled = false;
     btnCheck.innerHTML = orig;
   }
 }
 
+/* ── Semantic upgrade: the AI pass finishes after the instant score ── */
+const SEMANTIC_POLL_MS = 1500;
+const SEMANTIC_POLL_LIMIT = 80;
+
+async function pollSemanticCheck(segId, checkId, input) {
+  for (let attempt = 0; attempt < SEMANTIC_POLL_LIMIT; attempt++) {
+    await new Promise(resolve => setTimeout(resolve, SEMANTIC_POLL_MS));
+    let result;
+    try {
+      const resp = await fetch(D.checkStatusUrl + checkId + '/');
+      if (!resp.ok) return;
+      result = await resp.json();
+    } catch {
+      continue;
+    }
+    if (result.semantic_pending) continue;
+
+    // The server has already rescored the saved attempt
+    saveResult(segId, result, input);
+    refreshBadge(segId, {score: result.score, revealed: false});
+    if (activeSegIdx !== null && segments[activeSegIdx].id === segId) renderResult(result);
+    return;
+  }
+}
+
 /* ── Show answer ── */
 btnReveal.addEventListener('click', async () => {
   if (activeSegIdx === null) return;
@@ -515,7 +543,8 @@ function scoreBadgeHTML(result) {
 /* ── Render result ── */
 function renderResult(result) {
   resultArea.style.display = 'block';
-  scoreRow.innerHTML = scoreBadgeHTML(result);
+  scoreRow.innerHTML = scoreBadgeHTML(result) +
+    (result.semantic_pending ? ' <span class="text-xs text-gray-400 ml-1">(AI checking…)</span>' : '');
   renderTokensInto(result.tokens, tokenDisplay);
 }
 
@@ -0,0 +1,132 @@
+"""Property tests for the dictation checker's alignment engine."""
+import random
+from unittest.mock import patch
+from django.test import SimpleTestCase
+
+from dictation import checker
+
+
+def _reference_alignment(ref, user):
+    """The original full-table LCS and backtrack the engine must reproduce."""
+    m, n = len(ref), len(user)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if ref[i - 1] == user[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+
+    alignment = []
+    i, j = m, n
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and ref[i - 1] == user[j - 1]:
+            alignment.append((ref[i - 1], user[j - 1]))
+            i -= 1; j -= 1
+        elif j > 0 and (i == 0 or dp[i][j - 1] >= dp[i - 1][j]):
+            alignment.append((None, user[j - 1]))
+            j -= 1
+        else:
+            alignment.append((ref[i - 1], None))
+            i -= 1
+    alignment.reverse()
+    return alignment, dp
+
+
+VOCABULARY = ['the', 'a', 'cat', 'sat', 'on', 'mat', 'London', 'Paris', 'went', 'to']
+
+
+def _random_words(rng, max_len):
+    # A small vocabulary makes repeated words, and so ties in the table, common
+    return [rng.choice(VOCABULARY[:rng.randint(2, len(VOCABULARY))])
+            for _ in range(rng.randint(0, max_len))]
+
+
+def _mutate(rng, words):
+    """A plausible attempt: the reference with words dropped, replaced and inserted."""
+    out = []
+    for word in words:
+        roll = rng.random()
+        if roll < 0.15:
+            continue
+        out.append(rng.choice(VOCABULARY) if roll < 0.3 else word)
+        if rng.random() < 0.1:
+            out.append(rng.choice(VOCABULARY))
+    return out
+
+
+class AlignmentPropertyTest(SimpleTestCase):
+    CASES = 600
+
+    def _pairs(self):
+        rng = random.Random(20240534)
+        for case in range(self.CASES):
+            ref = _random_words(rng, 40)
+            user = _mutate(rng, ref) if case % 2 else _random_words(rng, 40)
+            yield ref, user
+
+    def test_alignment_matches_full_table_backtrack(self):
+        for ref, user in self._pairs():
+            expected, _ = _reference_alignment(ref, user)
+            self.assertEqual(checker.align(ref, user), expected, (ref, user))
+
+    def test_encoded_rows_reproduce_every_table_cell(self):
+        for ref, user in list(self._pairs())[:100]:
+            _, dp = _reference_alignment(ref, user)
+            rows = checker._lcs_rows(ref, user)
+            for i in range(len(ref) + 1):
+                for j in range(len(user) + 1):
+                    self.assertEqual(checker._lcs_at(rows, i, j), dp[i][j], (ref, user, i, j))
+
+    def test_alignment_covers_both_inputs_in_order(self):
+        for ref, user in self._pairs():
+            alignment = checker.align(ref, user)
+            self.assertEqual([r for r, _ in alignment if r is not None], ref)
+            self.assertEqual([u for _, u in alignment if u is not None], user)
+
+    def test_long_transcripts(self):
+        rng = random.Random(7)
+        ref = [rng.choice(VOCABULARY) for _ in range(400)]
+        user = _mutate(rng, ref)
+        expected, _ = _reference_alignment(ref, user)
+        self.assertEqual(checker.align(ref, user), expected)
+
+
+class CompareStatusesTest(SimpleTestCase):
+    @patch('dictation.checker._batch_semantic_check', side_effect=lambda pairs: [False] * len(pairs))
+    def test_statuses_match_reference_alignment(self, _mock):
+        rng = random.Random(99)
+        sentences = [
+            'Yesterday Anna flew from London to Paris.',
+            'The cat sat on the mat, and the dog sat on the rug.',
+            'We met Doctor Nguyen at the Hanoi office on Monday.',
+        ]
+        for _ in range(200):
+            reference = rng.choice(sentences)
+            words = reference.split()
+            attempt = ' '.join(_mutate(rng, words))
+            result = checker.compare(reference, attempt)
+
+            ref_words, user_words = checker.normalize(reference), checker.normalize(attempt)
+            if not user_words:
+                continue
+            expected, _ = _reference_alignment(ref_words, user_words)
+            with patch('dictation.checker.align', return_value=expected):
+                legacy = checker.compare(reference, attempt)
+            self.assertEqual(result, legacy, (reference, attempt))
+
+    @patch('dictation.checker._batch_semantic_check', return_value=[False])
+    def test_proper_noun_leniency(self, _mock):
+        result = checker.compare('We flew to Bangkok today.', 'we flew to bangkock today')
+        statuses = [t['status'] for t in result['tokens']]
+        self.assertEqual(statuses, ['correct', 'correct', 'correct', 'proper', 'correct'])
+        self.assertEqual(result['score'], 1.0)
+
+    def test_similar_agrees_with_ratio(self):
+        from difflib import SequenceMatcher
+        rng = random.Random(3)
+        letters = 'abcdeln'
+        for _ in range(500):
+            a = ''.join(rng.choice(letters) for _ in range(rng.randint(1, 9)))
+            b = ''.join(rng.choice(letters) for _ in range(rng.randint(1, 9)))
+            self.assertEqual(checker._similar(a, b), SequenceMatcher(None, a, b).ratio() >= 0.72)
@@ -0,0 +1,150 @@
+"""Tests for the two-phase dictation answer check."""
+import json
+from unittest.mock import patch
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+
+from dictation.references import segment_reference
+from dictation.models import DictationAttempt, DictationCheck, DictationSegment, DictationVideo
+
+User = get_user_model()
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class TwoPhaseCheckTest(TestCase):
+    def setUp(self):
+        segment_reference.cache_clear()  # ids are reused across rolled-back tests
+        self.user = User.objects.create_user(email='check@x.com', password='pass')
+        self.client = Client()
+        self.client.login(email='check@x.com', password='pass')
+        self.video = DictationVideo.objects.create(
+            video_id='chk001', title='Check Video', is_processed=True, segment_count=1,
+        )
+        self.segment = DictationSegment.objects.create(
+            video=self.video, order=1, start_time=0, end_time=5,
+            transcript='The car is very big.', word_count=5,
+        )
+
+    def _post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def _check(self, user_input):
+        return self._post('/api/dictation/check-answer/', {'segment_id': self.segment.id, 'user_input': user_input})
+
+    def test_fast_pass_returns_before_llm(self):
+        with patch('dictation.checker._ask_llm', return_value=[True]) as ask:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                data = self._check('the car is very large').json()
+            ask.assert_not_called()
+
+            self.assertTrue(data['semantic_pending'])
+            self.assertEqual(data['score'], 0.8)
+            self.assertEqual(data['tokens'][-1]['status'], 'wrong')
+            self.assertNotIn('pending_spans', data)
+            self.assertEqual(len(callbacks), 1)
+
+            callbacks[0]()
+            ask.assert_called_once_with([('big', 'large')])
+
+        status = self.client.get(f"/api/dictation/checks/{data['check_id']}/").json()
+        self.assertEqual(status['status'], DictationCheck.STATUS_DONE)
+        self.assertFalse(status['semantic_pending'])
+        self.assertEqual(status['score'], 1.0)
+        self.assertEqual(status['tokens'][-1]['status'], 'semantic')
+        self.assertEqual(status['transcript'], self.segment.transcript)
+
+    def test_locally_settled_check_is_final(self):
+        with patch('dictation.checker._ask_llm') as ask:
+            data = self._check('the car is very big').json()
+        ask.assert_not_called()
+        self.assertFalse(data['semantic_pending'])
+        self.assertIsNone(data['check_id'])
+        self.assertFalse(DictationCheck.objects.exists())
+
+    def test_attempt_saved_while_pending_gets_final_score(self):
+        with patch('dictation.checker._ask_llm', return_value=[True]):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                data = self._check('the car is very large').json()
+            saved = self._post('/api/dictation/save-attempt/', {
+                'segment_id': self.segment.id, 'user_input': 'the car is very large',
+                'score': data['score'], 'check_id': data['check_id'],
+            }).json()
+            self.assertTrue(saved['semantic_pending'])
+            self.assertEqual(DictationAttempt.objects.get(id=saved['id']).score, 0.8)
+
+            callbacks[0]()
+        self.assertEqual(DictationAttempt.objects.get(id=saved['id']).score, 1.0)
+
+    def test_attempt_saved_after_pass_records_final_score(self):
+        with patch('dictation.checker._ask_llm', return_value=[True]):
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self._check('the car is very large').json()
+        saved = self._post('/api/dictation/save-attempt/', {
+            'segment_id': self.segment.id, 'user_input': 'the car is very large',
+            'score': data['score'], 'check_id': data['check_id'],
+        }).json()
+        self.assertFalse(saved['semantic_pending'])
+        self.assertEqual(saved['score'], 1.0)
+
+    def test_unavailable_llm_keeps_fast_score(self):
+        with patch('dictation.checker._ask_llm', return_value=None):
+            with self.captureOnCommitCallbacks(execute=True):
+                data = self._check('the car is very large').json()
+        check = DictationCheck.objects.get(id=data['check_id'])
+        self.assertEqual(check.status, DictationCheck.STATUS_DONE)
+        self.assertEqual(check.result['score'], 0.8)
+
+    def test_other_users_cannot_read_check(self):
+        with patch('dictation.checker._ask_llm', return_value=[True]):
+            with self.captureOnCommitCallbacks(execute=False):
+                data = self._check('the car is very large').json()
+        User.objects.create_user(email='other@x.com', password='pass')
+        other = Client()
+        other.login(email='other@x.com', password='pass')
+        self.assertEqual(other.get(f"/api/dictation/checks/{data['check_id']}/").status_code, 404)
+
+
+class SegmentReferenceTest(TestCase):
+    def setUp(self):
+        segment_reference.cache_clear()
+        video = DictationVideo.objects.create(video_id='ref001', title='Ref', is_processed=True, segment_count=1)
+        self.segment = DictationSegment(
+            video=video, order=1, start_time=0, end_time=5,
+            transcript='Yesterday we met Anna in London.', word_count=6,
+        )
+        self.segment.prepare_reference()
+        self.segment.save()
+
+    def test_tokens_are_precomputed(self):
+        self.assertEqual(self.segment.reference_tokens, 'yesterday we met anna in london')
+        self.assertEqual(self.segment.proper_nouns, 'anna london')
+
+    def test_cached_reference_skips_query_and_normalisation(self):
+        first = segment_reference(self.segment.id)
+        self.assertEqual(first.prepared.words[-1], 'london')
+        self.assertEqual(first.prepared.proper_nouns, frozenset({'anna', 'london'}))
+        with self.assertNumQueries(0), patch('dictation.checker._get_proper_noun_set') as proper:
+            self.assertIs(segment_reference(self.segment.id), first)
+        proper.assert_not_called()
+
+    def test_legacy_segment_without_tokens(self):
+        DictationSegment.objects.filter(id=self.segment.id).update(reference_tokens='', proper_nouns='')
+        reference = segment_reference(self.segment.id)
+        self.assertEqual(reference.prepared.proper_nouns, frozenset({'anna', 'london'}))
+
+    @patch('dictation.checker._ask_llm')
+    def test_check_uses_prepared_reference(self, ask):
+        User.objects.create_user(email='ref@x.com', password='pass')
+        client = Client()
+        client.login(email='ref@x.com', password='pass')
+        segment_reference(self.segment.id)
+        with patch('dictation.checker._get_proper_noun_set') as proper:
+            data = client.post('/api/dictation/check-answer/', json.dumps({
+                'segment_id': self.segment.id, 'user_input': 'yesterday we met ana in london',
+            }), content_type='application/json').json()
+        proper.assert_not_called()
+        self.assertEqual(data['score'], 1.0)
+        self.assertEqual(data['proper_count'], 1)
+        self.assertEqual(client.post('/api/dictation/check-answer/', json.dumps({
+            'segment_id': 999999, 'user_input': 'x',
+        }), content_type='application/json').status_code, 404)
@@ -0,0 +1,111 @@
+"""Tests for background YouTube video ingestion."""
+import json
+from unittest.mock import patch
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+
+from dictation.models import DictationVideo
+
+User = get_user_model()
+
+VIDEO_URL = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+ENTRIES = [
+    {'text': 'Hello there.', 'start': 0.0, 'duration': 5.0},
+    {'text': 'This is a test.', 'start': 5.0, 'duration': 5.0},
+]
+OEMBED = ('Test title', 'https://img.example.com/t.jpg', 'Channel')
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+@patch('dictation.ingest.queue_fill')
+@patch('dictation.ingest.fetch_oembed_metadata', return_value=OEMBED)
+class VideoIngestionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='ingest@x.com', password='pass')
+        self.client = Client()
+        self.client.login(email='ingest@x.com', password='pass')
+
+    def _submit(self, **extra):
+        return self.client.post('/api/dictation/process-video/', json.dumps({'url': VIDEO_URL, **extra}),
+                                content_type='application/json')
+
+    def _status(self):
+        return self.client.get('/api/dictation/videos/dQw4w9WgXcQ/status/').json()
+
+    def test_video_is_ingested_in_background(self, _oembed, queue_fill):
+        with patch('dictation.ingest.fetch_subtitles', return_value=(ENTRIES, 'cc')) as fetch:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                resp = self._submit()
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(resp.json()['status'], DictationVideo.STATUS_QUEUED)
+            fetch.assert_not_called()
+
+            callbacks[0]()
+
+        status = self._status()
+        self.assertEqual(status['status'], DictationVideo.STATUS_READY)
+        self.assertEqual(status['progress'], 1.0)
+        self.assertEqual(status['title'], 'Test title')
+        video = DictationVideo.objects.get(video_id='dQw4w9WgXcQ')
+        self.assertTrue(video.is_processed)
+        self.assertEqual(video.segments.count(), video.segment_count)
+        self.assertEqual(video.segments.first().reference_tokens, 'hello there this is a test')
+        self.assertEqual(video.subtitle_source, 'cc')
+        queue_fill.assert_called_once_with(video.pk)
+
+    def test_concurrent_submissions_share_one_job(self, _oembed, queue_fill):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self._submit()
+            second = self._submit()
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(DictationVideo.objects.count(), 1)
+
+    def test_long_video_waits_for_confirmation(self, _oembed, queue_fill):
+        long_entries = [{'text': f'Line {i}.', 'start': i * 10.0, 'duration': 10.0} for i in range(200)]
+        with patch('dictation.ingest.fetch_subtitles', return_value=(long_entries, 'auto')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit()
+            self.assertIn('warning', self._status())
+            data = self._submit().json()
+            self.assertIn('warning', data)
+            self.assertEqual(data['duration_seconds'], 2000)
+            self.assertFalse(DictationVideo.objects.get().segments.exists())
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit(confirm_long=True)
+        self.assertEqual(self._status()['status'], DictationVideo.STATUS_READY)
+        self.assertTrue(DictationVideo.objects.get().segments.exists())
+
+    def test_failed_ingestion_can_be_retried(self, _oembed, queue_fill):
+        with patch('dictation.ingest.fetch_subtitles', side_effect=Exception('No English subtitles found')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit()
+        data = self._status()
+        self.assertEqual(data['status'], DictationVideo.STATUS_FAILED)
+        self.assertEqual(data['error'], 'No English subtitles found')
+
+        with patch('dictation.ingest.fetch_subtitles', return_value=(ENTRIES, 'cc')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit()
+        self.assertEqual(self._status()['status'], DictationVideo.STATUS_READY)
+
+    def test_video_abandoned_by_a_dead_worker_can_be_resubmitted(self, _oembed, queue_fill):
+        from vocabulary.models import BackgroundJob
+        with self.captureOnCommitCallbacks(execute=False):
+            self._submit()
+        DictationVideo.objects.update(status=DictationVideo.STATUS_PROCESSING, progress=0.4)
+        # Still running somewhere: a second submission does not start another job
+        self._submit()
+        self.assertEqual(BackgroundJob.objects.count(), 1)
+
+        BackgroundJob.objects.update(status=BackgroundJob.STATUS_FAILED, error='Worker lease expired')
+        with patch('dictation.ingest.fetch_subtitles', return_value=(ENTRIES, 'cc')):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit()
+        self.assertEqual(self._status()['status'], DictationVideo.STATUS_READY)
+
+    def test_unprocessed_videos_are_hidden_from_practice(self, _oembed, queue_fill):
+        with self.captureOnCommitCallbacks(execute=False):
+            self._submit()
+        self.assertEqual(self.client.get('/api/dictation/videos/dQw4w9WgXcQ/segments/').status_code, 404)
@@ -0,0 +1,89 @@
+"""Tests for per-segment dictation progress."""
+import json
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+
+from dictation.references import segment_reference
+from dictation.models import DictationProgress, DictationSegment, DictationVideo
+
+User = get_user_model()
+
+
+class DictationProgressTest(TestCase):
+    def setUp(self):
+        segment_reference.cache_clear()  # ids are reused across rolled-back tests
+        self.user = User.objects.create_user(email='progress@x.com', password='pass')
+        self.client = Client()
+        self.client.login(email='progress@x.com', password='pass')
+        self.video = DictationVideo.objects.create(
+            video_id='prg001', title='Progress Video', is_processed=True, segment_count=3,
+        )
+        self.segments = [
+            DictationSegment.objects.create(
+                video=self.video, order=i, start_time=i * 5, end_time=i * 5 + 5,
+                transcript='The car is very big.', word_count=5,
+            )
+            for i in range(1, 4)
+        ]
+
+    def _save(self, segment, score, revealed=False, **extra):
+        return self.client.post('/api/dictation/save-attempt/', json.dumps({
+            'segment_id': segment.id, 'user_input': 'x', 'score': score, 'revealed_answer': revealed, **extra,
+        }), content_type='application/json')
+
+    def test_attempts_update_progress(self):
+        self._save(self.segments[0], 0.4)
+        self._save(self.segments[0], 0.9)
+        self._save(self.segments[0], 0, revealed=True)
+
+        row = DictationProgress.objects.get(user=self.user, segment=self.segments[0])
+        self.assertEqual(row.video, self.video)
+        self.assertEqual(row.attempt_count, 3)
+        self.assertEqual(row.latest_score, 0)
+        self.assertEqual(row.best_score, 0.9)
+        self.assertTrue(row.revealed)
+
+    def test_video_progress_is_one_query(self):
+        for segment in self.segments:
+            self._save(segment, 0.5)
+            self._save(segment, 0.75)
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/dictation/progress/prg001/').json()
+        sql = [q['sql'] for q in queries.captured_queries]
+        self.assertEqual(sum('dictation_dictationprogress' in q for q in sql), 1)
+        self.assertFalse(any('dictation_dictationattempt' in q for q in sql))
+        self.assertEqual(len(data['progress']), 3)
+        entry = data['progress'][str(self.segments[1].id)]
+        self.assertEqual(entry, {'score': 0.75, 'best_score': 0.75, 'revealed': False, 'attempts': 2})
+
+    def test_progress_is_per_user(self):
+        self._save(self.segments[0], 1.0)
+        User.objects.create_user(email='other@x.com', password='pass')
+        other = Client()
+        other.login(email='other@x.com', password='pass')
+        self.assertEqual(other.get('/api/dictation/progress/prg001/').json()['progress'], {})
+
+    def test_video_list_shows_practised_segments(self):
+        self._save(self.segments[0], 1.0)
+        self._save(self.segments[2], 0.5)
+        response = self.client.get('/dictation/')
+        self.assertContains(response, '2/3 practised')
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_semantic_pass_rescores_progress(self):
+        with patch('dictation.checker._ask_llm', return_value=[True]):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                check = self.client.post('/api/dictation/check-answer/', json.dumps({
+                    'segment_id': self.segments[0].id, 'user_input': 'the car is very large',
+                }), content_type='application/json').json()
+            self._save(self.segments[0], check['score'], check_id=check['check_id'])
+            row = DictationProgress.objects.get(segment=self.segments[0])
+            self.assertEqual((row.latest_score, row.best_score), (0.8, 0.8))
+
+            callbacks[0]()
+        row.refresh_from_db()
+        self.assertEqual((row.latest_score, row.best_score), (1.0, 1.0))
@@ -1,7 +1,7 @@
 """Tests for dictation comprehension quiz service and views."""
 import json
 from unittest.mock import patch
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth import get_user_model
 
 from dictation.quiz_service import _parse_questions
@@ -88,7 +88,7 @@ class GenerateQuizViewTest(TestCase):
             for i in range(1, 11)
         ]
 
-    @patch('dictation.views.generate_quiz_questions')
+    @patch('dictation.quiz_pool.generate_quiz_questions')
     def test_generate_creates_quiz_and_returns_questions(self, mock_gen):
         mock_gen.return_value = self._make_fake_questions()
         resp = self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/')
@@ -98,15 +98,51 @@ class GenerateQuizViewTest(TestCase):
         self.assertNotIn('correct_choice', data['questions'][0])
         self.assertTrue(VideoQuiz.objects.filter(video=self.video).exists())
 
-    @patch('dictation.views.generate_quiz_questions')
-    def test_second_call_always_generates_fresh_questions(self, mock_gen):
+    @patch('dictation.quiz_pool.generate_quiz_questions')
+    def test_quiz_is_served_from_pool(self, mock_gen):
+        pooled = VideoQuiz.objects.create(video=self.video)
+        QuizQuestion.objects.bulk_create([QuizQuestion(quiz=pooled, **q) for q in self._make_fake_questions()])
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            resp = self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/')
+        self.assertEqual(resp.json()['quiz_id'], pooled.id)
+        mock_gen.assert_not_called()
+        # Last untaken quiz served: a top-up is queued
+        self.assertEqual(len(callbacks), 1)
+
+    @patch('dictation.quiz_pool.generate_quiz_questions')
+    def test_taken_quizzes_are_not_served_again(self, mock_gen):
         mock_gen.return_value = self._make_fake_questions()
-        self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/')
-        self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/')
+        first = self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/').json()
+        UserQuizAttempt.objects.create(user=self.user, quiz_id=first['quiz_id'], answers={}, score=0)
+        second = self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/').json()
+        self.assertNotEqual(first['quiz_id'], second['quiz_id'])
         self.assertEqual(mock_gen.call_count, 2)
-        self.assertEqual(VideoQuiz.objects.filter(video=self.video).count(), 2)
+        self.assertEqual(mock_gen.call_args.kwargs['avoid'][:2], ['Q1?', 'Q2?'])
 
-    @patch('dictation.views.generate_quiz_questions', side_effect=RuntimeError('LM Studio unavailable'))
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    @patch('dictation.quiz_pool.generate_quiz_questions')
+    def test_fill_pool_generates_up_to_target(self, mock_gen):
+        from dictation.quiz_pool import POOL_SIZE, fill_pool
+        mock_gen.return_value = self._make_fake_questions()
+        self.assertEqual(fill_pool(self.video.pk), POOL_SIZE)
+        self.assertEqual(fill_pool(self.video.pk), 0)
+        self.assertEqual(VideoQuiz.objects.filter(video=self.video).count(), POOL_SIZE)
+
+    @patch('vocabulary.llm_client.chat', return_value='Sorry, I cannot help with that.')
+    def test_fill_pool_stops_on_unparseable_reply(self, mock_chat):
+        from dictation.quiz_pool import fill_pool
+        self.assertEqual(fill_pool(self.video.pk), 0)
+        self.assertEqual(mock_chat.call_count, 2)
+
+    def test_larger_top_up_is_queued_next_to_a_smaller_one(self):
+        from dictation.quiz_pool import queue_fill
+        from vocabulary.models import BackgroundJob
+        queue_fill(self.video.pk, target=3)
+        queue_fill(self.video.pk, target=3)
+        queue_fill(self.video.pk, target=4)
+        self.assertEqual(sorted(job.args[1] for job in BackgroundJob.objects.all()), [3, 4])
+
+    @patch('dictation.quiz_pool.generate_quiz_questions', side_effect=RuntimeError('LM Studio unavailable'))
     def test_generate_returns_503_on_lm_failure(self, mock_gen):
         resp = self.client.post(f'/api/dictation/quiz/generate/{self.video.video_id}/')
         self.assertEqual(resp.status_code, 503)
@@ -0,0 +1,75 @@
+"""Tests for transcript segmentation."""
+import random
+import time
+from django.test import SimpleTestCase
+
+from dictation.youtube_service import build_segments
+
+
+def _entries(texts, gap=0.2, overlap=0.0):
+    entries, t = [], 0.0
+    for text in texts:
+        duration = len(text.split()) / 2.5
+        entries.append({'text': text, 'start': t, 'duration': duration + overlap})
+        t += duration + gap
+    return entries
+
+
+class BuildSegmentsTest(SimpleTestCase):
+    def test_splits_at_sentence_ends(self):
+        sentences = [
+            'Hello everyone and welcome back.', 'Today we will talk about the weather,',
+            'which has been strange lately.', 'It rained for ten days in a row.',
+            'Then suddenly it was hot again!', 'Nobody knows why this happens.',
+        ] * 3
+        segments = build_segments(_entries(sentences))
+        for seg in segments:
+            self.assertIn(seg['transcript'][-1], '.!?')
+
+    def test_unpunctuated_captions_split_at_pauses(self):
+        rng = random.Random(1)
+        entries, t, pause_ends = [], 0.0, set()
+        for k in range(400):
+            words = rng.randint(3, 8)
+            duration = words / 2.5
+            # Auto captions: no punctuation, each entry overlaps the next
+            entries.append({'text': ' '.join(['word'] * words), 'start': t, 'duration': duration + 1.0})
+            if k % 4 == 3:
+                pause_ends.add(round(t + duration + 1.0, 3))
+                t += duration + 1.0
+            else:
+                t += duration + 0.05
+        segments = build_segments(entries)
+        on_pause = sum(seg['end_time'] in pause_ends for seg in segments[:-1])
+        self.assertGreater(on_pause / (len(segments) - 1), 0.9)
+
+    def test_segments_cover_transcript_in_order(self):
+        texts = [f'line number {i} of the talk' for i in range(50)]
+        segments = build_segments(_entries(texts, gap=0.0))
+        self.assertEqual(' '.join(seg['transcript'] for seg in segments), ' '.join(texts))
+        self.assertEqual([seg['order'] for seg in segments], list(range(1, len(segments) + 1)))
+        for prev, nxt in zip(segments, segments[1:]):
+            self.assertLessEqual(prev['end_time'], nxt['start_time'])
+
+    def test_respects_max_duration(self):
+        texts = ['some words without any punctuation here'] * 100
+        for seg in build_segments(_entries(texts, gap=0.0), max_duration=10.0, target_duration=7.0):
+            self.assertLessEqual(seg['end_time'] - seg['start_time'], 10.0)
+
+    def test_single_long_entry_is_kept_whole(self):
+        entries = [{'text': 'a very long caption', 'start': 0.0, 'duration': 30.0},
+                   {'text': 'then a short one.', 'start': 30.0, 'duration': 2.0}]
+        segments = build_segments(entries)
+        self.assertEqual(segments[0]['transcript'], 'a very long caption')
+
+    def test_skips_empty_entries(self):
+        entries = [{'text': '<i></i>', 'start': 0, 'duration': 1}, {'text': 'Hi there friend.', 'start': 1, 'duration': 2}]
+        self.assertEqual(build_segments(entries)[0]['transcript'], 'Hi there friend.')
+        self.assertEqual(build_segments([]), [])
+
+    def test_linear_on_long_transcripts(self):
+        texts = ['five words in this caption'] * 20000
+        started = time.perf_counter()
+        segments = build_segments(_entries(texts, overlap=1.0))
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertTrue(segments)
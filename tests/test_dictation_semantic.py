@@ -0,0 +1,73 @@
+"""Tests for the dictation semantic-equivalence rules and verdict cache."""
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase
+
+from dictation.checker import _batch_semantic_check, compare
+from dictation.equivalence import canonical, rule_equivalent
+from dictation.models import SemanticVerdict
+
+
+class RuleTableTest(SimpleTestCase):
+    def test_equivalent_pairs(self):
+        pairs = [
+            ('80°c', '80 degrees celsius'),
+            ('eighty degrees celsius', '80°c'),
+            ('gonna', 'going to'),
+            ('mr smith', 'mister smith'),
+            ('twentyfive', 'twenty five'),
+            ('one hundred and five', '105'),
+            ('5km', 'five kilometers'),
+            ('50%', 'fifty percent'),
+            ('i dont know', 'i do not know'),
+            ('cannot', 'cant'),
+        ]
+        for reference, student in pairs:
+            self.assertTrue(rule_equivalent(reference, student), (reference, student))
+
+    def test_different_pairs(self):
+        pairs = [('two three', 'five'), ('he has', 'hes'), ('going to', 'went to'), ('cat', 'dog')]
+        for reference, student in pairs:
+            self.assertFalse(rule_equivalent(reference, student), (reference, student))
+
+    def test_canonical_keeps_unrelated_words(self):
+        self.assertEqual(canonical('and then we left'), 'and then we left')
+
+
+class VerdictCacheTest(TestCase):
+    def test_rules_resolve_without_llm(self):
+        with patch('dictation.checker._ask_llm') as ask:
+            self.assertEqual(_batch_semantic_check([('gonna', 'going to')]), [True])
+        ask.assert_not_called()
+        self.assertEqual(SemanticVerdict.objects.count(), 0)
+
+    def test_llm_verdicts_are_cached(self):
+        pairs = [('big', 'large'), ('car', 'cat')]
+        with patch('dictation.checker._ask_llm', return_value=[True, False]) as ask:
+            self.assertEqual(_batch_semantic_check(pairs), [True, False])
+        ask.assert_called_once_with(pairs)
+        self.assertEqual(SemanticVerdict.objects.count(), 2)
+
+        with patch('dictation.checker._ask_llm') as ask:
+            self.assertEqual(_batch_semantic_check(list(reversed(pairs))), [False, True])
+        ask.assert_not_called()
+
+    def test_only_unknown_pairs_reach_llm(self):
+        SemanticVerdict.objects.all().delete()
+        with patch('dictation.checker._ask_llm', return_value=[True]):
+            _batch_semantic_check([('big', 'large')])
+        with patch('dictation.checker._ask_llm', return_value=[False]) as ask:
+            result = _batch_semantic_check([('big', 'large'), ('gonna', 'going to'), ('car', 'cat'), ('car', 'cat')])
+        ask.assert_called_once_with([('car', 'cat')])
+        self.assertEqual(result, [True, True, False, False])
+
+    def test_unavailable_llm_is_not_cached(self):
+        with patch('dictation.checker._ask_llm', return_value=None):
+            self.assertEqual(_batch_semantic_check([('big', 'large')]), [False])
+        self.assertFalse(SemanticVerdict.objects.exists())
+
+    def test_compare_uses_rules(self):
+        with patch('dictation.checker._ask_llm') as ask:
+            result = compare("I'm gonna be there at 5pm.", 'im going to be there at 5pm')
+        ask.assert_not_called()
+        self.assertEqual(result['score'], 1.0)
+        self.assertEqual(result['semantic_count'], 1)
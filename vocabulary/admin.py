@@ -1,5 +1,12 @@
+import os
+
 from django.contrib import admin
-from .models import Flashcard, Definition, Deck, StudySession, StudySessionAnswer, DailyStatistics, WeeklyStatistics, FavoriteFlashcard, BlacklistFlashcard
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from .models import Flashcard, Definition, Deck, StudySession, StudySessionAnswer, DailyStatistics, WeeklyStatistics, FavoriteFlashcard, BlacklistFlashcard, TranslationCache, ImportJob, RequestProfile, BackgroundJob
 
 @admin.register(Deck)
 class DeckAdmin(admin.ModelAdmin):
@@ -212,3 +219,96 @@ class BlacklistFlashcardAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user', 'flashcard')
+
+
+@admin.register(TranslationCache)
+class TranslationCacheAdmin(admin.ModelAdmin):
+    list_display = ['source_text', 'translated_text', 'source_lang', 'target_lang', 'created_at']
+    list_filter = ['source_lang', 'target_lang']
+    search_fields = ['source_text', 'translated_text']
+    readonly_fields = ['text_hash', 'created_at']
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ['source_name', 'user', 'deck', 'format', 'status', 'imported_count', 'skipped_count', 'created_at']
+    list_filter = ['status', 'format']
+    search_fields = ['source_name', 'user__email', 'deck__name']
+    readonly_fields = ['created_at', 'updated_at', 'finished_at']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'deck')
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'query_count', 'sql_ms', 'user']
+    list_filter = ['view_name', 'status_code']
+    search_fields = ['path', 'view_name', 'user__email']
+    readonly_fields = [
+        'user', 'method', 'path', 'view_name', 'status_code', 'duration_ms', 'query_count', 'sql_ms',
+        'downloads', 'created_at', 'report_text',
+    ]
+    exclude = ['report', 'stats_file']
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        download = path(
+            '<int:pk>/download/<str:kind>/', self.admin_site.admin_view(self.download_file),
+            name='vocabulary_requestprofile_download',
+        )
+        return [download] + super().get_urls()
+
+    def download_file(self, request, pk, kind):
+        """The files are outside MEDIA_ROOT, so staff fetch them here."""
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if kind not in ('report', 'stats_file') or not self.has_view_permission(request, profile):
+            raise Http404
+        field = getattr(profile, kind)
+        try:
+            return FileResponse(field.open('rb'), as_attachment=True, filename=os.path.basename(field.name))
+        except (OSError, ValueError):
+            raise Http404
+
+    def downloads(self, obj):
+        links = [
+            format_html('<a href="{}">{}</a>',
+                        reverse('admin:vocabulary_requestprofile_download', args=[obj.pk, kind]), label)
+            for kind, label in (('report', 'Report'), ('stats_file', 'pstats dump'))
+            if getattr(obj, kind)
+        ]
+        return format_html_join(' | ', '{}', ((link,) for link in links))
+    downloads.short_description = 'Files'
+
+    def report_text(self, obj):
+        """Show the report inline as well as for download."""
+        try:
+            with obj.report.open('rb') as f:
+                text = f.read().decode('utf-8', errors='replace')
+        except (OSError, ValueError):
+            return '(report file missing)'
+        return format_html('<pre style="white-space: pre; overflow-x: auto;">{}</pre>', text)
+    report_text.short_description = 'Report'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'status', 'priority', 'attempts', 'progress', 'run_after', 'created_at', 'finished_at']
+    list_filter = ['status', 'task']
+    search_fields = ['task', 'dedup_key', 'error']
+    readonly_fields = ['attempts', 'result', 'error', 'locked_by', 'locked_at', 'created_at', 'started_at', 'finished_at']
+    actions = ['retry_jobs']
+
+    def retry_jobs(self, request, queryset):
+        active_keys = BackgroundJob.objects.filter(
+            status__in=BackgroundJob.ACTIVE_STATUSES, dedup_key__isnull=False).values('dedup_key')
+        updated = queryset.filter(status=BackgroundJob.STATUS_FAILED).exclude(dedup_key__in=active_keys).update(
+            status=BackgroundJob.STATUS_QUEUED, run_after=timezone.now(), error='', attempts=0,
+        )
+        self.message_user(request, f'{updated} failed jobs queued again.')
+    retry_jobs.short_description = 'Retry failed jobs'
@@ -1,23 +1,32 @@
+import hashlib
 import re
 import json
-import requests
-import urllib3
-from django.conf import settings
 from django.core.cache import cache
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from . import llm_client
+
+WORD_EXAMPLES_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def parse_list_reply(content: str) -> list[str]:
+    """The first JSON array of strings in `content`, else its non-empty lines without numbering."""
+    # LLM may wrap the array in prose — extract the first JSON array found.
+    match = re.search(r'\[.*?\]', content, re.DOTALL)
+    if match:
+        return [s for s in json.loads(match.group()) if isinstance(s, str)]
+    # Fallback: treat each non-empty line as an item, strip leading numbering.
+    return [
+        re.sub(r'^[\d.\-) ]+', '', line).strip()
+        for line in content.splitlines()
+        if line.strip()
+    ]
 
 
 def get_word_examples(word: str) -> list[str]:
     """
     Return 5 example sentences for `word` via the configured LLM proxy.
-    Results are cached for 24 hours to avoid redundant LLM calls.
+    Replies are cached for 24 hours to avoid redundant LLM calls.
     """
-    cache_key = f'ai_word_examples:{word.lower()}'
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
     prompt = (
         f'Give me exactly 5 natural English example sentences that use the word "{word}". '
         f'Each sentence should clearly show the meaning of "{word}" in context. '
@@ -25,35 +34,8 @@ def get_word_examples(word: str) -> list[str]:
         f'Example format: ["Sentence 1.", "Sentence 2.", "Sentence 3.", "Sentence 4.", "Sentence 5."]'
     )
 
-    response = requests.post(
-        settings.LLM_URL,
-        json={
-            'model': settings.LLM_MODEL,
-            'messages': [{'role': 'user', 'content': prompt}],
-            'temperature': 0.7,
-            'max_tokens': 600,
-        },
-        headers={'Authorization': f'Bearer {settings.LLM_API_KEY}'},
-        timeout=settings.LLM_TIMEOUT,
-        verify=False,
-    )
-    response.raise_for_status()
-    content = response.json()['choices'][0]['message']['content'].strip()
-
-    # LLM may wrap the array in prose — extract the first JSON array found.
-    match = re.search(r'\[.*?\]', content, re.DOTALL)
-    if match:
-        sentences = json.loads(match.group())
-        sentences = [s for s in sentences if isinstance(s, str)][:5]
-    else:
-        # Fallback: treat each non-empty line as a sentence, strip leading numbering.
-        sentences = [
-            re.sub(r'^[\d.\-) ]+', '', line).strip()
-            for line in content.splitlines()
-            if line.strip()
-        ][:5]
-
-    cache.set(cache_key, sentences, timeout=60 * 60 * 24)
+    content = llm_client.chat(prompt, temperature=0.7, max_tokens=600, cache_timeout=WORD_EXAMPLES_CACHE_TIMEOUT)
+    sentences = parse_list_reply(content)[:5]
     return sentences
 
 
@@ -62,10 +44,13 @@ def get_vstep_suggestions(existing_words: list[str]) -> list[str]:
     Return 20 VSTEP exam vocabulary words via the LLM proxy,
     excluding words the user already knows.
     Results are cached for 1 hour keyed by the sorted word set.
+
+    Only used when the shared pool (vstep_pool) has nothing left to suggest.
     """
     existing_lower = {w.lower() for w in existing_words}
 
-    cache_key = f'vstep_suggestions:{hash(tuple(sorted(existing_lower)))}'
+    words_hash = hashlib.sha256('\n'.join(sorted(existing_lower)).encode()).hexdigest()
+    cache_key = f'vstep_suggestions:{words_hash}'
     cached = cache.get(cache_key)
     if cached is not None:
         return cached
@@ -85,31 +70,8 @@ def get_vstep_suggestions(existing_words: list[str]) -> list[str]:
         '- Example: ["phenomenon", "substantial", "prevalent"]'
     )
 
-    response = requests.post(
-        settings.LLM_URL,
-        json={
-            'model': settings.LLM_MODEL,
-            'messages': [{'role': 'user', 'content': prompt}],
-            'temperature': 0.7,
-            'max_tokens': 800,
-        },
-        headers={'Authorization': f'Bearer {settings.LLM_API_KEY}'},
-        timeout=settings.LLM_TIMEOUT,
-        verify=False,
-    )
-    response.raise_for_status()
-    content = response.json()['choices'][0]['message']['content'].strip()
-
-    match = re.search(r'\[.*?\]', content, re.DOTALL)
-    if match:
-        words = json.loads(match.group())
-        words = [w for w in words if isinstance(w, str)]
-    else:
-        words = [
-            re.sub(r'^[\d.\-) ]+', '', line).strip()
-            for line in content.splitlines()
-            if line.strip()
-        ]
+    content = llm_client.chat(prompt, temperature=0.7, max_tokens=800)
+    words = parse_list_reply(content)
 
     result = [w for w in words if w.lower() not in existing_lower][:20]
     cache.set(cache_key, result, timeout=60 * 60)
@@ -1,8 +1,15 @@
 import requests
+from django.core.cache import cache
+
+DATAMUSE_TIMEOUT = 3  # seconds
+DATAMUSE_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
 
 def get_word_suggestions_from_datamuse(query):
     """Fetches word suggestions from Datamuse API.
 
+    Responses are cached for a day per lowercased query, including empty ones,
+    so repeated misses never reach the API twice.
+
     Args:
         query (str): The search query.
 
@@ -13,12 +20,18 @@ def get_word_suggestions_from_datamuse(query):
     if not query:
         return suggestions
 
-    datamuse_url = f"https://api.datamuse.com/sug?s={query}"
+    cache_key = f"datamuse_sug:{query.lower()}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    datamuse_url = "https://api.datamuse.com/sug"
     try:
-        response = requests.get(datamuse_url)
+        response = requests.get(datamuse_url, params={'s': query}, timeout=DATAMUSE_TIMEOUT)
         response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
         data = response.json()
         suggestions = [item['word'] for item in data]
+        cache.set(cache_key, suggestions, DATAMUSE_CACHE_TIMEOUT)
     except requests.exceptions.RequestException as e:
         # In a real application, you might want to log this error more formally
         print(f"[ERROR] Error calling Datamuse API for query '{query}': {e}")
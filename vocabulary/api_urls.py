@@ -18,6 +18,7 @@ urlpatterns = [
     # Translation and word services APIs
     path('api/translate-to-vietnamese/', views.translate_to_vietnamese, name='translate_to_vietnamese'),
     path('api/translate-word-to-vietnamese/', views.translate_word_to_vietnamese, name='translate_word_to_vietnamese'),
+    path('api/translate-batch/', views.api_translate_batch, name='api_translate_batch'),
     path('api/get-related-image/', views.get_related_image, name='get_related_image'),
     
     # Audio APIs
@@ -44,6 +45,11 @@ urlpatterns = [
 
     # Deck list (for flashcard add modals on other pages)
     path('api/decks/', views.api_list_decks, name='api_list_decks'),
+    path('api/decks/<int:deck_id>/cards/', views.api_deck_cards, name='api_deck_cards'),
+    path('api/flashcards/', views.api_flashcards, name='api_flashcards'),
+    path('api/import-deck/', views.api_import_deck, name='api_import_deck'),
+    path('api/import-deck/<int:job_id>/', views.api_import_status, name='api_import_status'),
+    path('api/export/', views.api_export, name='api_export'),
 
     # Favorites APIs
     path('api/favorites/toggle/', views.api_toggle_favorite, name='api_toggle_favorite'),
@@ -62,6 +68,7 @@ urlpatterns = [
 
     # Language (manual language switch without Django i18n)
     path('api/set-language/', views.api_set_language, name='api_set_language'),
+    path('i18n/js-translations/<str:lang>/<str:version>.js', views.js_translations, name='js_translations'),
 
     # AI features
     path('api/ai/word-examples/', views.api_ai_word_examples, name='api_ai_word_examples'),
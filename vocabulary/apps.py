@@ -6,5 +6,9 @@ class VocabularyConfig(AppConfig):
     name = 'vocabulary'
     
     def ready(self):
-        """Import signals when the app is ready."""
+        """Tune database connections, import signals and build the per-language translation bundles."""
+        from vocabulary import db_tuning
+        db_tuning.tune_open_connections()
         import vocabulary.signals
+        from vocabulary.context_processors import build_translation_bundles
+        build_translation_bundles()
@@ -0,0 +1,226 @@
+"""
+Local prefix index for word autocomplete.
+
+Suggestions are answered from in-process sorted word arrays (searched with
+bisect) instead of forwarding every keystroke to Datamuse. The global index is
+built from the CEFR wordlist plus the words at least GLOBAL_MIN_USERS users
+keep in their flashcards, so one user's private entries (names, typos) are
+never suggested to others; each user additionally gets a small index of their
+own cards. Results are ranked by CEFR level (easier first), then by how many
+users study the word.
+
+A stale global index keeps answering while a background task builds its
+replacement; only the very first build runs in a request.
+"""
+
+import bisect
+import functools
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+from . import background
+from .api_services import get_word_suggestions_from_datamuse
+from .models import Flashcard
+
+MAX_SUGGESTIONS = 10
+GLOBAL_INDEX_TTL = 60 * 15     # Rebuild the shared index every 15 minutes
+GLOBAL_MIN_USERS = 3           # Flashcard words enter the shared index once this many users hold them
+USER_INDEX_TTL = 60 * 5        # Per-user indexes also refresh on flashcard changes
+MAX_USER_INDEXES = 256
+PRECOMPUTED_PREFIX_LENGTH = 2  # Short prefixes match thousands of words; rank them once at build time
+# Flashcard fields a user's index is built from; saves touching none of them keep it
+INDEXED_MODEL_FIELDS = {'word', 'user', 'user_id'}
+
+
+# cefr_service is imported lazily: loading it reads the wordlist from the
+# cache table, and this module is imported from AppConfig.ready via signals.
+
+
+@functools.cache
+def _cefr_ranks() -> dict[str, int]:
+    from .cefr_service import CEFRLevelClassifier
+    return {level: rank for rank, level in enumerate(CEFRLevelClassifier.CEFR_LEVELS)}
+
+
+def _rank_key(word: str, cefr_level: str | None, frequency: int) -> tuple:
+    ranks = _cefr_ranks()
+    return (ranks.get(cefr_level, len(ranks)), -frequency, len(word), word)
+
+
+class PrefixIndex:
+    """Immutable sorted word array answering ranked prefix queries with bisect."""
+
+    def __init__(self, ranks: dict[str, tuple], precompute: bool = False):
+        self.words = sorted(ranks)
+        self.ranks = ranks
+        self.top = {}
+        if precompute:
+            self._precompute_short_prefixes()
+
+    def _precompute_short_prefixes(self):
+        buckets = {}
+        for word in self.words:
+            for length in range(1, min(len(word), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                buckets.setdefault(word[:length], []).append(word)
+        self.top = {
+            prefix: heapq.nsmallest(MAX_SUGGESTIONS, words, key=self.ranks.__getitem__)
+            for prefix, words in buckets.items()
+        }
+
+    def search(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> list[str]:
+        if prefix in self.top and limit <= MAX_SUGGESTIONS:
+            return self.top[prefix][:limit]
+        lo = bisect.bisect_left(self.words, prefix)
+        hi = bisect.bisect_left(self.words, prefix + '\uffff', lo)
+        return heapq.nsmallest(limit, self.words[lo:hi], key=self.ranks.__getitem__)
+
+    def __len__(self):
+        return len(self.words)
+
+
+_lock = threading.Lock()
+_global_build_lock = threading.Lock()  # One build at a time; never held by readers
+_global_index: PrefixIndex | None = None
+_global_built_at = 0.0
+_global_rebuilding = False
+_user_indexes: OrderedDict = OrderedDict()  # user_id -> (built_at, PrefixIndex)
+
+
+def _word_levels() -> dict[str, str]:
+    from .cefr_service import CEFRLevelClassifier, cefr_classifier
+    levels = {}
+    # Walk hardest-first so a word listed at several levels keeps its easiest one.
+    for level in reversed(CEFRLevelClassifier.CEFR_LEVELS):
+        for word in cefr_classifier.wordlist_data.get(level, ()):
+            levels[word] = level
+    return levels
+
+
+def _build_global_index() -> PrefixIndex:
+    levels = _word_levels()
+    frequencies = dict(
+        Flashcard.objects
+        .annotate(word_lower=Lower('word'))
+        .values('word_lower')
+        .annotate(users=Count('user', distinct=True))
+        .filter(users__gte=GLOBAL_MIN_USERS)
+        .values_list('word_lower', 'users')
+    )
+    ranks = {
+        word: _rank_key(word, levels.get(word), frequencies.get(word, 0))
+        for word in set(levels) | set(frequencies)
+        if word
+    }
+    return PrefixIndex(ranks, precompute=True)
+
+
+def _swap_in_global_index(only_if_missing: bool = False) -> PrefixIndex:
+    """Build a fresh global index and replace the current one with it."""
+    global _global_index, _global_built_at
+    with _global_build_lock:
+        if only_if_missing and _global_index is not None:
+            return _global_index
+        index = _build_global_index()
+        with _lock:
+            _global_index = index
+            _global_built_at = time.monotonic()
+    return index
+
+
+def _rebuild_global_index():
+    global _global_rebuilding
+    try:
+        _swap_in_global_index()
+    finally:
+        _global_rebuilding = False
+
+
+def get_global_index() -> PrefixIndex:
+    global _global_rebuilding
+    index = _global_index
+    if index is None:
+        # Nothing to serve yet: the first request builds it
+        return _swap_in_global_index(only_if_missing=True)
+    if time.monotonic() - _global_built_at > GLOBAL_INDEX_TTL:
+        with _lock:
+            start = not _global_rebuilding
+            _global_rebuilding = True
+        if start:
+            background.submit(_rebuild_global_index)
+    return index
+
+
+def get_user_index(user_id: int) -> PrefixIndex:
+    now = time.monotonic()
+    with _lock:
+        entry = _user_indexes.get(user_id)
+        if entry and now - entry[0] <= USER_INDEX_TTL:
+            _user_indexes.move_to_end(user_id)
+            return entry[1]
+
+    global_index = get_global_index()
+    words = {
+        w.lower().strip()
+        for w in Flashcard.objects.filter(user_id=user_id).values_list('word', flat=True)
+    }
+    ranks = {
+        word: global_index.ranks.get(word) or _rank_key(word, None, 1)
+        for word in words
+        if word
+    }
+    index = PrefixIndex(ranks)
+
+    with _lock:
+        _user_indexes[user_id] = (now, index)
+        _user_indexes.move_to_end(user_id)
+        while len(_user_indexes) > MAX_USER_INDEXES:
+            _user_indexes.popitem(last=False)
+    return index
+
+
+def invalidate_user_index(user_id: int):
+    """Drop a user's cached index so their next query sees card changes."""
+    with _lock:
+        _user_indexes.pop(user_id, None)
+
+
+def reset_indexes():
+    """Forget every in-process index (used after bulk loads and in tests)."""
+    global _global_index, _global_built_at, _global_rebuilding
+    with _lock:
+        _global_index = None
+        _global_built_at = 0.0
+        _global_rebuilding = False
+        _user_indexes.clear()
+
+
+def suggest(prefix: str, user_id: int | None = None, limit: int = MAX_SUGGESTIONS) -> list[str]:
+    """
+    Return up to `limit` ranked completions for `prefix`.
+
+    Falls back to Datamuse (cached) only when no local word matches.
+    """
+    prefix = prefix.lower().strip()
+    if not prefix:
+        return []
+
+    global_index = get_global_index()
+    candidates = global_index.search(prefix, limit)
+    if user_id is not None:
+        user_index = get_user_index(user_id)
+        own = user_index.search(prefix, limit)
+        if own:
+            candidates = heapq.nsmallest(
+                limit,
+                set(candidates) | set(own),
+                key=lambda w: global_index.ranks.get(w) or user_index.ranks[w],
+            )
+
+    if candidates:
+        return candidates
+    return get_word_suggestions_from_datamuse(prefix)[:limit]
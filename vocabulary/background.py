@@ -0,0 +1,76 @@
+"""
+In-process background tasks.
+
+A small thread pool for work the request that started it should not wait
+for. Slow work goes through the job queue (vocabulary.jobs), which uses this
+pool to drain the queue inside the web process when JOBS_RUN_IN_PROCESS is
+on. A separate single-thread lane, `submit_interactive`, is kept for work a
+user is waiting on, so it never queues behind long jobs filling the pool.
+Each task closes its database connection when it finishes. Set
+BACKGROUND_TASKS_EAGER = True (as the tests do) to run tasks inline in the
+calling thread instead.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 2
+INTERACTIVE_WORKERS = 1
+
+_executor = None
+_interactive_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='vocabulary-bg')
+    return _executor
+
+
+def _get_interactive_executor() -> ThreadPoolExecutor:
+    global _interactive_executor
+    if _interactive_executor is None:
+        _interactive_executor = ThreadPoolExecutor(max_workers=INTERACTIVE_WORKERS,
+                                                   thread_name_prefix='vocabulary-interactive')
+    return _interactive_executor
+
+
+def _run(fn, args, kwargs):
+    close_old_connections()
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(fn, '__name__', fn))
+        raise
+    finally:
+        connection.close()
+
+
+def _run_eagerly(fn, args, kwargs) -> Future:
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        logger.exception("Background task %s failed", getattr(fn, '__name__', fn))
+        future.set_exception(e)
+    return future
+
+
+def submit(fn, *args, **kwargs):
+    """Run `fn(*args, **kwargs)` in the background; returns a Future."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return _run_eagerly(fn, args, kwargs)
+    return _get_executor().submit(_run, fn, args, kwargs)
+
+
+def submit_interactive(fn, *args, **kwargs):
+    """Like submit(), on the lane reserved for short work a user is waiting on."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return _run_eagerly(fn, args, kwargs)
+    return _get_interactive_executor().submit(_run, fn, args, kwargs)
@@ -0,0 +1,290 @@
+"""
+Benchmarks for the hot study, statistics and dictation paths.
+
+Each benchmark runs a fixed number of iterations through the Django test
+client, logged in as a generated user (see synthetic_data), and records
+per-iteration wall time and SQL query count. The report is plain JSON with
+sorted keys, so reports from two commits can be diffed directly:
+
+    {"benchmarks": {"dashboard": {"iterations": 50, "latency_ms": {...},
+                                  "queries": {...}, "status_codes": {...}}},
+     "environment": {...}}
+
+`checker.compare` is measured through compare_fast with a prepared reference:
+the semantic pass calls an LLM and its latency would swamp the alignment.
+
+`sqlite_write_throughput` is separate: it runs concurrent writer threads
+against a scratch SQLite file, once with SQLite's defaults (rollback journal,
+deferred transactions) and once with the tuned profile from db_tuning, and
+reports commits per second and `database is locked` failures for each.
+"""
+
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from .db_tuning import pragma_statements
+from .models import Deck, Flashcard
+
+DEFAULT_ITERATIONS = 50
+WARMUP_ITERATIONS = 3
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings: list[float], query_counts: list[int], status_codes: list[int]) -> dict:
+    ordered = sorted(timings)
+    return {
+        'iterations': len(timings),
+        'latency_ms': {
+            'p50': round(_percentile(ordered, 0.50) * 1000, 3),
+            'p90': round(_percentile(ordered, 0.90) * 1000, 3),
+            'p99': round(_percentile(ordered, 0.99) * 1000, 3),
+            'mean': round(statistics.fmean(ordered) * 1000, 3),
+            'max': round(ordered[-1] * 1000, 3),
+        },
+        'queries': {
+            'mean': round(statistics.fmean(query_counts), 2),
+            'max': max(query_counts),
+        },
+        'status_codes': {str(code): count for code, count in sorted(Counter(status_codes).items())},
+    }
+
+
+class BenchmarkContext:
+    """Logged-in client plus the fixtures the benchmarks draw from."""
+
+    def __init__(self, user, seed: int = 0):
+        self.user = user
+        self.rng = random.Random(seed)
+        self.client = Client()
+        self.client.force_login(user)
+        self.deck_ids = list(Deck.objects.filter(user=user).values_list('id', flat=True))
+        self.card_ids = list(Flashcard.objects.filter(user=user).values_list('id', flat=True))
+        self.words = list(Flashcard.objects.filter(user=user).values_list('word', flat=True)[:500])
+        self.segments = self._load_segments()
+
+    @staticmethod
+    def _load_segments():
+        from dictation.models import DictationSegment
+        from dictation.references import segment_reference
+
+        ids = DictationSegment.objects.order_by('id').values_list('id', flat=True)[:200]
+        return [segment_reference(segment_id) for segment_id in ids]
+
+    def post_json(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+
+def _next_question(ctx):
+    return ctx.post_json(reverse('api_next_question'), {
+        'study_mode': 'decks',
+        'deck_ids': ctx.rng.sample(ctx.deck_ids, min(3, len(ctx.deck_ids))),
+        'word_count': 20,
+        'seen_card_ids': ctx.rng.sample(ctx.card_ids, min(10, len(ctx.card_ids))),
+    })
+
+
+def _submit_answer(ctx):
+    return ctx.post_json(reverse('api_submit_answer'), {
+        'card_id': ctx.rng.choice(ctx.card_ids),
+        'correct': ctx.rng.random() < 0.75,
+        'response_time': round(ctx.rng.uniform(1, 10), 2),
+        'question_type': 'multiple_choice',
+    })
+
+
+def _statistics_data(ctx):
+    return ctx.client.get(reverse('api_statistics_data'), {'period': 30})
+
+
+def _dashboard(ctx):
+    return ctx.client.get(reverse('dashboard'))
+
+
+def _deck_detail(ctx):
+    return ctx.client.get(reverse('deck_detail', args=[ctx.rng.choice(ctx.deck_ids)]))
+
+
+def _search(ctx):
+    word = ctx.rng.choice(ctx.words)
+    return ctx.client.get(reverse('api_search_word_in_decks'), {'word': word[:max(3, len(word) - 2)]})
+
+
+def _checker_compare(ctx):
+    from dictation.checker import compare_fast
+
+    reference = ctx.rng.choice(ctx.segments)
+    words = reference.transcript.split()
+    # Drop and misspell a few words so the alignment has work to do
+    attempt = [w[:-1] if ctx.rng.random() < 0.15 else w for w in words if ctx.rng.random() > 0.1]
+    compare_fast(reference.transcript, ' '.join(attempt), reference.prepared)
+    return None
+
+
+BENCHMARKS = {
+    'api_next_question': _next_question,
+    'api_submit_answer': _submit_answer,
+    'api_statistics_data': _statistics_data,
+    'dashboard': _dashboard,
+    'deck_detail': _deck_detail,
+    'search': _search,
+    'checker.compare': _checker_compare,
+}
+
+
+def _requirements_met(name, ctx) -> bool:
+    if name == 'checker.compare':
+        return bool(ctx.segments)
+    if name == 'search':
+        return bool(ctx.words)
+    return bool(ctx.card_ids and ctx.deck_ids)
+
+
+def run_benchmark(name, ctx, iterations: int = DEFAULT_ITERATIONS, warmup: int = WARMUP_ITERATIONS) -> dict:
+    fn = BENCHMARKS[name]
+    for _ in range(warmup):
+        fn(ctx)
+
+    timings, query_counts, status_codes = [], [], []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = fn(ctx)
+            timings.append(time.perf_counter() - started)
+        query_counts.append(len(queries))
+        status_codes.append(response.status_code if response is not None else 0)
+    return summarize(timings, query_counts, status_codes)
+
+
+def run_benchmarks(user, names=None, iterations: int = DEFAULT_ITERATIONS,
+                   warmup: int = WARMUP_ITERATIONS, seed: int = 0, log=lambda message: None) -> dict:
+    """Run the named benchmarks (all by default) and return the JSON-ready report."""
+    try:
+        # Lets the test client accept the benchmark host and collect templates
+        setup_test_environment()
+    except RuntimeError:
+        pass  # Already set up (e.g. under the test runner)
+
+    ctx = BenchmarkContext(user, seed=seed)
+    results = {}
+    for name in names or BENCHMARKS:
+        if not _requirements_met(name, ctx):
+            log(f'{name}: skipped (no data)')
+            continue
+        results[name] = run_benchmark(name, ctx, iterations, warmup)
+        log(f"{name}: p50 {results[name]['latency_ms']['p50']} ms, "
+            f"{results[name]['queries']['mean']} queries")
+
+    return {
+        'benchmarks': results,
+        'environment': {
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'flashcards': len(ctx.card_ids),
+            'decks': len(ctx.deck_ids),
+            'iterations': iterations,
+            'seed': seed,
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Concurrent SQLite writers
+# ---------------------------------------------------------------------------
+
+SQLITE_PROFILES = {
+    # SQLite's and Django's defaults before db_tuning
+    'rollback_journal': ({'journal_mode': 'DELETE', 'synchronous': 'FULL'}, 'DEFERRED'),
+    'tuned': (None, 'IMMEDIATE'),  # settings.SQLITE_PRAGMAS
+}
+
+_WRITER_SCHEMA = """
+CREATE TABLE answer (id INTEGER PRIMARY KEY, session_id INTEGER, card_id INTEGER, is_correct INTEGER, answered_at REAL);
+CREATE INDEX answer_session ON answer (session_id);
+CREATE TABLE cache (cache_key TEXT PRIMARY KEY, value TEXT, expires REAL);
+"""
+
+
+def _writer(path, pragmas, begin, transactions, session_id, results):
+    db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    for statement in pragma_statements(pragmas):
+        db.execute(statement)
+    commits = locked = 0
+    for n in range(transactions):
+        # One study answer: read the session's answers, record the new one, refresh a cache row
+        try:
+            db.execute(f'BEGIN {begin}')
+            db.execute('SELECT COUNT(*) FROM answer WHERE session_id = ?', (session_id,)).fetchone()
+            db.execute('INSERT INTO answer (session_id, card_id, is_correct, answered_at) VALUES (?, ?, ?, ?)',
+                       (session_id, n, n % 4 != 0, time.time()))
+            db.execute('INSERT OR REPLACE INTO cache (cache_key, value, expires) VALUES (?, ?, ?)',
+                       (f'stats:{session_id}', str(n), time.time() + 300))
+            db.execute('COMMIT')
+            commits += 1
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            locked += 1
+            if db.in_transaction:
+                db.execute('ROLLBACK')
+    db.close()
+    results.append((commits, locked))
+
+
+def sqlite_write_throughput(writers: int = 8, transactions: int = 200) -> dict:
+    """Commits per second with `writers` threads, for each profile in SQLITE_PROFILES."""
+    report = {}
+    for name, (pragmas, begin) in SQLITE_PROFILES.items():
+        pragmas = pragmas if pragmas is not None else settings.SQLITE_PRAGMAS
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, 'writers.sqlite3')
+            setup = sqlite3.connect(path)
+            setup.executescript(_WRITER_SCHEMA)
+            setup.close()
+
+            results = []
+            threads = [
+                threading.Thread(target=_writer, args=(path, pragmas, begin, transactions, i, results))
+                for i in range(writers)
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+        commits = sum(c for c, _ in results)
+        report[name] = {
+            'writers': writers,
+            'transactions': writers * transactions,
+            'commits': commits,
+            'locked_errors': sum(locked for _, locked in results),
+            'commits_per_second': round(commits / elapsed, 1),
+            'seconds': round(elapsed, 3),
+        }
+    return report
+
+
+def dump_report(report: dict) -> str:
+    return json.dumps(report, indent=2, sort_keys=True) + '\n'
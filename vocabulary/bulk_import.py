@@ -0,0 +1,176 @@
+"""
+Bulk flashcard saving.
+
+A batch of cards is validated up front and then written with a fixed number
+of queries regardless of its size: one lookup of the user's existing cards,
+one upsert (`bulk_create(update_conflicts=True)`) for the cards, one delete and
+one insert for their definitions. CEFR levels are classified in memory from
+the loaded wordlist.
+
+Bulk writes bypass model signals, so the study cache, the autocomplete index
+and the search index are refreshed once per batch here instead of once per
+card.
+"""
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import connection, transaction
+
+from .autocomplete import invalidate_user_index
+from .cache_utils import invalidate_user_study_cache
+from .models import Definition, Flashcard
+from .search_index import reindex_flashcards
+
+CARD_FIELDS = ('phonetic', 'part_of_speech', 'audio_url')
+UPSERT_FIELDS = ['phonetic', 'part_of_speech', 'audio_url', 'deck', 'cefr_level', 'cefr_level_auto']
+
+_validate_url = URLValidator()
+
+
+class BatchValidationError(ValueError):
+    """Raised before anything is written when some cards in a batch are invalid."""
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        super().__init__('; '.join(f"card {idx}: {message}" for idx, message in errors.items()))
+
+
+def _max_length(field_name: str) -> int:
+    return Flashcard._meta.get_field(field_name).max_length
+
+
+def validate_cards(cards: dict) -> dict:
+    """
+    Clean a batch of card dicts keyed by their form index.
+
+    Cards without a word are dropped (blank form rows). Returns the cleaned
+    cards in index order, one per word with later duplicates winning. Raises
+    BatchValidationError listing every invalid card.
+    """
+    cleaned, errors = {}, {}
+    for idx in sorted(cards):
+        data = cards[idx]
+        word = (data.get('word') or '').strip()
+        if not word:
+            continue
+
+        card = {'word': word, 'image': data.get('image')}
+        for name in CARD_FIELDS:
+            card[name] = (data.get(name) or '').strip() or None
+        for name in ('word',) + CARD_FIELDS:
+            if card[name] and len(card[name]) > _max_length(name):
+                errors[idx] = f"{name} is longer than {_max_length(name)} characters"
+        if card['audio_url']:
+            try:
+                _validate_url(card['audio_url'])
+            except ValidationError:
+                errors[idx] = "audio_url is not a valid URL"
+        card['english_definition'] = (data.get('english_definition') or '').strip()
+        card['vietnamese_definition'] = (data.get('vietnamese_definition') or '').strip()
+
+        cleaned.pop(word, None)
+        cleaned[word] = card
+
+    if errors:
+        raise BatchValidationError(errors)
+    return cleaned
+
+
+def save_flashcard_batch(user, deck, cards: dict, keep_existing: bool = False) -> list[str]:
+    """
+    Validate and upsert a batch of cards into `deck`, replacing their definitions.
+
+    `cards` maps form indexes to dicts with word, phonetic, part_of_speech,
+    audio_url, english_definition, vietnamese_definition and an optional
+    uploaded image. With `keep_existing` (file imports), cards the user already
+    has keep their deck, any field the batch leaves blank and, when sent
+    without definition text, their definitions. Returns the saved words in
+    batch order.
+    """
+    # Imported here: loading cefr_service reads the wordlist from the cache table
+    from .cefr_service import cefr_classifier
+
+    batch = validate_cards(cards)
+    if not batch:
+        return []
+
+    existing = {
+        row['word']: row
+        for row in Flashcard.objects.filter(user=user, word__in=list(batch)).values(
+            'word', 'deck_id', 'cefr_level', 'cefr_level_auto', *CARD_FIELDS
+        )
+    }
+
+    flashcards = []
+    for word, card in batch.items():
+        current = existing.get(word)
+        fields = {name: card[name] for name in CARD_FIELDS}
+        deck_id = deck.pk
+        if current and keep_existing:
+            fields = {name: value or current[name] for name, value in fields.items()}
+            deck_id = current['deck_id']
+        cefr_level = current['cefr_level'] if current else None
+        cefr_level_auto = current['cefr_level_auto'] if current else False
+        # Same rule as Flashcard.update_cefr_level: classify new cards and cards without a level
+        if not cefr_level:
+            cefr_level = cefr_classifier.get_word_level(word)
+            cefr_level_auto = bool(cefr_level)
+        flashcards.append(Flashcard(
+            user=user,
+            deck_id=deck_id,
+            word=word,
+            cefr_level=cefr_level,
+            cefr_level_auto=cefr_level_auto,
+            **fields,
+        ))
+
+    with transaction.atomic():
+        Flashcard.objects.bulk_create(
+            flashcards,
+            update_conflicts=True,
+            unique_fields=['user', 'word'],
+            update_fields=UPSERT_FIELDS,
+        )
+        if any(card.pk is None for card in flashcards):
+            # Backends that cannot return ids from an upsert
+            ids = dict(Flashcard.objects.filter(user=user, word__in=list(batch)).values_list('word', 'id'))
+            for card in flashcards:
+                card.pk = ids[card.word]
+
+        card_ids = [card.pk for card in flashcards]
+        # A form save replaces every card's definitions; an import keeps them
+        # for cards that come without any definition text
+        defined = [
+            card for card in flashcards
+            if not keep_existing
+            or batch[card.word]['english_definition'] or batch[card.word]['vietnamese_definition']
+        ]
+        # A plain DELETE skips the per-row post_delete signals; the index is refreshed once below
+        if defined:
+            ids = [card.pk for card in defined]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {Definition._meta.db_table} WHERE flashcard_id IN ({', '.join(['%s'] * len(ids))})",
+                    ids,
+                )
+        Definition.objects.bulk_create([
+            Definition(
+                flashcard_id=card.pk,
+                english_definition=batch[card.word]['english_definition'],
+                vietnamese_definition=batch[card.word]['vietnamese_definition'],
+            )
+            for card in defined
+        ])
+
+        # Uploaded images still go through Flashcard.save so replaced files are removed
+        for card in flashcards:
+            image = batch[card.word]['image']
+            if image:
+                card.image = image
+                card.save(update_fields=['image'])
+
+        reindex_flashcards(card_ids)
+
+    invalidate_user_study_cache(user.id)
+    invalidate_user_index(user.id)
+    return list(batch)
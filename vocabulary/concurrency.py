@@ -0,0 +1,153 @@
+"""
+Concurrency helpers shared by the outbound service modules.
+"""
+
+import threading
+import time
+
+
+class _Call:
+    """A single in-flight call whose result is shared with waiting callers."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block and receive the same result (or exception) instead of
+    repeating the work. Nothing is memoised once the call has finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def do_many(self, keys, fn):
+        """
+        Batch form of do(): `fn` is called once with the keys no other caller
+        is computing and must return {key: result}; keys already in flight are
+        waited for instead. Returns {key: result} for every key.
+        """
+        led, followed = {}, {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    led[key] = self._calls[key] = _Call()
+                else:
+                    followed[key] = call
+
+        results = {}
+        if led:
+            # Run our own share before waiting, so two overlapping batches cannot wait on each other
+            try:
+                results = fn(list(led))
+                for key, call in led.items():
+                    call.result = results.get(key)
+            except BaseException as e:
+                for call in led.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key in led:
+                        self._calls.pop(key, None)
+                for call in led.values():
+                    call.event.set()
+
+        for key, call in followed.items():
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            results[key] = call.result
+        return results
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service the breaker considers down."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing service for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    `before_call()` raises CircuitOpenError for `reset_timeout` seconds. Then
+    one trial call is let through: success closes the breaker, failure opens
+    it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            if remaining > 0 or self._trial_running:
+                raise CircuitOpenError(f'Service unavailable; retrying in {max(remaining, 0):.0f}s')
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+    def abort_call(self):
+        """The call allowed by before_call() never reached the service."""
+        with self._lock:
+            self._trial_running = False
+
+    def reset(self):
+        self.record_success()
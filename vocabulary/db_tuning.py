@@ -0,0 +1,121 @@
+"""
+Database connection tuning.
+
+Every new SQLite connection gets the pragmas from settings.SQLITE_PRAGMAS.
+The defaults switch the file to write-ahead logging, so readers no longer
+block the single writer, with synchronous=NORMAL (durable at checkpoints, no
+fsync per commit), a busy timeout instead of an immediate `database is
+locked`, a memory-mapped read path, a larger page cache and in-memory temp
+tables. Transactions also start with BEGIN IMMEDIATE (DATABASES OPTIONS
+'transaction_mode'), so a writer waits for the lock up front instead of
+failing when it upgrades a read lock halfway through.
+
+`inspect()` and `maintain()` back the db_maintenance command.
+"""
+
+import os
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Pragmas that may be set from settings; anything else is ignored
+TUNABLE_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size', 'temp_store')
+_VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def pragma_statements(pragmas: dict) -> list[str]:
+    statements = []
+    for name in TUNABLE_PRAGMAS:
+        value = pragmas.get(name)
+        if value is None or not _VALUE_RE.match(str(value)):
+            continue
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(connection):
+    """Apply settings.SQLITE_PRAGMAS to an open SQLite connection."""
+    if connection.vendor != 'sqlite' or connection.connection is None:
+        return
+    # Straight on the sqlite3 connection: no execute wrappers, no query log
+    for statement in pragma_statements(getattr(settings, 'SQLITE_PRAGMAS', {})):
+        connection.connection.execute(statement)
+
+
+@receiver(connection_created)
+def tune_new_connection(sender, connection, **kwargs):
+    apply_pragmas(connection)
+
+
+def tune_open_connections():
+    """Tune connections opened before the receiver was connected (e.g. during app loading)."""
+    for connection in connections.all(initialized_only=True):
+        apply_pragmas(connection)
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+def _pragma(cursor, name):
+    cursor.execute(f"PRAGMA {name}")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def inspect(connection) -> dict:
+    """Size, fragmentation and journal settings of a SQLite database."""
+    with connection.cursor() as cursor:
+        page_size = _pragma(cursor, 'page_size')
+        page_count = _pragma(cursor, 'page_count')
+        freelist = _pragma(cursor, 'freelist_count')
+        journal_mode = _pragma(cursor, 'journal_mode')
+        auto_vacuum = {0: 'none', 1: 'full', 2: 'incremental'}.get(_pragma(cursor, 'auto_vacuum'))
+    name = str(connection.settings_dict['NAME'])
+    wal_path = f'{name}-wal'
+    return {
+        'file_bytes': page_size * page_count,
+        'free_bytes': page_size * freelist,
+        'fragmentation': round(freelist / page_count, 4) if page_count else 0.0,
+        'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        'journal_mode': journal_mode,
+        'auto_vacuum': auto_vacuum,
+    }
+
+
+def maintain(connection, analyze: bool = True, vacuum: bool = False, vacuum_pages: int = 0, log=lambda message: None):
+    """
+    Run routine maintenance on a SQLite database.
+
+    ANALYZE (optional) and PRAGMA optimize refresh the planner statistics, the
+    WAL is checkpointed and truncated, and free pages are returned with an
+    incremental vacuum (0 = all of them). `vacuum=True` runs a full VACUUM,
+    which also switches the file to auto_vacuum=incremental so later runs can
+    stay incremental; it rewrites the whole file and blocks writers meanwhile.
+    """
+    with connection.cursor() as cursor:
+        if analyze:
+            log('ANALYZE')
+            cursor.execute('ANALYZE')
+        log('PRAGMA optimize')
+        cursor.execute('PRAGMA optimize')
+
+        if vacuum:
+            log('VACUUM (auto_vacuum = incremental)')
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+        elif _pragma(cursor, 'auto_vacuum') == 2:
+            log('PRAGMA incremental_vacuum')
+            cursor.execute(f'PRAGMA incremental_vacuum({int(vacuum_pages)})' if vacuum_pages else 'PRAGMA incremental_vacuum')
+            cursor.fetchall()
+        else:
+            log('Skipping incremental vacuum: auto_vacuum is off (run with --vacuum once)')
+
+        if _pragma(cursor, 'journal_mode') == 'wal':
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            busy, log_frames, checkpointed = cursor.fetchone()
+            log(f'PRAGMA wal_checkpoint(TRUNCATE): {checkpointed}/{log_frames} frames'
+                + (' (busy: readers still open)' if busy else ''))
@@ -0,0 +1,210 @@
+"""
+Streaming export of a user's vocabulary data.
+
+Flashcards (with definitions), study answer history and daily statistics are
+read with `.iterator(chunk_size=...)` and written out line by line, so an
+export holds one chunk of rows in memory no matter how many years of history
+it covers. The same generators back the export endpoint (through
+StreamingHttpResponse) and the `export_user_data` management command.
+
+Formats:
+    csv    one dataset per file
+    jsonl  one JSON object per line, tagged with its dataset; may mix datasets
+    anki   tab-separated notes with Anki file headers (flashcards only), ready
+           for Anki's File > Import
+"""
+
+import csv
+import html
+import json
+
+from .models import DailyStatistics, Flashcard, StudySessionAnswer
+
+DATASETS = ('flashcards', 'answers', 'daily')
+FORMATS = ('csv', 'jsonl', 'anki')
+CHUNK_SIZE = 2000
+FLASHCARD_CHUNK_SIZE = 500  # Each chunk also prefetches its definitions
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+    'anki': 'text/plain; charset=utf-8',
+}
+FILE_EXTENSIONS = {'csv': 'csv', 'jsonl': 'jsonl', 'anki': 'txt'}
+
+FLASHCARD_COLUMNS = [
+    'deck', 'word', 'phonetic', 'part_of_speech', 'cefr_level', 'audio_url',
+    'general_synonyms', 'general_antonyms', 'english_definitions', 'vietnamese_definitions',
+    'total_reviews', 'correct_reviews', 'difficulty_score', 'last_reviewed', 'created_at',
+]
+ANSWER_FIELDS = {
+    'answered_at': 'answered_at',
+    'session_id': 'session_id',
+    'study_mode': 'session__study_mode',
+    'deck': 'flashcard__deck__name',
+    'word': 'flashcard__word',
+    'question_type': 'question_type',
+    'is_correct': 'is_correct',
+    'response_time_seconds': 'response_time_seconds',
+    'difficulty_before': 'difficulty_before',
+    'difficulty_after': 'difficulty_after',
+}
+DAILY_FIELDS = [
+    'date', 'total_study_time_seconds', 'total_questions_answered', 'correct_answers',
+    'incorrect_answers', 'unique_words_studied', 'study_sessions_count',
+    'average_session_duration', 'new_cards_created', 'is_study_day',
+]
+COLUMNS = {
+    'flashcards': FLASHCARD_COLUMNS,
+    'answers': list(ANSWER_FIELDS),
+    'daily': DAILY_FIELDS,
+}
+
+
+class ExportError(ValueError):
+    """The requested dataset/format combination cannot be exported."""
+
+
+def _value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Row sources
+# ---------------------------------------------------------------------------
+
+def iter_flashcards(user, deck_id=None):
+    cards = Flashcard.objects.filter(user=user)
+    if deck_id is not None:
+        cards = cards.filter(deck_id=deck_id)
+    cards = cards.select_related('deck').prefetch_related('definitions').order_by('deck_id', 'id')
+    for card in cards.iterator(chunk_size=FLASHCARD_CHUNK_SIZE):
+        definitions = list(card.definitions.all())
+        yield {
+            'deck': card.deck.name if card.deck else '',
+            'word': card.word,
+            'phonetic': card.phonetic or '',
+            'part_of_speech': card.part_of_speech or '',
+            'cefr_level': card.cefr_level or '',
+            'audio_url': card.audio_url or '',
+            'general_synonyms': card.general_synonyms or '',
+            'general_antonyms': card.general_antonyms or '',
+            'english_definitions': [d.english_definition for d in definitions],
+            'vietnamese_definitions': [d.vietnamese_definition for d in definitions],
+            'total_reviews': card.total_reviews,
+            'correct_reviews': card.correct_reviews,
+            'difficulty_score': card.difficulty_score,
+            'last_reviewed': _value(card.last_reviewed),
+            'created_at': _value(card.created_at),
+        }
+
+
+def iter_answers(user, deck_id=None):
+    answers = StudySessionAnswer.objects.filter(session__user=user)
+    if deck_id is not None:
+        answers = answers.filter(flashcard__deck_id=deck_id)
+    names = list(ANSWER_FIELDS)
+    rows = answers.order_by('answered_at', 'id').values_list(*ANSWER_FIELDS.values())
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield {name: _value(value) for name, value in zip(names, row)}
+
+
+def iter_daily_statistics(user, deck_id=None):
+    # Daily statistics are per user; a deck filter does not apply.
+    rows = DailyStatistics.objects.filter(user=user).order_by('date').values_list(*DAILY_FIELDS)
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield {name: _value(value) for name, value in zip(DAILY_FIELDS, row)}
+
+
+SOURCES = {
+    'flashcards': iter_flashcards,
+    'answers': iter_answers,
+    'daily': iter_daily_statistics,
+}
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if isinstance(value, list):
+        return ' | '.join(value)
+    return '' if value is None else value
+
+
+def _csv_lines(dataset, rows):
+    writer = csv.writer(_Echo())
+    columns = COLUMNS[dataset]
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_cell(row[column]) for column in columns])
+
+
+def _jsonl_lines(dataset, rows):
+    for row in rows:
+        yield json.dumps({'type': dataset, **row}, ensure_ascii=False) + '\n'
+
+
+def _html(text) -> str:
+    return html.escape(text or '', quote=False)
+
+
+def _anki_lines(rows):
+    writer = csv.writer(_Echo(), delimiter='\t', lineterminator='\n')
+    yield '#separator:tab\n#html:true\n#notetype:Basic\n#columns:Front\tBack\tDeck\tTags\n#deck column:3\n#tags column:4\n'
+    for row in rows:
+        # The fields are HTML (#html:true), so the text inside the markup is escaped
+        front = _html(row['word']) + (f"<br><i>{_html(row['phonetic'])}</i>" if row['phonetic'] else '')
+        back = '<br>'.join(
+            f"{_html(en)} <i>({_html(vi)})</i>" if vi else _html(en)
+            for en, vi in zip(row['english_definitions'], row['vietnamese_definitions'])
+        )
+        deck = 'Vocabulary::' + (row['deck'] or 'Default').replace('::', ':')
+        tags = ' '.join(tag.replace(' ', '_') for tag in (row['cefr_level'], row['part_of_speech']) if tag)
+        yield writer.writerow([front, back.replace('\n', '<br>'), deck, tags])
+
+
+def export_lines(user, datasets, fmt: str, deck_id=None):
+    """
+    Yield the export as text chunks.
+
+    Raises ExportError for unknown datasets or formats, CSV with several
+    datasets, and Anki with anything other than flashcards.
+    """
+    datasets = list(datasets)
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format: {fmt}")
+    unknown = [d for d in datasets if d not in DATASETS]
+    if unknown or not datasets:
+        raise ExportError(f"Unknown dataset: {', '.join(unknown) or '(none)'}")
+    if fmt == 'csv' and len(datasets) > 1:
+        raise ExportError("CSV exports hold one dataset; use jsonl to combine them")
+    if fmt == 'anki' and datasets != ['flashcards']:
+        raise ExportError("Anki exports contain flashcards only")
+
+    return _export_lines(user, datasets, fmt, deck_id)
+
+
+def _export_lines(user, datasets, fmt, deck_id):
+    for dataset in datasets:
+        rows = SOURCES[dataset](user, deck_id)
+        if fmt == 'csv':
+            yield from _csv_lines(dataset, rows)
+        elif fmt == 'anki':
+            yield from _anki_lines(rows)
+        else:
+            yield from _jsonl_lines(dataset, rows)
+
+
+def export_filename(datasets, fmt: str) -> str:
+    return f"vocabulary-{'-'.join(datasets)}.{FILE_EXTENSIONS[fmt]}"
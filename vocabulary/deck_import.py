@@ -0,0 +1,422 @@
+"""
+Streaming deck import from CSV/TSV (including Quizlet exports) and Anki packages.
+
+Files are parsed row by row and written in chunked transactions through
+bulk_import.save_flashcard_batch, so memory use depends on the chunk size, not
+on the file size. Progress is recorded on an ImportJob row that the upload
+endpoint and the management command both report from.
+
+Imported cards get their CEFR level during the bulk save. Missing
+definitions, phonetics and audio are filled in afterwards, one chunk of
+cards per background job (`enrich_import_chunk`), each queueing the next, so
+a large deck never holds a worker for long. The import_deck command runs
+`enrich_deck` inline instead. Only cards the import created are enriched:
+those with ids above the largest one before it started, up to the largest
+one when it finished. Cards already in the deck are left alone.
+"""
+
+import csv
+import html
+import io
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import uuid
+import zipfile
+from dataclasses import dataclass
+
+from django.core.files.storage import default_storage
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from . import jobs
+from .autocomplete import invalidate_user_index
+from .bulk_import import BatchValidationError, save_flashcard_batch
+from .cache_utils import invalidate_user_study_cache
+from .models import Definition, Flashcard, ImportJob
+from .search_index import reindex_flashcards
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+ENRICH_CHUNK_SIZE = 50
+UPLOAD_DIR = 'imports'
+# Largest Anki collection extracted from a package; it is copied to disk before reading
+MAX_ANKI_COLLECTION_BYTES = 512 * 1024 * 1024
+
+# Header names accepted for each card field (compared case-insensitively).
+COLUMN_ALIASES = {
+    'word': {'word', 'term', 'front', 'english', 'vocabulary'},
+    'english_definition': {'definition', 'english_definition', 'meaning', 'back', 'description'},
+    'vietnamese_definition': {'vietnamese', 'vietnamese_definition', 'translation', 'vi', 'nghĩa'},
+    'phonetic': {'phonetic', 'ipa', 'pronunciation'},
+    'part_of_speech': {'part_of_speech', 'pos', 'type', 'word_type'},
+    'audio_url': {'audio', 'audio_url'},
+}
+# Column order assumed when a file has no recognisable header (Quizlet: term, definition).
+POSITIONAL_COLUMNS = ('word', 'english_definition', 'vietnamese_definition')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SOUND_RE = re.compile(r'\[sound:[^\]]*\]')
+_ANKI_FIELD_SEPARATOR = '\x1f'
+
+
+class ImportFormatError(ValueError):
+    """The uploaded file cannot be read as the requested format."""
+
+
+@dataclass
+class ImportStats:
+    rows_read: int = 0
+    imported: int = 0
+    progress: float = 0.0
+
+    @property
+    def skipped(self):
+        # Blank rows, invalid rows and words repeated within a chunk
+        return self.rows_read - self.imported
+
+
+def detect_format(filename: str) -> str:
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in ('.apkg', '.colpkg'):
+        return ImportJob.FORMAT_ANKI
+    if extension in ('.tsv', '.txt'):
+        return ImportJob.FORMAT_TSV
+    return ImportJob.FORMAT_CSV
+
+
+def _clean(value: str) -> str:
+    """Strip HTML and Anki sound tags from a field."""
+    value = _SOUND_RE.sub('', value or '')
+    value = _TAG_RE.sub(' ', value.replace('<br>', '; ').replace('<br/>', '; '))
+    return ' '.join(html.unescape(value).split())
+
+
+def _header_columns(row: list[str]) -> list[tuple[int, str]] | None:
+    columns = []
+    for index, name in enumerate(row):
+        name = name.strip().lower().replace(' ', '_')
+        for field_name, aliases in COLUMN_ALIASES.items():
+            if name in aliases:
+                columns.append((index, field_name))
+                break
+    if any(field_name == 'word' for _, field_name in columns):
+        return columns
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Parsers: each yields (card dict, fraction of the file read)
+# ---------------------------------------------------------------------------
+
+def iter_delimited(path: str, delimiter: str | None = None):
+    size = os.path.getsize(path) or 1
+    with open(path, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', errors='replace', newline='')
+        if delimiter is None:
+            sample = text.read(4096)
+            text.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample, delimiters=',\t;').delimiter
+            except csv.Error:
+                delimiter = '\t' if '\t' in sample else ','
+        reader = csv.reader(text, delimiter=delimiter)
+
+        first = next(reader, None)
+        if first is None:
+            return
+        columns = _header_columns(first)
+        rows = reader
+        if columns is None:
+            columns = list(enumerate(POSITIONAL_COLUMNS))
+            rows = itertools.chain([first], reader)
+
+        for row in rows:
+            card = {name: _clean(row[index]) for index, name in columns if index < len(row)}
+            # raw.tell() runs ahead of the csv reader by at most one buffer
+            yield card, min(raw.tell() / size, 1.0)
+
+
+def _copy_limited(archive, member: str, target):
+    """Extract `member` into `target`, stopping at MAX_ANKI_COLLECTION_BYTES whatever the header claims."""
+    copied = 0
+    with archive.open(member) as source:
+        while chunk := source.read(1024 * 1024):
+            copied += len(chunk)
+            if copied > MAX_ANKI_COLLECTION_BYTES:
+                raise ImportFormatError("This Anki package is too large to import.")
+            target.write(chunk)
+
+
+def iter_anki(path: str):
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as e:
+        raise ImportFormatError("Not an Anki package: the file is not a zip archive.") from e
+    with archive:
+        names = set(archive.namelist())
+        # Packages exported for older Anki versions carry both; anki2 then holds a stub note.
+        member = next((n for n in ('collection.anki21', 'collection.anki2') if n in names), None)
+        if member is None:
+            if 'collection.anki21b' in names:
+                raise ImportFormatError(
+                    "This Anki package uses the compressed 2.1.50+ format; "
+                    "re-export it with 'Support older Anki versions' enabled."
+                )
+            raise ImportFormatError("Not an Anki package: no collection found.")
+        if archive.getinfo(member).file_size > MAX_ANKI_COLLECTION_BYTES:
+            raise ImportFormatError("This Anki package is too large to import.")
+        with tempfile.NamedTemporaryFile(suffix='.anki2', delete=False) as collection:
+            try:
+                _copy_limited(archive, member, collection)
+            except ImportFormatError:
+                collection.close()
+                os.remove(collection.name)
+                raise
+
+    try:
+        db = sqlite3.connect(collection.name)
+        try:
+            total = db.execute('SELECT count(*) FROM notes').fetchone()[0] or 1
+            for number, (fields,) in enumerate(db.execute('SELECT flds FROM notes ORDER BY id'), 1):
+                values = fields.split(_ANKI_FIELD_SEPARATOR)
+                card = {name: _clean(values[i]) for i, name in enumerate(POSITIONAL_COLUMNS) if i < len(values)}
+                yield card, number / total
+        except sqlite3.DatabaseError as e:
+            raise ImportFormatError(f"Unreadable Anki collection: {e}") from e
+        finally:
+            db.close()
+    finally:
+        os.remove(collection.name)
+
+
+def iter_rows(path: str, fmt: str):
+    if fmt == ImportJob.FORMAT_ANKI:
+        return iter_anki(path)
+    if fmt == ImportJob.FORMAT_TSV:
+        return iter_delimited(path, delimiter='\t')
+    return iter_delimited(path)
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def import_rows(user, deck, rows, chunk_size: int = CHUNK_SIZE, on_progress=None) -> ImportStats:
+    """
+    Save parsed rows into `deck`, one transaction per chunk.
+
+    Words the user already has stay in their deck, and keep any field the
+    file leaves blank. Invalid rows are skipped rather than failing the
+    chunk. `on_progress` is called with the running ImportStats after every
+    chunk.
+    """
+    stats = ImportStats()
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        cards = {index: card for index, (card, _) in enumerate(chunk)}
+        try:
+            saved = save_flashcard_batch(user, deck, cards, keep_existing=True)
+        except BatchValidationError as e:
+            for index in e.errors:
+                cards.pop(index)
+            saved = save_flashcard_batch(user, deck, cards, keep_existing=True)
+
+        stats.rows_read += len(chunk)
+        stats.imported += len(saved)
+        stats.progress = chunk[-1][1]
+        if on_progress:
+            on_progress(stats)
+    return stats
+
+
+def last_card_id() -> int:
+    """The largest flashcard id so far; cards created afterwards get larger ones."""
+    return Flashcard.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def _update_job(job_id: int, **fields):
+    ImportJob.objects.filter(pk=job_id).update(updated_at=timezone.now(), **fields)
+
+
+def start_import_job(user, deck, uploaded_file, fmt: str, enrich: bool = True) -> ImportJob:
+    """Store an upload and import it in the background; returns the pending job."""
+    name = default_storage.save(f"{UPLOAD_DIR}/{uuid.uuid4().hex}_{os.path.basename(uploaded_file.name)}",
+                                uploaded_file)
+    job = ImportJob.objects.create(
+        user=user, deck=deck, source_name=uploaded_file.name[:255], file_path=name, format=fmt, enrich=enrich,
+    )
+    jobs.enqueue(run_import_job, job.pk, priority=5)
+    return job
+
+
+def run_import_job(job_id: int):
+    """Import a stored upload, then enrich the deck if the job asks for it."""
+    job = ImportJob.objects.select_related('user', 'deck').get(pk=job_id)
+    job.new_cards_after = last_card_id()
+    _update_job(job.pk, status=ImportJob.STATUS_RUNNING, new_cards_after=job.new_cards_after)
+
+    def report(stats):
+        _update_job(job.pk, rows_read=stats.rows_read, imported_count=stats.imported,
+                    skipped_count=stats.skipped, progress=stats.progress)
+
+    try:
+        import_rows(job.user, job.deck, iter_rows(default_storage.path(job.file_path), job.format),
+                    on_progress=report)
+    except Exception as e:
+        logger.exception("Import job %s failed", job.pk)
+        _update_job(job.pk, status=ImportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now())
+        return
+    finally:
+        default_storage.delete(job.file_path)
+
+    if job.enrich:
+        _update_job(job.pk, status=ImportJob.STATUS_ENRICHING, progress=1.0, new_cards_upto=last_card_id())
+        jobs.enqueue(enrich_import_chunk, job.pk, priority=5)
+        return
+    _update_job(job.pk, status=ImportJob.STATUS_DONE, progress=1.0, finished_at=timezone.now())
+
+
+def job_status(job: ImportJob) -> dict:
+    return {
+        'id': job.pk,
+        'deck_id': job.deck_id,
+        'source_name': job.source_name,
+        'format': job.format,
+        'status': job.status,
+        'progress': round(job.progress, 3),
+        'rows_read': job.rows_read,
+        'imported': job.imported_count,
+        'skipped': job.skipped_count,
+        'enriched': job.enriched_count,
+        'error': job.error,
+        'finished': job.status in (ImportJob.STATUS_DONE, ImportJob.STATUS_FAILED),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Enrichment
+# ---------------------------------------------------------------------------
+
+def _lookup(word: str) -> dict:
+    """First phonetic, audio, part of speech and English definition from the dictionary."""
+    from .word_details_service import get_word_details
+
+    details = get_word_details(word)
+    if details.get('error'):
+        return {}
+    phonetics = details.get('phonetics') or [{}]
+    meanings = details.get('meanings') or [{}]
+    definitions = meanings[0].get('definitions') or [{}]
+    return {
+        'phonetic': next((p['text'] for p in phonetics if p.get('text')), ''),
+        'audio_url': next((p['audio'] for p in phonetics if p.get('audio')), ''),
+        'part_of_speech': meanings[0].get('part_of_speech', ''),
+        'english_definition': definitions[0].get('en', ''),
+    }
+
+
+def _enrich_chunk(cards: list[Flashcard]) -> int:
+    from .audio_service import fetch_audio_for_word
+    from .translation_service import translate_batch
+
+    defined = set(
+        Definition.objects.filter(flashcard__in=cards).values_list('flashcard_id', flat=True).distinct()
+    )
+    new_definitions, changed = [], []
+    for card in cards:
+        if card.pk not in defined:
+            found = _lookup(card.word)
+            card.phonetic = card.phonetic or found.get('phonetic') or None
+            card.part_of_speech = card.part_of_speech or found.get('part_of_speech') or None
+            card.audio_url = card.audio_url or found.get('audio_url') or None
+            if found.get('english_definition'):
+                new_definitions.append(Definition(flashcard=card, english_definition=found['english_definition']))
+        if not card.audio_url:
+            card.audio_url = fetch_audio_for_word(card.word) or None
+        changed.append(card)
+
+    if new_definitions:
+        try:
+            translations = translate_batch([d.english_definition for d in new_definitions], src='en', dest='vi')
+        except Exception as e:
+            logger.warning("Translation failed during enrichment: %s", e)
+            translations = [''] * len(new_definitions)
+        for definition, translated in zip(new_definitions, translations):
+            definition.vietnamese_definition = translated
+
+    Flashcard.objects.bulk_update(changed, ['phonetic', 'part_of_speech', 'audio_url'])
+    Definition.objects.bulk_create(new_definitions)
+    reindex_flashcards([card.pk for card in changed])
+    return len(changed)
+
+
+def _cards_to_enrich(deck, last_id: int, limit: int, upto_id: int | None = None) -> list[Flashcard]:
+    """The deck's next cards after `last_id` (up to `upto_id`) that lack a definition or audio."""
+    needs_work = Q(definitions__isnull=True) | Q(audio_url__isnull=True) | Q(audio_url='')
+    cards = Flashcard.objects.filter(deck=deck, id__gt=last_id).filter(needs_work)
+    if upto_id is not None:
+        cards = cards.filter(id__lte=upto_id)
+    return list(cards.distinct().order_by('id')[:limit])
+
+
+def enrich_deck(deck, chunk_size: int = ENRICH_CHUNK_SIZE, on_progress=None,
+                after_id: int = 0, upto_id: int | None = None) -> int:
+    """
+    Fill in missing definitions, phonetics and audio for a deck's cards,
+    or only for those with ids in (`after_id`, `upto_id`].
+
+    Walks the deck by id in chunks, so it can run while the user keeps
+    studying. Returns the number of cards processed.
+    """
+    processed, last_id = 0, after_id
+    while True:
+        cards = _cards_to_enrich(deck, last_id, chunk_size, upto_id)
+        if not cards:
+            break
+        last_id = cards[-1].pk
+        processed += _enrich_chunk(cards)
+        if on_progress:
+            on_progress(processed)
+
+    invalidate_user_study_cache(deck.user_id)
+    invalidate_user_index(deck.user_id)
+    return processed
+
+
+def enrich_import_chunk(job_id: int, last_id: int = 0):
+    """
+    Enrich the next chunk of the cards an import created after card
+    `last_id`, then queue the chunk after it; the last chunk marks the
+    import done.
+    """
+    job = ImportJob.objects.select_related('deck').get(pk=job_id)
+    try:
+        cards = _cards_to_enrich(job.deck, max(last_id, job.new_cards_after), ENRICH_CHUNK_SIZE, job.new_cards_upto)
+        enriched = job.enriched_count + (_enrich_chunk(cards) if cards else 0)
+    except Exception as e:
+        # The cards are imported; a failed enrichment only leaves gaps to fill later.
+        logger.exception("Enrichment for import job %s failed", job.pk)
+        _finish_enrichment(job, error=f"Enrichment stopped: {e}")
+        return
+    _update_job(job.pk, enriched_count=enriched)
+    jobs.set_progress(enriched / max(job.imported_count, 1), f"{enriched} cards enriched")
+
+    if len(cards) == ENRICH_CHUNK_SIZE:
+        jobs.enqueue(enrich_import_chunk, job.pk, cards[-1].pk, priority=5)
+    else:
+        _finish_enrichment(job)
+
+
+def _finish_enrichment(job: ImportJob, error: str = ''):
+    invalidate_user_study_cache(job.user_id)
+    invalidate_user_index(job.user_id)
+    fields = {'error': error} if error else {}
+    _update_job(job.pk, status=ImportJob.STATUS_DONE, finished_at=timezone.now(), **fields)
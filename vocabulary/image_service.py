@@ -1,10 +1,11 @@
 import base64
-import requests
-import urllib3
+import logging
 from django.conf import settings
 from django.core.cache import cache
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from . import llm_client
+
+logger = logging.getLogger(__name__)
 
 
 def generate_word_image(word: str, definition: str = '') -> str | None:
@@ -29,28 +30,11 @@ def generate_word_image(word: str, definition: str = '') -> str | None:
     )
 
     try:
-        response = requests.post(
-            settings.LLM_IMAGE_URL,
-            json={
-                'model': settings.LLM_IMAGE_MODEL,
-                'prompt': prompt,
-                'n': 1,
-                'size': '1024x1024',
-            },
-            headers={'Authorization': f'Bearer {settings.LLM_API_KEY}'},
-            timeout=settings.LLM_IMAGE_TIMEOUT,
-            verify=False,
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        image_data = data['data'][0]
+        image_data = llm_client.generate_image(prompt, size='1024x1024')
         if 'b64_json' in image_data:
             b64 = image_data['b64_json']
         elif 'url' in image_data:
-            img_response = requests.get(image_data['url'], timeout=30, verify=False)
-            img_response.raise_for_status()
-            b64 = base64.b64encode(img_response.content).decode('utf-8')
+            b64 = base64.b64encode(llm_client.download(image_data['url'])).decode('utf-8')
         else:
             return None
 
@@ -58,5 +42,5 @@ def generate_word_image(word: str, definition: str = '') -> str | None:
         return b64
 
     except Exception as e:
-        print(f"[WARNING] Image generation failed for '{word}': {e}")
+        logger.warning("Image generation failed for %r: %s", word, e)
         return None
@@ -0,0 +1,333 @@
+"""
+Database-backed job queue for slow work.
+
+`enqueue(fn, *args, **kwargs)` stores a BackgroundJob row naming the function
+by its dotted path, with JSON arguments. Workers claim due jobs with a
+compare-and-set UPDATE (queued -> running), so any number of worker threads
+and processes can share one SQLite file without a broker. A job can carry a
+dedup key: while a job with that key is queued or running, enqueueing it
+again returns the existing job.
+
+Failed jobs are retried with exponential backoff until `max_attempts` is
+used up. A task reports progress with `set_progress()`, which also renews its
+lease, and run_workers renews the leases of the jobs it is running; a job
+whose lease is not renewed for JOB_LEASE_SECONDS is assumed dead and queued
+again (or failed, if it has no attempts left).
+
+Jobs are run by `python manage.py run_workers`, which also enqueues the
+periodic tasks from settings.JOB_SCHEDULE, and marks itself alive in the
+cache every round. While no run_workers is alive (`runserver` on its own, as
+in development), a job queued by the web process is run there instead, on its
+background threads, so nothing a user waits on is left queued. Retries and
+periodic tasks still need a worker. JOBS_RUN_IN_PROCESS (off by default)
+makes the web process a full worker instead: it always drains the queue on
+its own threads, and `start_in_process_worker()` (called from wsgi.py and
+asgi.py) runs the same housekeeping there: lease renewal, stale-job
+recovery, the schedule and due retries. Jobs at INTERACTIVE_PRIORITY or above are ones a user is polling
+for; they also get a lane of their own (a reserved thread in the web
+process, --interactive-workers in run_workers), so long imports and
+ingestions holding every other worker cannot starve them. With
+BACKGROUND_TASKS_EAGER (the tests) a job runs inline once its transaction
+commits.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import background
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_DELAY = 30  # seconds, doubled on every further attempt
+DEFAULT_LEASE_SECONDS = 900
+CLAIM_ATTEMPTS = 5
+MAINTENANCE_INTERVAL = 60  # seconds between housekeeping rounds in the web process
+INTERACTIVE_PRIORITY = 10  # jobs at or above this priority have a user waiting on them
+WORKERS_ALIVE_KEY = 'jobs:workers_alive'
+WORKERS_ALIVE_SECONDS = 60  # run_workers counts as gone once it has not checked in for this long
+
+_current_job = ContextVar('current_job', default=None)
+_running = set()  # Jobs running in this process, for heartbeat()
+_maintenance_lock = threading.Lock()
+_maintenance_thread = None
+
+
+def task_path(fn) -> str:
+    return fn if isinstance(fn, str) else f"{fn.__module__}.{fn.__qualname__}"
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"[:100]
+
+
+def enqueue(fn, *args, dedup_key: str = None, priority: int = 0, max_attempts: int = 1,
+            delay: float = 0, dispatch: bool = True, task_kwargs: dict = None, **kwargs) -> BackgroundJob:
+    """
+    Queue `fn(*args, **kwargs)`; returns the job.
+
+    `fn` is a module-level function or its dotted path, and the arguments must
+    be JSON-serializable. Keyword arguments whose names clash with enqueue's
+    own (or that come from user input) go in `task_kwargs` instead. When
+    `dedup_key` matches a queued or running job, that job is returned and
+    nothing new is queued. `dispatch=False` leaves the job to run_workers even
+    when JOBS_RUN_IN_PROCESS is on.
+    """
+    kwargs = {**(task_kwargs or {}), **kwargs}
+    if dedup_key:
+        existing = active_job(dedup_key)
+        if existing is not None:
+            return existing
+    job = BackgroundJob(
+        task=task_path(fn), args=list(args), kwargs=kwargs, dedup_key=dedup_key or None, priority=priority,
+        max_attempts=max_attempts, run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # Another request queued the same key in the meantime
+        existing = active_job(dedup_key) if dedup_key else None
+        if existing is None:
+            raise
+        return existing
+    if dispatch:
+        transaction.on_commit(lambda: _dispatch(job.pk, job.priority))
+    return job
+
+
+def active_job(dedup_key: str):
+    """The queued or running job holding `dedup_key`, or None."""
+    return BackgroundJob.objects.filter(dedup_key=dedup_key, status__in=BackgroundJob.ACTIVE_STATUSES).first()
+
+
+def mark_workers_alive():
+    """Record that a run_workers process is polling the queue (called every housekeeping round)."""
+    cache.set(WORKERS_ALIVE_KEY, worker_name(), timeout=WORKERS_ALIVE_SECONDS)
+
+
+def workers_alive() -> bool:
+    """True when a run_workers process checked in within WORKERS_ALIVE_SECONDS."""
+    return cache.get(WORKERS_ALIVE_KEY) is not None
+
+
+def _dispatch(job_pk: int, priority: int = 0):
+    """
+    Start a just-committed job without waiting for a worker to poll: inline
+    with BACKGROUND_TASKS_EAGER, on this process's threads with
+    JOBS_RUN_IN_PROCESS or when no run_workers is alive to take it.
+    """
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        job = claim(job_pk, worker_name())
+        if job is not None:
+            run_job(job)
+    elif getattr(settings, 'JOBS_RUN_IN_PROCESS', False) or not workers_alive():
+        if priority >= INTERACTIVE_PRIORITY:
+            background.submit_interactive(work_off, min_priority=INTERACTIVE_PRIORITY)
+        else:
+            background.submit(work_off)
+
+
+# ---------------------------------------------------------------------------
+# Claiming and running
+# ---------------------------------------------------------------------------
+
+def claim(job_pk: int, worker: str):
+    """Mark a queued job as running by `worker`; None if someone else got it first."""
+    now = timezone.now()
+    claimed = BackgroundJob.objects.filter(pk=job_pk, status=BackgroundJob.STATUS_QUEUED).update(
+        status=BackgroundJob.STATUS_RUNNING, locked_by=worker, locked_at=now, started_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return BackgroundJob.objects.get(pk=job_pk) if claimed else None
+
+
+def _due(min_priority: int = None):
+    due = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_QUEUED, run_after__lte=timezone.now())
+    return due if min_priority is None else due.filter(priority__gte=min_priority)
+
+
+def claim_next(worker: str, min_priority: int = None):
+    """Claim the most urgent due job (of at least `min_priority`), or return None when nothing is due."""
+    for _ in range(CLAIM_ATTEMPTS):
+        candidate = _due(min_priority).order_by('-priority', 'run_after').values_list('pk', flat=True).first()
+        if candidate is None:
+            return None
+        job = claim(candidate, worker)
+        if job is not None:
+            return job
+    return None  # Lost every race; the other workers are busy with the queue
+
+
+def _json_result(value):
+    try:
+        return json.loads(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return None
+
+
+def run_job(job: BackgroundJob) -> bool:
+    """Run a claimed job and record its outcome; returns True on success."""
+    token = _current_job.set(job.pk)
+    _running.add(job.pk)
+    started = time.perf_counter()
+    try:
+        result = import_string(job.task)(*job.args, **job.kwargs)
+    except Exception as e:
+        logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.task, job.attempts)
+        _record_failure(job, f"{type(e).__name__}: {e}")
+        return False
+    finally:
+        _running.discard(job.pk)
+        _current_job.reset(token)
+
+    BackgroundJob.objects.filter(pk=job.pk).update(
+        status=BackgroundJob.STATUS_DONE, progress=1.0, result=_json_result(result), error='',
+        finished_at=timezone.now(),
+    )
+    logger.info("Job %s (%s) done in %.1f s", job.pk, job.task, time.perf_counter() - started)
+    return True
+
+
+def _record_failure(job: BackgroundJob, error: str):
+    if job.attempts < job.max_attempts:
+        delay = getattr(settings, 'JOB_RETRY_DELAY', DEFAULT_RETRY_DELAY) * 2 ** (job.attempts - 1)
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.STATUS_QUEUED, error=error, locked_by='', locked_at=None,
+            run_after=timezone.now() + timedelta(seconds=delay),
+        )
+    else:
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.STATUS_FAILED, error=error, finished_at=timezone.now(),
+        )
+
+
+def set_progress(fraction: float, message: str = ''):
+    """Report progress from inside a running task; a no-op when called outside a job."""
+    job_pk = _current_job.get()
+    if job_pk is None:
+        return
+    BackgroundJob.objects.filter(pk=job_pk).update(
+        progress=max(0.0, min(1.0, fraction)), progress_message=message[:255], locked_at=timezone.now(),
+    )
+
+
+def heartbeat() -> int:
+    """Renew the lease of every job running in this process."""
+    running = list(_running)
+    if not running:
+        return 0
+    return BackgroundJob.objects.filter(pk__in=running, status=BackgroundJob.STATUS_RUNNING).update(
+        locked_at=timezone.now())
+
+
+def requeue_stale(now=None) -> int:
+    """Give jobs whose worker stopped renewing its lease back to the queue; returns how many."""
+    now = now or timezone.now()
+    lease = getattr(settings, 'JOB_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+    stale = BackgroundJob.objects.filter(status=BackgroundJob.STATUS_RUNNING,
+                                         locked_at__lt=now - timedelta(seconds=lease))
+    error = 'Worker lease expired'
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=BackgroundJob.STATUS_FAILED, error=error, finished_at=now)
+    requeued = stale.update(status=BackgroundJob.STATUS_QUEUED, error=error, locked_by='', locked_at=None,
+                            run_after=now)
+    if failed or requeued:
+        logger.warning("Recovered %s stale jobs (%s requeued, %s failed)", failed + requeued, requeued, failed)
+    return failed + requeued
+
+
+def work_off(worker: str = None, limit: int = None, stop: threading.Event = None,
+             min_priority: int = None) -> int:
+    """
+    Run due jobs until the queue is empty (or `limit` jobs ran); returns how
+    many ran. With `min_priority`, lower-priority jobs are left for others.
+    """
+    worker = worker or worker_name()
+    ran = 0
+    while (limit is None or ran < limit) and not (stop and stop.is_set()):
+        close_old_connections()
+        job = claim_next(worker, min_priority)
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
+
+
+# ---------------------------------------------------------------------------
+# Periodic tasks
+# ---------------------------------------------------------------------------
+
+def enqueue_due(now=None) -> list[BackgroundJob]:
+    """
+    Queue every task in settings.JOB_SCHEDULE ({dotted path: interval in
+    seconds}) whose last run was queued longer than its interval ago.
+    """
+    now = now or timezone.now()
+    queued = []
+    for path, every in getattr(settings, 'JOB_SCHEDULE', {}).items():
+        recent = BackgroundJob.objects.filter(task=path, created_at__gt=now - timedelta(seconds=every))
+        if recent.exists():
+            continue
+        queued.append(enqueue(path, dedup_key=f'schedule:{path}', dispatch=False))
+    return queued
+
+
+# ---------------------------------------------------------------------------
+# Housekeeping
+# ---------------------------------------------------------------------------
+
+def maintain(scheduler: bool = True) -> list[BackgroundJob]:
+    """
+    One housekeeping round: renew this process's leases, recover stale jobs
+    and (with `scheduler`) queue due periodic tasks; returns the tasks queued.
+    """
+    heartbeat()
+    requeue_stale()
+    return enqueue_due() if scheduler else []
+
+
+def _maintenance_loop(interval: float):
+    while True:
+        close_old_connections()
+        try:
+            maintain()
+            # Retries and scheduled tasks become due without anything dispatching them
+            if _due(INTERACTIVE_PRIORITY).exists():
+                background.submit_interactive(work_off, min_priority=INTERACTIVE_PRIORITY)
+            if _due().exists():
+                background.submit(work_off)
+        except Exception:
+            logger.exception("Job housekeeping failed")
+        time.sleep(interval)
+
+
+def start_in_process_worker(interval: float = MAINTENANCE_INTERVAL) -> bool:
+    """
+    Start the web process's housekeeping thread, once per process, when
+    JOBS_RUN_IN_PROCESS is on; returns whether it is running.
+    """
+    global _maintenance_thread
+    if not getattr(settings, 'JOBS_RUN_IN_PROCESS', False) or getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return False
+    with _maintenance_lock:
+        if _maintenance_thread is None:
+            _maintenance_thread = threading.Thread(
+                target=_maintenance_loop, args=(interval,), name='vocabulary-jobs', daemon=True,
+            )
+            _maintenance_thread.start()
+    return True
@@ -0,0 +1,182 @@
+"""
+Shared client for the LLM proxy (OpenAI-compatible API).
+
+Every LLM call in the project goes through `chat()` (or `generate_image()`),
+which adds, in order:
+
+- a response cache: with `cache_timeout`, the reply is stored in the Django
+  cache under a hash of the model and the request, so the same prompt is
+  answered from the database table until it expires;
+- single-flight: identical requests in flight at the same time share one
+  upstream call, unless the caller keeps each reply (a generated quiz) and
+  passes `coalesce=False`;
+- a circuit breaker: after LLM_BREAKER_FAILURES consecutive connection
+  errors, timeouts or 5xx replies, calls fail immediately with LLMUnavailable
+  for LLM_BREAKER_RESET seconds instead of each waiting for LLM_TIMEOUT;
+- a process-wide semaphore of LLM_MAX_CONCURRENCY calls. A caller that
+  cannot get a slot within LLM_QUEUE_TIMEOUT seconds gets LLMUnavailable.
+
+Requests share one pooled `requests` session. LLM_CONNECT_TIMEOUT bounds
+the TCP connect separately from the read timeout, so an unreachable proxy is
+noticed in seconds.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from .concurrency import CircuitBreaker, CircuitOpenError, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'llm:'
+
+
+class LLMError(RuntimeError):
+    """The LLM proxy answered, but not with a usable reply."""
+
+
+class LLMUnavailable(LLMError):
+    """The LLM proxy is unreachable, overloaded or failing; the breaker counts these."""
+
+
+_session = None
+_session_lock = threading.Lock()
+_semaphore = threading.BoundedSemaphore(getattr(settings, 'LLM_MAX_CONCURRENCY', 4))
+_flight = SingleFlight()
+breaker = CircuitBreaker(
+    failure_threshold=getattr(settings, 'LLM_BREAKER_FAILURES', 3),
+    reset_timeout=getattr(settings, 'LLM_BREAKER_RESET', 30),
+)
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=getattr(settings, 'LLM_MAX_CONCURRENCY', 4))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.verify = getattr(settings, 'LLM_VERIFY_SSL', True)
+            if not session.verify:
+                import urllib3
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _session = session
+        return _session
+
+
+def _send(url: str, payload: dict, timeout: float) -> dict:
+    """POST `payload` and return the decoded JSON reply; raises requests exceptions."""
+    response = _get_session().post(
+        url, json=payload, headers={'Authorization': f'Bearer {settings.LLM_API_KEY}'},
+        timeout=(getattr(settings, 'LLM_CONNECT_TIMEOUT', 5), timeout),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _call(url: str, payload: dict, timeout: float) -> dict:
+    """One upstream call under the breaker and the concurrency limit."""
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        raise LLMUnavailable(str(e)) from e
+
+    if not _semaphore.acquire(timeout=getattr(settings, 'LLM_QUEUE_TIMEOUT', 30)):
+        breaker.abort_call()
+        raise LLMUnavailable('Too many LLM requests in progress')
+    try:
+        data = _send(url, payload, timeout)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        breaker.record_failure()
+        logger.warning('LLM call to %s failed: %s', url, e)
+        raise LLMUnavailable(f'LLM unavailable: {e}') from e
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 0
+        if status >= 500 or status == 429:
+            breaker.record_failure()
+            logger.warning('LLM call to %s failed: HTTP %s', url, status)
+            raise LLMUnavailable(f'LLM unavailable: HTTP {status}') from e
+        breaker.record_success()
+        raise LLMError(f'LLM request rejected: HTTP {status}') from e
+    except ValueError as e:
+        breaker.record_success()
+        raise LLMError(f'LLM returned invalid JSON: {e}') from e
+    except requests.RequestException as e:
+        breaker.record_failure()
+        raise LLMUnavailable(f'LLM unavailable: {e}') from e
+    finally:
+        _semaphore.release()
+    breaker.record_success()
+    return data
+
+
+def request_key(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def chat(prompt: str, temperature: float = 0.7, max_tokens: int = 600, timeout: float = None,
+         cache_timeout: int = None, coalesce: bool = True) -> str:
+    """
+    Send one user message and return the reply text.
+
+    With `coalesce=False` the call never shares an in-flight reply, for
+    generated content that is stored, where two callers must not both
+    persist the same reply.
+
+    Raises LLMUnavailable when the proxy cannot be reached (or the breaker is
+    open) and LLMError for other unusable replies.
+    """
+    payload = {
+        'model': settings.LLM_MODEL,
+        'messages': [{'role': 'user', 'content': prompt}],
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+    }
+    key = request_key(payload)
+    if cache_timeout:
+        cached = cache.get(CACHE_PREFIX + key)
+        if cached is not None:
+            return cached
+    timeout = timeout or settings.LLM_TIMEOUT
+    if not coalesce:
+        return _chat(payload, key, timeout, cache_timeout)
+    return _flight.do(key, _chat, payload, key, timeout, cache_timeout)
+
+
+def _chat(payload: dict, key: str, timeout: float, cache_timeout: int | None) -> str:
+    data = _call(settings.LLM_URL, payload, timeout)
+    try:
+        content = data['choices'][0]['message']['content'].strip()
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise LLMError(f'Unexpected LLM reply: {e!r}') from e
+    if cache_timeout:
+        cache.set(CACHE_PREFIX + key, content, timeout=cache_timeout)
+    return content
+
+
+def generate_image(prompt: str, size: str = '1024x1024') -> dict:
+    """Return the first image object of an images/generations reply (`b64_json` or `url`)."""
+    payload = {'model': settings.LLM_IMAGE_MODEL, 'prompt': prompt, 'n': 1, 'size': size}
+    data = _flight.do(request_key(payload), _call, settings.LLM_IMAGE_URL, payload, settings.LLM_IMAGE_TIMEOUT)
+    try:
+        return data['data'][0]
+    except (KeyError, IndexError, TypeError) as e:
+        raise LLMError(f'Unexpected image reply: {e!r}') from e
+
+
+def download(url: str, timeout: float = 30) -> bytes:
+    """
+    Fetch a generated asset over the shared session. No credentials are
+    sent: asset URLs usually point at a CDN, not at the proxy.
+    """
+    response = _get_session().get(url, timeout=(getattr(settings, 'LLM_CONNECT_TIMEOUT', 5), timeout))
+    response.raise_for_status()
+    return response.content
@@ -0,0 +1,63 @@
+"""
+Management command for routine SQLite maintenance.
+
+Reports size and fragmentation, refreshes planner statistics (ANALYZE,
+PRAGMA optimize), checkpoints and truncates the WAL and returns free pages
+with an incremental vacuum. Safe to run from cron while the site is up;
+--vacuum rewrites the whole file and blocks writers while it runs.
+
+Usage:
+    python manage.py db_maintenance
+    python manage.py db_maintenance --report-only
+    python manage.py db_maintenance --vacuum
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from vocabulary.db_tuning import inspect, maintain
+
+
+def _megabytes(size: int) -> str:
+    return f'{size / (1024 * 1024):.1f} MB'
+
+
+class Command(BaseCommand):
+    help = 'Analyze, checkpoint and vacuum the SQLite database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--report-only', action='store_true', help='Only print size and fragmentation')
+        parser.add_argument('--skip-analyze', action='store_true', help='Skip the full ANALYZE (PRAGMA optimize still runs)')
+        parser.add_argument('--vacuum', action='store_true', help='Full VACUUM, enabling incremental vacuum for later runs')
+        parser.add_argument('--vacuum-pages', type=int, default=0, help='Free pages to release per run (0: all)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f'db_maintenance supports SQLite only, not {connection.vendor}.')
+
+        before = inspect(connection)
+        self._report('Before' if not options['report_only'] else 'Database', before)
+        if options['report_only']:
+            return
+
+        maintain(
+            connection,
+            analyze=not options['skip_analyze'],
+            vacuum=options['vacuum'],
+            vacuum_pages=options['vacuum_pages'],
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+        after = inspect(connection)
+        self._report('After', after)
+        self.stdout.write(self.style.SUCCESS(
+            f"Maintenance done; released {_megabytes(max(0, before['file_bytes'] - after['file_bytes']))}."
+        ))
+
+    def _report(self, label, stats):
+        self.stdout.write(
+            f"{label}: {_megabytes(stats['file_bytes'])}, {_megabytes(stats['free_bytes'])} free "
+            f"({stats['fragmentation']:.1%} fragmentation), WAL {_megabytes(stats['wal_bytes'])}, "
+            f"journal_mode={stats['journal_mode']}, auto_vacuum={stats['auto_vacuum']}"
+        )
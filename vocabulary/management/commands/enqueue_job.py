@@ -0,0 +1,48 @@
+"""
+Management command to queue a background job.
+
+The task is the dotted path of a module-level function, e.g. one of the
+maintenance tasks in vocabulary.tasks; keyword arguments are given as JSON.
+The job is left for run_workers to pick up.
+
+Usage:
+    python manage.py enqueue_job vocabulary.tasks.reclassify_cefr
+    python manage.py enqueue_job vocabulary.tasks.backfill_audio --kwargs '{"deck_id": 12}'
+    python manage.py enqueue_job vocabulary.tasks.rebuild_statistics --kwargs '{"days": 30}' --max-attempts 3
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from vocabulary import jobs
+
+
+class Command(BaseCommand):
+    help = 'Queue a background job for the workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('task', help='Dotted path of the function to run')
+        parser.add_argument('--kwargs', default='{}', help='Keyword arguments as a JSON object')
+        parser.add_argument('--priority', type=int, default=0)
+        parser.add_argument('--max-attempts', type=int, default=1)
+        parser.add_argument('--dedup-key', help='Skip if a job with this key is already queued or running')
+
+    def handle(self, *args, **options):
+        try:
+            import_string(options['task'])
+        except ImportError as e:
+            raise CommandError(f"Unknown task {options['task']}: {e}")
+        try:
+            kwargs = json.loads(options['kwargs'])
+        except json.JSONDecodeError as e:
+            raise CommandError(f'--kwargs is not valid JSON: {e}')
+        if not isinstance(kwargs, dict):
+            raise CommandError('--kwargs must be a JSON object.')
+
+        job = jobs.enqueue(
+            options['task'], dedup_key=options['dedup_key'], priority=options['priority'],
+            max_attempts=options['max_attempts'], dispatch=False, task_kwargs=kwargs,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Queued {job.task} as job #{job.pk} ({job.status}).'))
@@ -0,0 +1,54 @@
+"""
+Management command to check the query plans of the project's hot queries.
+
+Runs EXPLAIN QUERY PLAN over the catalogue in vocabulary.query_plans, flags
+full table scans and temporary B-trees and suggests indexes for them. Exits
+with an error when any query is flagged, so it can gate a deploy.
+
+Usage:
+    python manage.py explain_plans
+    python manage.py explain_plans --verbose
+    python manage.py explain_plans --only review.unresolved
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.query_plans import catalogue, check_plans
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot queries and flag full scans and temporary B-trees'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', action='append', help='Catalogued query to check (repeatable)')
+        parser.add_argument('--verbose', action='store_true', help='Print the SQL and plan of every query')
+
+    def handle(self, *args, **options):
+        queries = catalogue()
+        if options['only']:
+            queries = [q for q in queries if q.name in options['only']]
+            if not queries:
+                raise CommandError('No catalogued query matches --only.')
+        try:
+            reports = check_plans(queries)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        flagged = [report for report in reports if report.problems]
+        for report in reports:
+            if report.problems:
+                self.stdout.write(self.style.WARNING(f'{report.name}'))
+                for problem in report.problems:
+                    self.stdout.write(f'    {problem}')
+                if report.suggestion:
+                    self.stdout.write(f'    suggested index: {report.suggestion}')
+            else:
+                self.stdout.write(f'{report.name}: ok')
+            if options['verbose'] or report.problems:
+                self.stdout.write(f'    {report.sql}')
+                for detail in report.plan:
+                    self.stdout.write(f'      {detail}')
+
+        if flagged:
+            raise CommandError(f'{len(flagged)} of {len(reports)} queries scan or sort without an index.')
+        self.stdout.write(self.style.SUCCESS(f'All {len(reports)} queries use indexes.'))
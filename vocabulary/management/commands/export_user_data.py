@@ -0,0 +1,67 @@
+"""
+Management command to export a user's flashcards, answer history and daily statistics.
+
+Rows are streamed from the database in chunks and written straight to the
+output file, so exports of long study histories run in constant memory.
+
+Usage:
+    python manage.py export_user_data --user-email me@example.com --dataset flashcards --format anki -o deck.txt
+    python manage.py export_user_data --user-id 3 --dataset all --format jsonl > history.jsonl
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.deck_export import DATASETS, FORMATS, ExportError, export_lines
+from vocabulary.models import Deck
+
+
+class Command(BaseCommand):
+    help = "Export a user's flashcards, answer history or daily statistics as CSV, JSON Lines or Anki text"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, help='User to export')
+        parser.add_argument('--user-email', help='User to export (alternative to --user-id)')
+        parser.add_argument(
+            '--dataset',
+            default='flashcards',
+            help=f"One of {', '.join(DATASETS)}, a comma-separated list, or 'all' (jsonl only)",
+        )
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--deck', help='Only export this deck (name or id)')
+        parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            if options['user_id']:
+                user = User.objects.get(pk=options['user_id'])
+            elif options['user_email']:
+                user = User.objects.get(email=options['user_email'])
+            else:
+                raise CommandError('Pass --user-id or --user-email.')
+        except User.DoesNotExist:
+            raise CommandError('User not found.')
+
+        deck_id = None
+        if options['deck']:
+            decks = Deck.objects.filter(user=user)
+            deck = (decks.filter(id=options['deck']).first() if options['deck'].isdigit() else None) \
+                or decks.filter(name=options['deck']).first()
+            if deck is None:
+                raise CommandError(f"Deck not found: {options['deck']}")
+            deck_id = deck.id
+
+        datasets = list(DATASETS) if options['dataset'] == 'all' else options['dataset'].split(',')
+        try:
+            lines = export_lines(user, datasets, options['format'], deck_id=deck_id)
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+            self.stderr.write(self.style.SUCCESS(f"Export written to {options['output']}"))
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
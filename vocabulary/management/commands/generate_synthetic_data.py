@@ -0,0 +1,55 @@
+"""
+Management command to generate synthetic benchmark data.
+
+Creates users (bench-<n>@bench.example.com, password "benchmark-password")
+with decks, flashcards, definitions and months of study history, plus
+processed dictation videos. The defaults give 105k flashcards; the same
+--seed always generates the same data.
+
+Usage:
+    python manage.py generate_synthetic_data
+    python manage.py generate_synthetic_data --users 1 --cards-per-user 5000 --days 30
+    python manage.py generate_synthetic_data --clear
+"""
+
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.synthetic_data import SyntheticOptions, clear_synthetic_data, generate, synthetic_users
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, flashcards, study history and dictation videos for benchmarks'
+
+    def add_arguments(self, parser):
+        defaults = SyntheticOptions()
+        for option in fields(SyntheticOptions):
+            parser.add_argument(
+                '--' + option.name.replace('_', '-'),
+                type=option.type if isinstance(option.type, type) else str,
+                default=getattr(defaults, option.name),
+            )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated data with the same --email-prefix first',
+        )
+
+    def handle(self, *args, **options):
+        synthetic = SyntheticOptions(**{option.name: options[option.name] for option in fields(SyntheticOptions)})
+
+        if options['clear']:
+            removed = clear_synthetic_data(synthetic.email_prefix)
+            self.stdout.write(f'Removed {removed} synthetic users.')
+        elif synthetic_users(synthetic.email_prefix).exists():
+            raise CommandError(
+                f'Synthetic users with prefix "{synthetic.email_prefix}" already exist; pass --clear to replace them.'
+            )
+
+        summary = generate(synthetic, log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {len(summary.users)} users, {summary.decks} decks, {summary.flashcards} flashcards, '
+            f'{summary.definitions} definitions, {summary.sessions} sessions, {summary.answers} answers '
+            f'and {summary.videos} videos ({summary.segments} segments).'
+        ))
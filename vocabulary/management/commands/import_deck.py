@@ -0,0 +1,81 @@
+"""
+Management command to import a vocabulary file into a user's deck.
+
+Reads CSV/TSV (including Quizlet exports) or Anki .apkg files row by row and
+saves them in chunked bulk transactions, printing progress as it goes.
+
+Usage:
+    python manage.py import_deck words.csv --user-email me@example.com --deck "IELTS"
+    python manage.py import_deck export.apkg --user-id 3 --deck "Anki" --no-enrich
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.deck_import import (
+    CHUNK_SIZE, ImportFormatError, detect_format, enrich_deck, import_rows, iter_rows, last_card_id,
+)
+from vocabulary.models import Deck, ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Import a CSV/TSV or Anki .apkg vocabulary file into a deck'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user-id', type=int, help='Owner of the deck')
+        parser.add_argument('--user-email', help='Owner of the deck (alternative to --user-id)')
+        parser.add_argument('--deck', required=True, help='Deck name; created if it does not exist')
+        parser.add_argument(
+            '--format',
+            choices=[value for value, _ in ImportJob.FORMAT_CHOICES],
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Cards per transaction')
+        parser.add_argument(
+            '--no-enrich',
+            action='store_true',
+            help='Skip fetching missing definitions, phonetics and audio after the import',
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            if options['user_id']:
+                user = User.objects.get(pk=options['user_id'])
+            elif options['user_email']:
+                user = User.objects.get(email=options['user_email'])
+            else:
+                raise CommandError('Pass --user-id or --user-email.')
+        except User.DoesNotExist:
+            raise CommandError('User not found.')
+
+        deck, created = Deck.objects.get_or_create(user=user, name=options['deck'])
+        if created:
+            self.stdout.write(f'Created deck "{deck.name}"')
+
+        fmt = options['format'] or detect_format(options['path'])
+
+        def report(stats):
+            self.stdout.write(
+                f'  {stats.progress:6.1%}  {stats.rows_read} rows read, '
+                f'{stats.imported} imported, {stats.skipped} skipped'
+            )
+
+        after_id = last_card_id()
+        try:
+            stats = import_rows(user, deck, iter_rows(options['path'], fmt),
+                                chunk_size=options['chunk_size'], on_progress=report)
+        except (ImportFormatError, OSError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {stats.imported} cards into "{deck.name}" ({stats.skipped} rows skipped).'
+        ))
+
+        if not options['no_enrich']:
+            self.stdout.write('Filling in missing definitions and audio...')
+            # Only the cards this import created; the deck's other cards are left as they are
+            enriched = enrich_deck(deck, on_progress=lambda count: self.stdout.write(f'  {count} cards enriched'),
+                                   after_id=after_id, upto_id=last_card_id())
+            self.stdout.write(self.style.SUCCESS(f'Enriched {enriched} cards.'))
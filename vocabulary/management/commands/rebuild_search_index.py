@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the flashcard full-text search index.
+
+Only needed on SQLite after writes that bypass model signals (raw SQL,
+restored backups); PostgreSQL trigram indexes are maintained by the database.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from vocabulary.search_index import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the flashcard full-text search index'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING(
+                'No FTS5 search index on this database; nothing to rebuild.'
+            ))
+            return
+
+        with transaction.atomic():
+            rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Flashcard search index rebuilt.'))
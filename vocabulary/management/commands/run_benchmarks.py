@@ -0,0 +1,71 @@
+"""
+Management command to benchmark the main study, statistics and dictation paths.
+
+Runs against data from generate_synthetic_data and prints (or writes) a JSON
+report of latency percentiles and SQL query counts per benchmark. Reports use
+sorted keys, so two commits can be compared with a plain diff.
+
+Usage:
+    python manage.py run_benchmarks
+    python manage.py run_benchmarks --iterations 200 --output before.json
+    python manage.py run_benchmarks --only dashboard --only search
+    python manage.py run_benchmarks --sqlite-writers 8 --skip-endpoints
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from vocabulary.benchmarks import (
+    BENCHMARKS, DEFAULT_ITERATIONS, WARMUP_ITERATIONS, dump_report, run_benchmarks, sqlite_write_throughput,
+)
+from vocabulary.synthetic_data import synthetic_users
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and query counts of the hot endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-email', help='User to benchmark as (default: first synthetic user)')
+        parser.add_argument('--only', action='append', choices=list(BENCHMARKS), help='Benchmark to run (repeatable)')
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+        parser.add_argument('--warmup', type=int, default=WARMUP_ITERATIONS)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument(
+            '--sqlite-writers',
+            type=int,
+            default=0,
+            help='Also measure SQLite write throughput with this many concurrent writer threads',
+        )
+        parser.add_argument('--skip-endpoints', action='store_true', help='Skip the endpoint benchmarks')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1.')
+        log = self.stderr.write if not options['output'] else self.stdout.write
+
+        report = {'benchmarks': {}}
+        if not options['skip_endpoints']:
+            if options['user_email']:
+                user = get_user_model().objects.filter(email=options['user_email']).first()
+            else:
+                user = synthetic_users().order_by('id').first()
+            if user is None:
+                raise CommandError('No user to benchmark as; run generate_synthetic_data or pass --user-email.')
+            report = run_benchmarks(
+                user, names=options['only'], iterations=options['iterations'],
+                warmup=options['warmup'], seed=options['seed'], log=log,
+            )
+        if options['sqlite_writers']:
+            report['sqlite_concurrent_writes'] = sqlite_write_throughput(
+                writers=options['sqlite_writers'], transactions=options['iterations'],
+            )
+            for name, result in report['sqlite_concurrent_writes'].items():
+                log(f"sqlite {name}: {result['commits_per_second']} commits/s, {result['locked_errors']} locked")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(dump_report(report))
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(report['benchmarks'])} results to {options['output']}."))
+        else:
+            self.stdout.write(dump_report(report), ending='')
@@ -0,0 +1,97 @@
+"""
+Management command to run the background job workers.
+
+Starts --concurrency worker threads that claim and run due BackgroundJobs
+(see vocabulary.jobs), plus --interactive-workers threads that only take jobs
+a user is waiting on (jobs.INTERACTIVE_PRIORITY and above), so those are
+never stuck behind long imports and ingestions. The main thread queues the periodic tasks from
+settings.JOB_SCHEDULE, renews the leases of the jobs running here and gives
+jobs abandoned by a dead worker back to the queue. Ctrl-C or SIGTERM stops
+taking new jobs and waits for the running ones to finish.
+
+Run one of these next to the web server (unless it runs jobs itself with
+JOBS_RUN_IN_PROCESS); several can run against the same database. Use
+--no-scheduler on all but one of them. Without any running, the web server
+still runs the jobs it queues, but not retries or periodic tasks.
+
+Usage:
+    python manage.py run_workers
+    python manage.py run_workers --concurrency 4
+    python manage.py run_workers --concurrency 4 --interactive-workers 2
+    python manage.py run_workers --once
+"""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from vocabulary import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers and the periodic task scheduler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Worker threads (default: 2)')
+        parser.add_argument('--interactive-workers', type=int, default=1,
+                            help='Extra threads reserved for jobs a user is waiting on (default: 1)')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds an idle worker waits before looking for jobs again')
+        parser.add_argument('--no-scheduler', action='store_true', help='Do not queue periodic tasks')
+        parser.add_argument('--once', action='store_true', help='Run the due jobs, then exit')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1.')
+        if options['interactive_workers'] < 0:
+            raise CommandError('--interactive-workers cannot be negative.')
+        scheduler = not options['no_scheduler']
+
+        if options['once']:
+            jobs.maintain(scheduler)
+            ran = jobs.work_off()
+            self.stdout.write(self.style.SUCCESS(f'Ran {ran} jobs.'))
+            return
+
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        threads = [
+            threading.Thread(target=self._work, args=(stop, options['poll_interval']), name=f'worker-{n}')
+            for n in range(options['concurrency'])
+        ] + [
+            threading.Thread(target=self._work, args=(stop, options['poll_interval'], jobs.INTERACTIVE_PRIORITY),
+                             name=f'interactive-worker-{n}')
+            for n in range(options['interactive_workers'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"Started {len(threads)} workers{' and the scheduler' if scheduler else ''}; Ctrl-C to stop."
+        ))
+
+        while not stop.is_set():
+            close_old_connections()
+            # Web processes leave their jobs to us while we check in
+            jobs.mark_workers_alive()
+            for job in jobs.maintain(scheduler):
+                self.stdout.write(f'Scheduled {job.task} (#{job.pk})')
+            stop.wait(options['poll_interval'] * 5)
+
+        self.stdout.write('Stopping: waiting for running jobs to finish...')
+        for thread in threads:
+            thread.join()
+        connection.close()
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
+
+    @staticmethod
+    def _work(stop, poll_interval, min_priority=None):
+        try:
+            while not stop.is_set():
+                if not jobs.work_off(stop=stop, min_priority=min_priority):
+                    stop.wait(poll_interval)
+        finally:
+            connection.close()
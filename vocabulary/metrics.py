@@ -0,0 +1,266 @@
+"""
+Per-request performance metrics.
+
+While a request is being handled (see middleware.RequestMetricsMiddleware)
+a RequestMetrics object collects:
+
+    queries / db_time   every SQL statement, through connection.execute_wrapper
+    cache hits/misses   reads through MeteredDatabaseCache (the CACHES backend)
+    http calls / time   outbound calls made with `requests` or urllib
+
+The middleware turns them into a Server-Timing header and a structured log
+line, and folds them into per-endpoint aggregates that `render_prometheus()`
+exposes in the Prometheus text format. Collection costs a couple of
+perf_counter() calls per query and one dictionary update per request, so it is
+meant to stay on in production.
+
+Aggregates live in process memory and reset on restart, so each worker
+process reports only the requests it served.
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections
+
+logger = logging.getLogger('vocabulary.requests')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current: ContextVar['RequestMetrics | None'] = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses', 'http_calls', 'http_time', '_http_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.http_calls = 0
+        self.http_time = 0.0
+        self._http_depth = 0
+
+    def _sql(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+def current() -> RequestMetrics | None:
+    """Metrics of the request being handled in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Collect metrics for the code run inside the block."""
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(metrics._sql))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Cache and outbound HTTP instrumentation
+# ---------------------------------------------------------------------------
+
+class MeteredDatabaseCache(DatabaseCache):
+    """DatabaseCache that counts hits and misses for the current request."""
+
+    def get_many(self, keys, version=None):
+        # DatabaseCache.get (and so get_or_set) goes through get_many
+        found = super().get_many(keys, version)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        return found
+
+
+def _timed_http(send):
+    @wraps(send)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is None or metrics._http_depth:
+            # Outside a request, or a redirect followed inside an outer call
+            return send(*args, **kwargs)
+        metrics._http_depth += 1
+        started = time.perf_counter()
+        try:
+            return send(*args, **kwargs)
+        finally:
+            metrics._http_depth -= 1
+            metrics.http_calls += 1
+            metrics.http_time += time.perf_counter() - started
+    wrapper._metered = True
+    return wrapper
+
+
+def install_http_instrumentation():
+    """Time outbound calls made through `requests` and urllib. Idempotent."""
+    import urllib.request
+
+    import requests
+
+    for owner, name in ((requests.Session, 'send'), (urllib.request.OpenerDirector, 'open')):
+        method = getattr(owner, name)
+        if not getattr(method, '_metered', False):
+            setattr(owner, name, _timed_http(method))
+
+
+# ---------------------------------------------------------------------------
+# Per-endpoint aggregates
+# ---------------------------------------------------------------------------
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            running += count
+            yield bound, running
+
+
+class EndpointStats:
+    __slots__ = ('duration', 'queries', 'statuses', 'db_time', 'http_time', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.statuses = {}
+        self.db_time = 0.0
+        self.http_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+_lock = threading.Lock()
+_endpoints: dict[str, EndpointStats] = {}
+
+
+def record(endpoint: str, status: int, total: float, metrics: RequestMetrics):
+    status_class = f'{status // 100}xx'
+    with _lock:
+        stats = _endpoints.get(endpoint)
+        if stats is None:
+            stats = _endpoints[endpoint] = EndpointStats()
+        stats.duration.observe(total)
+        stats.queries.observe(metrics.queries)
+        stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+        stats.db_time += metrics.db_time
+        stats.http_time += metrics.http_time
+        stats.cache_hits += metrics.cache_hits
+        stats.cache_misses += metrics.cache_misses
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus() -> str:
+    with _lock:
+        snapshot = sorted(_endpoints.items())
+        lines = []
+
+        def histogram(name, help_text, attr):
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} histogram'])
+            for endpoint, stats in snapshot:
+                hist, view = getattr(stats, attr), _label(endpoint)
+                for bound, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{view="{view}"}} {hist.total:.6f}')
+                lines.append(f'{name}_count{{view="{view}"}} {hist.count}')
+
+        def counter(name, help_text, value):
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} counter'])
+            for endpoint, stats in snapshot:
+                lines.append(f'{name}{{view="{_label(endpoint)}"}} {value(stats)}')
+
+        histogram('http_request_duration_seconds', 'Time spent handling the request.', 'duration')
+        histogram('http_request_queries', 'SQL queries per request.', 'queries')
+        lines.extend(['# HELP http_requests_total Requests by status class.', '# TYPE http_requests_total counter'])
+        for endpoint, stats in snapshot:
+            for status_class, count in sorted(stats.statuses.items()):
+                lines.append(f'http_requests_total{{view="{_label(endpoint)}",status="{status_class}"}} {count}')
+        counter('http_request_db_seconds_total', 'Time spent in SQL.', lambda s: f'{s.db_time:.6f}')
+        counter('http_request_outbound_seconds_total', 'Time spent in outbound HTTP calls.',
+                lambda s: f'{s.http_time:.6f}')
+        counter('http_request_cache_hits_total', 'Cache reads that found a value.', lambda s: s.cache_hits)
+        counter('http_request_cache_misses_total', 'Cache reads that found nothing.', lambda s: s.cache_misses)
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def server_timing(metrics: RequestMetrics, total: float) -> str:
+    app = max(0.0, total - metrics.db_time - metrics.http_time)
+    return ', '.join([
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+        f'http;dur={metrics.http_time * 1000:.1f};desc="{metrics.http_calls} calls"',
+        f'app;dur={app * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ])
+
+
+def _user_id(request):
+    # Only report a user the view already loaded; resolving the lazy user here would cost a query
+    user = getattr(request, 'user', None)
+    return getattr(getattr(user, '_wrapped', user), 'pk', None)
+
+
+def log_request(request, endpoint: str, status: int, total: float, metrics: RequestMetrics, slow_after: float):
+    level = logging.WARNING if total >= slow_after else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, json.dumps({
+        'method': request.method,
+        'path': request.path,
+        'view': endpoint,
+        'status': status,
+        'user': _user_id(request),
+        'total_ms': round(total * 1000, 1),
+        'db_ms': round(metrics.db_time * 1000, 1),
+        'queries': metrics.queries,
+        'cache_hits': metrics.cache_hits,
+        'cache_misses': metrics.cache_misses,
+        'http_ms': round(metrics.http_time * 1000, 1),
+        'http_calls': metrics.http_calls,
+    }, separators=(',', ':')))
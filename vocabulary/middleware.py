@@ -0,0 +1,53 @@
+"""
+Request instrumentation middleware.
+
+Wraps each request in metrics.collect() and reports what it measured: a
+Server-Timing header (visible in the browser's network panel), a JSON log line
+on the `vocabulary.requests` logger (INFO, or WARNING once a request takes
+longer than REQUEST_SLOW_MS) and the per-endpoint aggregates behind the
+/metrics/ endpoint. Set REQUEST_METRICS_ENABLED = False to remove it entirely.
+
+RequestProfilerMiddleware profiles single requests on demand for staff users
+(see profiling); it must come after AuthenticationMiddleware.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics, profiling
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_after = settings.REQUEST_SLOW_MS / 1000
+        metrics.install_http_instrumentation()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with metrics.collect() as collected:
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        endpoint = match.view_name if match else 'unmatched'
+        response['Server-Timing'] = metrics.server_timing(collected, total)
+        metrics.record(endpoint, response.status_code, total, collected)
+        metrics.log_request(request, endpoint, response.status_code, total, collected, self.slow_after)
+        return response
+
+
+class RequestProfilerMiddleware:
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profiling.wants_profile(request):
+            return profiling.profile_request(request, self.get_response)
+        return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0018_add_cefr_level_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(help_text='SHA-256 of the source text', max_length=64)),
+                ('source_lang', models.CharField(max_length=10)),
+                ('target_lang', models.CharField(max_length=10)),
+                ('source_text', models.TextField()),
+                ('translated_text', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('text_hash', 'source_lang', 'target_lang')},
+            },
+        ),
+    ]
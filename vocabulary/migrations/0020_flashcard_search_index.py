@@ -0,0 +1,82 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_flashcard_fts USING fts5(
+        word, definitions, synonyms, owner,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+SQLITE_POPULATE = """
+    INSERT INTO vocabulary_flashcard_fts(rowid, word, definitions, synonyms, owner)
+    SELECT f.id,
+           f.word,
+           COALESCE((SELECT group_concat(COALESCE(d.english_definition, '') || ' ' ||
+                                         COALESCE(d.vietnamese_definition, ''), ' ')
+                     FROM vocabulary_definition d WHERE d.flashcard_id = f.id), ''),
+           COALESCE(f.general_synonyms, '') || ' ' ||
+           COALESCE((SELECT group_concat(COALESCE(d.definition_synonyms, ''), ' ')
+                     FROM vocabulary_definition d WHERE d.flashcard_id = f.id), ''),
+           'u' || f.user_id
+    FROM vocabulary_flashcard f
+"""
+
+POSTGRES_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS vocabulary_flashcard_word_trgm "
+    "ON vocabulary_flashcard USING gin (lower(word) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS vocabulary_flashcard_synonyms_trgm "
+    "ON vocabulary_flashcard USING gin (lower(COALESCE(general_synonyms, '')) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS vocabulary_definition_english_trgm "
+    "ON vocabulary_definition USING gin (lower(english_definition) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS vocabulary_definition_vietnamese_trgm "
+    "ON vocabulary_definition USING gin (lower(vietnamese_definition) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS vocabulary_definition_synonyms_trgm "
+    "ON vocabulary_definition USING gin (lower(COALESCE(definition_synonyms, '')) gin_trgm_ops)",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS vocabulary_flashcard_word_trgm",
+    "DROP INDEX IF EXISTS vocabulary_flashcard_synonyms_trgm",
+    "DROP INDEX IF EXISTS vocabulary_definition_english_trgm",
+    "DROP INDEX IF EXISTS vocabulary_definition_vietnamese_trgm",
+    "DROP INDEX IF EXISTS vocabulary_definition_synonyms_trgm",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            try:
+                cursor.execute(SQLITE_CREATE)
+            except Exception as e:
+                # SQLite built without FTS5: search falls back to ORM queries.
+                print(f"[WARNING] FTS5 unavailable, flashcard search index not created: {e}")
+                return
+            cursor.execute(SQLITE_POPULATE)
+        elif vendor == 'postgresql':
+            for statement in POSTGRES_CREATE:
+                cursor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            cursor.execute("DROP TABLE IF EXISTS vocabulary_flashcard_fts")
+        elif vendor == 'postgresql':
+            for statement in POSTGRES_DROP:
+                cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0019_translationcache'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
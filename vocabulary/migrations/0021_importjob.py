@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0020_flashcard_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_name', models.CharField(blank=True, max_length=255)),
+                ('file_path', models.CharField(blank=True, help_text='Uploaded file, removed once imported', max_length=500)),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('tsv', 'TSV / Quizlet'), ('apkg', 'Anki package')], max_length=10)),
+                ('enrich', models.BooleanField(default=True, help_text='Fill in missing definitions and audio after import')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Importing'), ('enriching', 'Enriching'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('progress', models.FloatField(default=0.0, help_text='Fraction of the file read (0.0-1.0)')),
+                ('rows_read', models.PositiveIntegerField(default=0)),
+                ('imported_count', models.PositiveIntegerField(default=0)),
+                ('skipped_count', models.PositiveIntegerField(default=0)),
+                ('enriched_count', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('deck', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='vocabulary.deck')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='vocabulary__user_id_f9a5a4_idx')],
+            },
+        ),
+    ]
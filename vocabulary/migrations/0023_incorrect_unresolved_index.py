@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0022_requestprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incorrectwordreview',
+            index=models.Index(condition=models.Q(('is_resolved', False)), fields=['user', 'question_type'], name='incorrect_unresolved_idx'),
+        ),
+    ]
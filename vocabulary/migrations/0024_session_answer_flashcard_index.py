@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0023_incorrect_unresolved_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studysessionanswer',
+            index=models.Index(fields=['session', 'flashcard'], name='vocabulary__session_a41079_idx'),
+        ),
+    ]
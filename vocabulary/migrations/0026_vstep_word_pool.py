@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0025_background_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VSTEPWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(help_text='Normalised (lowercase, no punctuation)', max_length=100, unique=True)),
+                ('level', models.CharField(blank=True, help_text='CEFR band the word was generated for', max_length=2)),
+                ('rank', models.PositiveIntegerField(help_text='Suggestion order, most frequently tested first')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+    ]
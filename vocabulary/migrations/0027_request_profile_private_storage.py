@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:16
+
+import vocabulary.models
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def remove_public_profiles(apps, schema_editor):
+    """Profiles written before this migration sit in MEDIA_ROOT/profiles/, where they may be served."""
+    RequestProfile = apps.get_model('vocabulary', 'RequestProfile')
+    for report, stats_file in RequestProfile.objects.values_list('report', 'stats_file'):
+        for name in (report, stats_file):
+            if name:
+                default_storage.delete(name)
+    RequestProfile.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0026_vstep_word_pool'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_public_profiles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='requestprofile',
+            name='report',
+            field=models.FileField(help_text='Call tree and SQL statements as text', storage=vocabulary.models.ProfileStorage(), upload_to=''),
+        ),
+        migrations.AlterField(
+            model_name='requestprofile',
+            name='stats_file',
+            field=models.FileField(blank=True, help_text='Raw pstats dump (snakeviz, pstats)', storage=vocabulary.models.ProfileStorage(), upload_to=''),
+        ),
+    ]
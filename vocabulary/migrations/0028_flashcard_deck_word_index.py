@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-19 05:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0027_request_profile_private_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flashcard',
+            index=models.Index(fields=['deck', 'word'], name='vocabulary__deck_id_b60678_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0028_flashcard_deck_word_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='new_cards_after',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='new_cards_upto',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 import os
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
 from django.utils import timezone
 
 class Deck(models.Model):
@@ -124,6 +126,7 @@ class Flashcard(models.Model):
         indexes = [
             models.Index(fields=['user', 'word']),
             models.Index(fields=['user', 'deck']),
+            models.Index(fields=['deck', 'word']),
             models.Index(fields=['user', 'last_seen_date']),
             models.Index(fields=['user', 'difficulty_score']),
             models.Index(fields=['user', 'times_seen_today']),
@@ -235,6 +238,7 @@ class StudySessionAnswer(models.Model):
         ordering = ['answered_at']
         indexes = [
             models.Index(fields=['session', 'answered_at']),
+            models.Index(fields=['session', 'flashcard']),
             models.Index(fields=['flashcard', 'is_correct']),
         ]
 
@@ -390,6 +394,12 @@ class IncorrectWordReview(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_resolved']),
             models.Index(fields=['user', 'question_type', 'is_resolved']),
+            # Review mode and the review badge only read unresolved rows, which stay few
+            models.Index(
+                fields=['user', 'question_type'],
+                condition=models.Q(is_resolved=False),
+                name='incorrect_unresolved_idx',
+            ),
         ]
 
     def __str__(self):
@@ -502,3 +512,174 @@ class BlacklistFlashcard(models.Model):
             blacklist.delete()
             return None, False
         return blacklist, True
+
+
+class TranslationCache(models.Model):
+    """Persistent cache of machine translations keyed by (text, source, target)."""
+    text_hash = models.CharField(max_length=64, help_text="SHA-256 of the source text")
+    source_lang = models.CharField(max_length=10)
+    target_lang = models.CharField(max_length=10)
+    source_text = models.TextField()
+    translated_text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['text_hash', 'source_lang', 'target_lang']
+
+    def __str__(self):
+        return f"{self.source_lang}->{self.target_lang}: {self.source_text[:50]}"
+
+
+class ImportJob(models.Model):
+    """A deck import from an uploaded CSV/TSV or Anki file, with its progress."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_ENRICHING = 'enriching'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Importing'),
+        (STATUS_ENRICHING, 'Enriching'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    FORMAT_CSV = 'csv'
+    FORMAT_TSV = 'tsv'
+    FORMAT_ANKI = 'apkg'
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_TSV, 'TSV / Quizlet'),
+        (FORMAT_ANKI, 'Anki package'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='import_jobs')
+    deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name='import_jobs')
+    source_name = models.CharField(max_length=255, blank=True)
+    file_path = models.CharField(max_length=500, blank=True, help_text="Uploaded file, removed once imported")
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    enrich = models.BooleanField(default=True, help_text="Fill in missing definitions and audio after import")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    progress = models.FloatField(default=0.0, help_text="Fraction of the file read (0.0-1.0)")
+    rows_read = models.PositiveIntegerField(default=0)
+    imported_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    enriched_count = models.PositiveIntegerField(default=0)
+    # Cards created by the import have ids in (new_cards_after, new_cards_upto]; only those are enriched
+    new_cards_after = models.PositiveBigIntegerField(default=0)
+    new_cards_upto = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.source_name or self.format} -> {self.deck} ({self.status})"
+
+
+@deconstructible
+class ProfileStorage(FileSystemStorage):
+    """
+    Storage for profile reports under settings.PROFILE_ROOT, outside
+    MEDIA_ROOT: the reports hold SQL parameters, so they must never be served
+    as media. The location is read on every access so tests can override it.
+    """
+
+    @property
+    def base_location(self):
+        return settings.PROFILE_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+class RequestProfile(models.Model):
+    """A single request profiled on demand by a staff user (see vocabulary.profiling)."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='request_profiles')
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0.0)
+    report = models.FileField(storage=ProfileStorage(), help_text="Call tree and SQL statements as text")
+    stats_file = models.FileField(storage=ProfileStorage(), blank=True, help_text="Raw pstats dump (snakeviz, pstats)")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class BackgroundJob(models.Model):
+    """A unit of slow work queued for the job workers (see vocabulary.jobs)."""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    task = models.CharField(max_length=200, help_text="Dotted path of the function to run")
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=200, null=True, blank=True,
+                                 help_text="At most one queued or running job per key")
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time")
+    progress = models.FloatField(default=0.0, help_text="Fraction done (0.0-1.0), reported by the task")
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, help_text="Worker running the job")
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="Claim time, refreshed on progress")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_after'], name='job_due_idx'),
+            models.Index(fields=['task', 'created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedup_key'], condition=models.Q(status__in=['queued', 'running']),
+                                    name='job_active_dedup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class VSTEPWord(models.Model):
+    """A word in the shared pool of VSTEP suggestions (see vocabulary.vstep_pool)."""
+    word = models.CharField(max_length=100, unique=True, help_text="Normalised (lowercase, no punctuation)")
+    level = models.CharField(max_length=2, blank=True, help_text="CEFR band the word was generated for")
+    rank = models.PositiveIntegerField(help_text="Suggestion order, most frequently tested first")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return f"{self.rank}. {self.word} ({self.level})"
@@ -0,0 +1,82 @@
+"""
+Keyset pagination for flashcard listings.
+
+Pages are addressed by the id of the last card already shown (`after`) rather
+than by an offset, so fetching page N costs the same as fetching page 1: the
+database seeks straight to the cursor through the (deck_id, id) / (user_id, id)
+index instead of scanning and discarding every earlier row. Definitions are
+prefetched for the whole page in one extra query.
+
+Listings ordered by another column first (a deck's cards by word) keep the id
+as the cursor: the cursor card's sort values are read back by primary key and
+the page starts at the first row after that (value, id) pair, through the
+(deck_id, word) index.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: int | None = None
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+
+def parse_page_params(params, default_size: int = DEFAULT_PAGE_SIZE) -> tuple[int | None, int]:
+    """
+    Read `after` and `limit` from a QueryDict.
+
+    Raises ValueError for non-numeric values; the limit is clamped to
+    [1, MAX_PAGE_SIZE].
+    """
+    after = params.get('after') or None
+    after = int(after) if after is not None else None
+    limit = int(params.get('limit') or default_size)
+    return after, min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def _after_cursor(queryset, after: int, ordering: tuple[str, ...], descending: bool):
+    """Filter `queryset` to the rows past the card `after` in `ordering` (which ends with 'id')."""
+    values = queryset.model.objects.filter(pk=after).values(*ordering).first()
+    if values is None:
+        raise ValueError(f'Unknown cursor {after}')
+    past = 'lt' if descending else 'gt'
+    condition = Q()
+    # (a, b, id) > (x, y, z)  <=>  a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)
+    for depth, name in enumerate(ordering):
+        equal = {prior: values[prior] for prior in ordering[:depth]}
+        condition |= Q(**equal, **{f'{name}__{past}': values[name]})
+    return queryset.filter(condition)
+
+
+def keyset_page(queryset, after: int | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                descending: bool = False, ordering: tuple[str, ...] = ('id',)) -> KeysetPage:
+    """
+    Return one page of `queryset` in `ordering` (which must end with 'id'),
+    starting after the card whose id is the `after` cursor.
+
+    One row past the page is fetched to learn whether another page exists
+    without a COUNT query. Raises ValueError when the cursor card no longer
+    exists and the ordering needs its other values.
+    """
+    if after is not None:
+        if ordering == ('id',):
+            queryset = queryset.filter(id__lt=after) if descending else queryset.filter(id__gt=after)
+        else:
+            queryset = _after_cursor(queryset, after, ordering, descending)
+    order_by = [f'-{name}' for name in ordering] if descending else list(ordering)
+    queryset = queryset.order_by(*order_by).prefetch_related('definitions')
+    items = list(queryset[:limit + 1])
+    if len(items) > limit:
+        items = items[:limit]
+        return KeysetPage(items=items, next_cursor=items[-1].id)
+    return KeysetPage(items=items)
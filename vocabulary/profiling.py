@@ -0,0 +1,134 @@
+"""
+On-demand request profiling for staff users.
+
+A staff user adds `?_profile=1` to a URL, or sends an `X-Profile: 1` header,
+and that one request runs under cProfile while every SQL statement is
+recorded. The text report (functions by cumulative time, the callees of the
+heaviest ones, then the SQL statements with their durations and parameters)
+and the raw pstats dump are written under settings.PROFILE_ROOT and listed in
+the admin as a RequestProfile; the response carries an X-Profile-Id header
+with its id. The files hold user data, so they live outside MEDIA_ROOT under
+random names and are only downloadable through the admin.
+
+cProfile is deterministic, so the profiled request runs noticeably slower
+than usual; compare functions with each other rather than with the request's
+normal latency. Only the most recent KEEP_PROFILES profiles are kept.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import secrets
+import time
+from contextlib import ExitStack
+
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import RequestProfile
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'X-Profile'
+TOP_FUNCTIONS = 60
+CALLEE_FUNCTIONS = 15
+MAX_STATEMENTS = 1000
+MAX_SQL_LENGTH = 2000
+KEEP_PROFILES = 200
+
+
+def wants_profile(request) -> bool:
+    flag = request.GET.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER)
+    if flag not in ('1', 'true', 'yes'):
+        return False
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+class SQLRecorder:
+    """Execute wrapper that keeps every statement with its duration."""
+
+    def __init__(self):
+        self.statements = []
+        self.count = 0
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total += elapsed
+            if len(self.statements) < MAX_STATEMENTS:
+                self.statements.append((elapsed, sql, None if many else params))
+
+
+def profile_request(request, get_response):
+    """Run get_response(request) under the profiler and store the report."""
+    profiler = cProfile.Profile()
+    recorder = SQLRecorder()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(recorder))
+        response = profiler.runcall(get_response, request)
+    duration = time.perf_counter() - started
+
+    profile = save_profile(request, response.status_code, duration, profiler, recorder)
+    response['X-Profile-Id'] = str(profile.pk)
+    return response
+
+
+def render_report(request, status_code: int, duration: float, profiler, recorder: SQLRecorder) -> str:
+    out = io.StringIO()
+    match = request.resolver_match
+    out.write(f"{request.method} {request.get_full_path()}\n")
+    out.write(f"View: {match.view_name if match else '-'}    Status: {status_code}\n")
+    out.write(f"Total: {duration * 1000:.1f} ms    "
+              f"SQL: {recorder.count} queries, {recorder.total * 1000:.1f} ms\n\n")
+
+    stats = pstats.Stats(profiler, stream=out).strip_dirs().sort_stats('cumulative')
+    out.write("== Functions by cumulative time ==\n")
+    stats.print_stats(TOP_FUNCTIONS)
+    out.write("== Callees of the heaviest functions ==\n")
+    stats.print_callees(CALLEE_FUNCTIONS)
+
+    out.write(f"== SQL ({recorder.count} statements) ==\n")
+    for elapsed, sql, params in recorder.statements:
+        sql = sql if len(sql) <= MAX_SQL_LENGTH else sql[:MAX_SQL_LENGTH] + '...'
+        out.write(f"{elapsed * 1000:9.2f} ms  {sql}\n")
+        if params:
+            out.write(f"{'':13}params: {params!r:.500}\n")
+    if recorder.count > len(recorder.statements):
+        out.write(f"... {recorder.count - len(recorder.statements)} more statements not recorded\n")
+    return out.getvalue()
+
+
+def save_profile(request, status_code: int, duration: float, profiler, recorder: SQLRecorder) -> RequestProfile:
+    match = request.resolver_match
+    view_name = match.view_name if match else ''
+    profile = RequestProfile(
+        user_id=request.user.pk,
+        method=request.method,
+        path=request.get_full_path()[:500],
+        view_name=view_name,
+        status_code=status_code,
+        duration_ms=duration * 1000,
+        query_count=recorder.count,
+        sql_ms=recorder.total * 1000,
+    )
+    base = f"{timezone.now():%Y%m%d-%H%M%S}-{slugify(view_name) or 'request'}-{secrets.token_hex(8)}"
+    report = render_report(request, status_code, duration, profiler, recorder)
+    profile.report.save(f"{base}.txt", ContentFile(report.encode('utf-8')), save=False)
+    profiler.create_stats()
+    profile.stats_file.save(f"{base}.prof", ContentFile(marshal.dumps(profiler.stats)), save=False)
+    profile.save()
+
+    stale = RequestProfile.objects.values_list('pk', flat=True)[KEEP_PROFILES:]
+    for old in RequestProfile.objects.filter(pk__in=list(stale)):
+        old.delete()  # post_delete removes the files
+    return profile
@@ -0,0 +1,203 @@
+"""
+Query-plan checks for the project's hot queries.
+
+CATALOGUE lists the querysets behind the study, review, statistics, deck and
+dictation endpoints, built for a placeholder user. `check_plans()` runs each
+through EXPLAIN QUERY PLAN and flags full table scans and temporary B-trees
+(sorts or DISTINCTs the database could not answer from an index).
+`suggest_index()` reads the queryset's own filters and ordering and proposes a
+composite index (equality columns, then at most one range column, then the
+ORDER BY columns) and, when the query pins a boolean column to a constant, a
+partial index on that condition instead.
+
+Plans are only inspected on SQLite. The explain_plans command prints the
+report and the test suite fails when a catalogued query regresses to a scan.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Callable, NamedTuple
+
+from django.db import connection
+from django.db.models import Count, Q
+from django.db.models.lookups import Exact, In
+
+from .models import (
+    BackgroundJob, BlacklistFlashcard, DailyStatistics, Deck, FavoriteFlashcard, Flashcard, ImportJob, IncorrectWordReview,
+    StudySession, StudySessionAnswer,
+)
+
+USER_ID = 1
+_SINCE = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+_SCAN_RE = re.compile(r'^SCAN (\S+)(?: AS \S+)?$')  # A bare SCAN reads the whole table
+_EQUALITY_LOOKUPS = (Exact, In)
+
+
+class HotQuery(NamedTuple):
+    name: str
+    build: Callable[[], object]
+    # Plan details that are acceptable for this query (e.g. a scan of a tiny lookup table)
+    allow: tuple = ()
+
+
+def _dictation_queries():
+    from dictation.models import DictationProgress, DictationSegment, SemanticVerdict, VideoQuiz
+
+    return [
+        HotQuery('dictation.progress', lambda: DictationProgress.objects.filter(user_id=USER_ID, video_id=1)),
+        HotQuery('dictation.segments', lambda: DictationSegment.objects.filter(video_id=1).order_by('order')),
+        HotQuery('dictation.untaken_quizzes',
+                 lambda: VideoQuiz.objects.filter(video_id=1).exclude(attempts__user_id=USER_ID).order_by()),
+        HotQuery('dictation.semantic_verdicts', lambda: SemanticVerdict.objects.filter(key__in=['a', 'b'])),
+    ]
+
+
+# Random selections are read in primary-key order or by their primary keys
+CATALOGUE = [
+    HotQuery('study.random_cefr', lambda: Flashcard.objects.filter(
+        user_id=USER_ID, cefr_level__in=['B1', 'B2']).exclude(id__in=[1, 2]).order_by()),
+    HotQuery('study.deck_difficulty_group', lambda: Flashcard.objects.filter(
+        user_id=USER_ID, deck_id__in=[1, 2], times_seen_today__lt=5, difficulty_score=0.67).order_by()),
+    HotQuery('study.new_cards', lambda: Flashcard.objects.filter(
+        user_id=USER_ID, times_seen_today__lt=5, difficulty_score__isnull=True).order_by()),
+    HotQuery('study.reset_daily_counters', lambda: Flashcard.objects.filter(
+        user_id=USER_ID, last_seen_date__lt=date(2024, 1, 1)).order_by()),
+    HotQuery('study.session_unique_words', lambda: StudySessionAnswer.objects.filter(
+        session_id=1).values('flashcard').distinct().order_by()),
+    HotQuery('study.blacklist', lambda: BlacklistFlashcard.objects.filter(
+        user_id=USER_ID).values_list('flashcard_id', flat=True)),
+    HotQuery('study.favorites', lambda: FavoriteFlashcard.objects.filter(user_id=USER_ID).order_by()),
+    HotQuery('study.duplicate_answer', lambda: StudySessionAnswer.objects.filter(
+        session_id=1, flashcard_id=1, answered_at__gte=_SINCE)),
+    HotQuery('review.unresolved', lambda: IncorrectWordReview.objects.filter(
+        user_id=USER_ID, is_resolved=False).order_by()),
+    HotQuery('review.counts_by_type', lambda: IncorrectWordReview.objects.filter(
+        user_id=USER_ID, is_resolved=False).values('question_type').annotate(count=Count('id')).order_by()),
+    HotQuery('review.card_type', lambda: IncorrectWordReview.objects.filter(
+        user_id=USER_ID, flashcard_id=1, question_type='mc')),
+    HotQuery('statistics.daily_range', lambda: DailyStatistics.objects.filter(
+        user_id=USER_ID, date__gte=date(2024, 1, 1)).order_by('date')),
+    HotQuery('statistics.recent_sessions', lambda: StudySession.objects.filter(
+        user_id=USER_ID).order_by('-session_start')[:10]),
+    HotQuery('statistics.day_sessions', lambda: StudySession.objects.filter(
+        user_id=USER_ID, session_start__range=(_SINCE, _SINCE + timedelta(days=1)),
+        session_end__isnull=False).order_by()),
+    HotQuery('statistics.new_cards_on_day', lambda: Flashcard.objects.filter(
+        user_id=USER_ID, created_at__range=(_SINCE, _SINCE + timedelta(days=1))).order_by()),
+    HotQuery('decks.list', lambda: Deck.objects.filter(user_id=USER_ID).order_by('name')),
+    HotQuery('decks.cards_page', lambda: Flashcard.objects.filter(
+        Q(word__gt='example') | Q(word='example', id__gt=100), deck_id=1).order_by('word', 'id')[:50]),
+    HotQuery('decks.search_word', lambda: Flashcard.objects.filter(user_id=USER_ID, word='example')),
+    HotQuery('jobs.next_due', lambda: BackgroundJob.objects.filter(
+        status=BackgroundJob.STATUS_QUEUED, run_after__lte=_SINCE).order_by('-priority', 'run_after')),
+    HotQuery('jobs.active_dedup_key', lambda: BackgroundJob.objects.filter(
+        dedup_key='schedule:x', status__in=BackgroundJob.ACTIVE_STATUSES).order_by()),
+    HotQuery('jobs.schedule_last_run', lambda: BackgroundJob.objects.filter(
+        task='vocabulary.tasks.prune_jobs', created_at__gt=_SINCE).order_by()),
+    HotQuery('imports.recent_jobs', lambda: ImportJob.objects.filter(user_id=USER_ID).order_by('-created_at')[:5]),
+]
+
+
+class PlanReport(NamedTuple):
+    name: str
+    sql: str
+    plan: list[str]
+    problems: list[str]
+    suggestion: str | None
+
+
+def explain(queryset) -> list[str]:
+    """EXPLAIN QUERY PLAN detail lines of a queryset (SQLite)."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[3] for row in cursor.fetchall()]
+
+
+def plan_problems(plan: list[str], allow=()) -> list[str]:
+    problems = []
+    for detail in plan:
+        if any(allowed in detail for allowed in allow):
+            continue
+        if _SCAN_RE.match(detail):
+            problems.append(f'full scan: {detail}')
+        elif 'USE TEMP B-TREE' in detail:
+            problems.append(f'temp b-tree: {detail}')
+    return problems
+
+
+def _where_columns(queryset):
+    """(equality, range, constant booleans) columns filtered on the queryset's own table."""
+    model = queryset.model
+    table = model._meta.db_table
+    equality, ranges, booleans = [], [], {}
+
+    def walk(node):
+        if getattr(node, 'negated', False) or getattr(node, 'connector', 'AND') != 'AND':
+            return  # NOT and OR branches cannot drive an index prefix
+        for child in node.children:
+            if hasattr(child, 'children'):
+                walk(child)
+                continue
+            target = getattr(getattr(child, 'lhs', None), 'target', None)
+            if target is None or getattr(child.lhs, 'alias', table) != table or target.model is not model:
+                continue
+            if isinstance(child, Exact) and isinstance(child.rhs, bool):
+                booleans[target.name] = child.rhs
+            elif isinstance(child, _EQUALITY_LOOKUPS):
+                equality.append(target.name)
+            else:
+                ranges.append(target.name)
+
+    walk(queryset.query.where)
+    return equality, ranges, booleans
+
+
+def suggest_index(queryset) -> str | None:
+    """A models.Index definition that would serve the queryset's filters and ordering."""
+    model = queryset.model
+    equality, ranges, booleans = _where_columns(queryset)
+    ordering = []
+    for field in queryset.query.order_by:
+        if not isinstance(field, str):
+            continue
+        name = field.lstrip('-')
+        name = model._meta.pk.name if name == 'pk' else name
+        ordering.append(('-' if field.startswith('-') else '') + name)
+
+    fields = list(dict.fromkeys(equality))
+    if ranges:
+        fields.append(ranges[0])
+    elif ordering:
+        fields.extend(o for o in ordering if o.lstrip('-') not in fields and o.lstrip('-') != model._meta.pk.name)
+    if not fields:
+        return None
+    suggestion = f"models.Index(fields={fields!r}"
+    if booleans:
+        condition = ', '.join(f'{name}={value!r}' for name, value in booleans.items())
+        suggestion += f", condition=models.Q({condition})"
+    return f"{model.__name__}: {suggestion}, name=...)"
+
+
+def catalogue():
+    return CATALOGUE + _dictation_queries()
+
+
+def check_plans(queries=None) -> list[PlanReport]:
+    """Explain every catalogued query. Raises RuntimeError on engines other than SQLite."""
+    if connection.vendor != 'sqlite':
+        raise RuntimeError('Query plans are only checked on SQLite.')
+    reports = []
+    for query in queries or catalogue():
+        queryset = query.build()
+        plan = explain(queryset)
+        problems = plan_problems(plan, query.allow)
+        reports.append(PlanReport(
+            name=query.name,
+            sql=str(queryset.query),
+            plan=plan,
+            problems=problems,
+            suggestion=suggest_index(queryset) if problems else None,
+        ))
+    return reports
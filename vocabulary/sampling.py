@@ -0,0 +1,64 @@
+"""
+Random row selection without ORDER BY RANDOM().
+
+`order_by('?')` makes the database give every matching row a random key and
+sort them all, only to return one. Instead, random_row() picks a uniformly
+random rank below the number of matching rows (callers often know it already)
+and reads the row at that offset in primary-key order. For the filtered,
+per-user querysets it serves, that is a walk along an index, with no sort and
+no table rows read but the one returned. random_sample() reads the matching
+primary keys (an index-only read), chooses among them in memory and loads only
+the chosen rows.
+
+Both are uniform: every row, or every subset of `k` rows, is equally likely,
+however the keys are spread. Probing for the first key at or after a random
+value in [min(pk), max(pk)] is not: a row is then picked in proportion to the
+gap before it, and the gaps in a user's cards are other users' inserts.
+
+This is the same on SQLite and PostgreSQL: PostgreSQL's TABLESAMPLE samples
+the whole table before the WHERE clause, so it does not fit these per-user,
+filtered selections.
+"""
+
+import random
+
+
+def _row_at(queryset, offset: int):
+    rows = list(queryset.order_by('pk')[offset:offset + 1])
+    return rows[0] if rows else None
+
+
+def random_row(queryset, count: int | None = None, rng=random):
+    """
+    A uniformly random row of `queryset`, or None when it is empty.
+
+    A `count` of 0 (callers often know it already) skips the database.
+    """
+    if count is None:
+        count = queryset.count()
+    if count <= 0:
+        return None
+    row = _row_at(queryset, rng.randrange(count))
+    if row is None:
+        # The count was stale: rows were deleted since it was taken
+        count = queryset.count()
+        if count:
+            row = _row_at(queryset, rng.randrange(count))
+    return row
+
+
+def random_sample(queryset, k: int, count: int | None = None, rng=random) -> list:
+    """
+    Up to `k` distinct random rows of `queryset` (which may be a values_list),
+    in random order. Rows are chosen independently of each other, so cards
+    created together are no more likely to be picked together.
+    """
+    if k <= 0 or (count is not None and count <= 0):
+        return []
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+    if not pks:
+        return []
+    chosen = rng.sample(pks, min(k, len(pks)))
+    rows = list(queryset.order_by().filter(pk__in=chosen))
+    rng.shuffle(rows)
+    return rows
@@ -0,0 +1,325 @@
+"""
+Flashcard search index.
+
+On SQLite, flashcards are mirrored into an FTS5 virtual table
+(`vocabulary_flashcard_fts`) holding the word, every definition and every
+synonym, with the flashcard id as rowid. On PostgreSQL the same columns are
+covered by pg_trgm GIN indexes created in migration 0020. Other engines, or an
+SQLite build without FTS5, fall back to a plain ORM query.
+
+FTS5 only matches token prefixes. On SQLite, a query the index has no match
+for at all is answered from substrings of the user's words instead ("ilien"
+finds "resilient"); the scan over the word column only runs when the index
+comes back empty. Autocomplete (`word_suggestions`) always tops its prefix
+matches up with substring matches, as it did before the index.
+
+Each backend returns one ranked, paginated page - including the deck name, a
+definition preview and the total match count - from a single query.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+from django.db.models import Case, OuterRef, Q, Subquery, TextField, Value, When
+from django.db.models.functions import Coalesce, Lower, NullIf
+
+from .models import Definition, Flashcard
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'vocabulary_flashcard_fts'
+SEARCH_FIELDS = ('word', 'definitions', 'synonyms')
+# Fields whose change requires re-indexing a flashcard.
+INDEXED_MODEL_FIELDS = {'word', 'general_synonyms', 'user', 'user_id'}
+# bm25 weights per FTS column: word, definitions, synonyms, owner.
+_BM25_WEIGHTS = '10.0, 2.0, 4.0, 0.0'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+PREVIEW_LENGTH = 100
+
+_PREVIEW_SQL = (
+    "(SELECT COALESCE(NULLIF(d.english_definition, ''), d.vietnamese_definition) "
+    "FROM vocabulary_definition d WHERE d.flashcard_id = f.id ORDER BY d.id LIMIT 1)"
+)
+
+# Rows for the FTS table, built from the base tables with one statement.
+_INDEX_ROWS_SQL = """
+    SELECT f.id,
+           f.word,
+           COALESCE((SELECT group_concat(COALESCE(d.english_definition, '') || ' ' ||
+                                         COALESCE(d.vietnamese_definition, ''), ' ')
+                     FROM vocabulary_definition d WHERE d.flashcard_id = f.id), ''),
+           COALESCE(f.general_synonyms, '') || ' ' ||
+           COALESCE((SELECT group_concat(COALESCE(d.definition_synonyms, ''), ' ')
+                     FROM vocabulary_definition d WHERE d.flashcard_id = f.id), ''),
+           'u' || f.user_id
+    FROM vocabulary_flashcard f
+"""
+
+_fts_available = None
+
+
+@dataclass
+class SearchPage:
+    results: list = field(default_factory=list)
+    total: int = 0
+    page: int = 1
+    page_size: int = DEFAULT_PAGE_SIZE
+
+    @property
+    def has_more(self):
+        return self.page * self.page_size < self.total
+
+
+def fts_available() -> bool:
+    """True when the SQLite FTS5 table exists on the default connection."""
+    global _fts_available
+    if connection.vendor != 'sqlite':
+        return False
+    if _fts_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+            )
+            _fts_available = cursor.fetchone() is not None
+    return _fts_available
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance (SQLite only; PostgreSQL indexes maintain themselves)
+# ---------------------------------------------------------------------------
+
+def reindex_flashcards(flashcard_ids):
+    """Refresh the index rows of the given flashcards (used by signals and bulk writers)."""
+    ids = [int(i) for i in flashcard_ids]
+    if not ids or not fts_available():
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", ids)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, word, definitions, synonyms, owner) "
+            f"{_INDEX_ROWS_SQL} WHERE f.id IN ({placeholders})",
+            ids,
+        )
+
+
+def remove_flashcards(flashcard_ids):
+    ids = [int(i) for i in flashcard_ids]
+    if not ids or not fts_available():
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", ids)
+
+
+def rebuild_index():
+    """Rebuild the whole FTS table from the flashcard and definition tables."""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, word, definitions, synonyms, owner) {_INDEX_ROWS_SQL}"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _fts_query(user_id: int, text: str, fields) -> str | None:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    terms = ' '.join(f'"{token}"*' for token in tokens)
+    return f'owner:"u{user_id}" AND {{{" ".join(fields)}}}:({terms})'
+
+
+def _row_to_result(row) -> dict:
+    card_id, word, phonetic, part_of_speech, deck_id, deck_name, preview = row[:7]
+    return {
+        'id': card_id,
+        'word': word,
+        'phonetic': phonetic or '',
+        'part_of_speech': part_of_speech or '',
+        'deck_id': deck_id,
+        'deck_name': deck_name or '',
+        'definition_preview': (preview or '')[:PREVIEW_LENGTH],
+    }
+
+
+def _search_sqlite(user_id, text, fields, limit, offset):
+    match = _fts_query(user_id, text, fields)
+    if match is None:
+        return [], 0
+    sql = f"""
+        WITH matches AS (
+            SELECT rowid AS id, bm25({FTS_TABLE}, {_BM25_WEIGHTS}) AS score
+            FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s
+        )
+        SELECT f.id, f.word, f.phonetic, f.part_of_speech, f.deck_id, dk.name,
+               {_PREVIEW_SQL}, COUNT(*) OVER ()
+        FROM matches m
+        JOIN vocabulary_flashcard f ON f.id = m.id
+        LEFT JOIN vocabulary_deck dk ON dk.id = f.deck_id
+        ORDER BY lower(f.word) = lower(%s) DESC,
+                 lower(f.word) LIKE lower(%s) ESCAPE '\\' DESC,
+                 m.score, lower(f.word)
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, text, _like_escape(text) + '%', limit, offset])
+        rows = cursor.fetchall()
+    if rows:
+        return [_row_to_result(r) for r in rows], rows[0][7]
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        total = cursor.fetchone()[0]
+    if total:
+        # A page past the end of the index matches
+        return [], total
+    # Substring matches only when the index has none at all
+    return _search_sqlite_words(user_id, text, limit, offset)
+
+
+def _search_sqlite_words(user_id, text, limit, offset, exclude_ids=()):
+    """Words of the user's cards containing `text`, leaving out `exclude_ids`."""
+    exclude = ''.join(' AND f.id <> %s' for _ in exclude_ids)
+    sql = f"""
+        SELECT f.id, f.word, f.phonetic, f.part_of_speech, f.deck_id, dk.name,
+               {_PREVIEW_SQL}, COUNT(*) OVER ()
+        FROM vocabulary_flashcard f
+        LEFT JOIN vocabulary_deck dk ON dk.id = f.deck_id
+        WHERE f.user_id = %s AND lower(f.word) LIKE %s ESCAPE '\\'{exclude}
+        ORDER BY lower(f.word) = lower(%s) DESC,
+                 lower(f.word) LIKE lower(%s) ESCAPE '\\' DESC,
+                 lower(f.word)
+        LIMIT %s OFFSET %s
+    """
+    params = [user_id, '%' + _like_escape(text.lower()) + '%', *exclude_ids,
+              text, _like_escape(text) + '%', limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    if not rows and offset:
+        # A page past the end: count the matches from the first one
+        return [], _search_sqlite_words(user_id, text, 1, 0, exclude_ids)[1]
+    return [_row_to_result(r) for r in rows], (rows[0][7] if rows else 0)
+
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _search_postgres(user_id, text, fields, limit, offset):
+    pattern = '%' + _like_escape(text.lower()) + '%'
+    clauses = ["lower(f.word) LIKE %s"]
+    params = [pattern]
+    if 'synonyms' in fields:
+        clauses.append("lower(COALESCE(f.general_synonyms, '')) LIKE %s")
+        params.append(pattern)
+    definition_clauses = []
+    if 'definitions' in fields:
+        definition_clauses += ["lower(d.english_definition) LIKE %s", "lower(d.vietnamese_definition) LIKE %s"]
+        params += [pattern, pattern]
+    if 'synonyms' in fields:
+        definition_clauses.append("lower(COALESCE(d.definition_synonyms, '')) LIKE %s")
+        params.append(pattern)
+    if definition_clauses:
+        clauses.append(
+            "EXISTS (SELECT 1 FROM vocabulary_definition d WHERE d.flashcard_id = f.id AND ("
+            + ' OR '.join(definition_clauses) + "))"
+        )
+    sql = f"""
+        SELECT f.id, f.word, f.phonetic, f.part_of_speech, f.deck_id, dk.name,
+               {_PREVIEW_SQL}, COUNT(*) OVER ()
+        FROM vocabulary_flashcard f
+        LEFT JOIN vocabulary_deck dk ON dk.id = f.deck_id
+        WHERE f.user_id = %s AND ({' OR '.join(clauses)})
+        ORDER BY lower(f.word) = lower(%s) DESC,
+                 lower(f.word) LIKE %s DESC,
+                 similarity(lower(f.word), lower(%s)) DESC, lower(f.word)
+        LIMIT %s OFFSET %s
+    """
+    params = [user_id] + params + [text, _like_escape(text.lower()) + '%', text, limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    if not rows and offset:
+        # A page past the end: count the matches from the first one
+        return [], _search_postgres(user_id, text, fields, 1, 0)[1]
+    return [_row_to_result(r) for r in rows], (rows[0][7] if rows else 0)
+
+
+def _search_orm(user_id, text, fields, limit, offset):
+    condition = Q(word__icontains=text)
+    if 'synonyms' in fields:
+        condition |= Q(general_synonyms__icontains=text) | Q(definitions__definition_synonyms__icontains=text)
+    if 'definitions' in fields:
+        condition |= (Q(definitions__english_definition__icontains=text)
+                      | Q(definitions__vietnamese_definition__icontains=text))
+    preview = Definition.objects.filter(flashcard=OuterRef('pk')).order_by('pk').annotate(
+        text=Coalesce(NullIf('english_definition', Value('')), 'vietnamese_definition',
+                      output_field=TextField())
+    ).values('text')[:1]
+    queryset = (
+        Flashcard.objects.filter(user_id=user_id)
+        .filter(pk__in=Flashcard.objects.filter(condition).values('pk'))
+        .select_related('deck')
+        .annotate(
+            preview=Subquery(preview),
+            not_exact=Case(When(word__iexact=text, then=Value(0)), default=Value(1)),
+            not_prefix=Case(When(word__istartswith=text, then=Value(0)), default=Value(1)),
+        )
+        .order_by('not_exact', 'not_prefix', Lower('word'))
+    )
+    total = queryset.count()
+    results = [
+        _row_to_result((c.id, c.word, c.phonetic, c.part_of_speech, c.deck_id,
+                        c.deck.name if c.deck else '', c.preview))
+        for c in queryset[offset:offset + limit]
+    ]
+    return results, total
+
+
+def search_flashcards(user, text: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE,
+                      fields=SEARCH_FIELDS) -> SearchPage:
+    """
+    Search a user's flashcards by word, definitions and synonyms.
+
+    Exact word matches rank first, then words starting with the query, then the
+    engine's relevance score.
+    """
+    text = (text or '').strip()
+    page = max(int(page), 1)
+    page_size = min(max(int(page_size), 1), MAX_PAGE_SIZE)
+    if not text:
+        return SearchPage(page=page, page_size=page_size)
+
+    offset = (page - 1) * page_size
+    if fts_available():
+        results, total = _search_sqlite(user.id, text, fields, page_size, offset)
+    elif connection.vendor == 'postgresql':
+        results, total = _search_postgres(user.id, text, fields, page_size, offset)
+    else:
+        results, total = _search_orm(user.id, text, fields, page_size, offset)
+    return SearchPage(results=results, total=total, page=page, page_size=page_size)
+
+
+def word_suggestions(user, text: str, limit: int = 8) -> list[dict]:
+    """
+    Autocomplete for a user's words: exact and prefix matches first, then
+    words containing `text` elsewhere, up to `limit` results.
+    """
+    results = search_flashcards(user, text, page_size=limit, fields=('word',)).results
+    if len(results) < limit and fts_available():
+        # The index only matches token prefixes; add the substring matches after them
+        more, _ = _search_sqlite_words(user.id, (text or '').strip(), limit - len(results), 0,
+                                       exclude_ids=[r['id'] for r in results])
+        results += more
+    return results
@@ -1,17 +1,44 @@
 """
-Django signals to handle cache invalidation when models are modified.
+Django signals to handle cache invalidation and search indexing when models are modified.
 """
 
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Flashcard, FavoriteFlashcard, IncorrectWordReview, StudySession
+from .models import Definition, Flashcard, FavoriteFlashcard, IncorrectWordReview, RequestProfile, StudySession
 from .cache_utils import invalidate_user_study_cache, StatisticsCache
+from .autocomplete import INDEXED_MODEL_FIELDS as AUTOCOMPLETE_FIELDS, invalidate_user_index
+from .search_index import INDEXED_MODEL_FIELDS, reindex_flashcards, remove_flashcards
 
 
 @receiver([post_save, post_delete], sender=Flashcard)
-def invalidate_flashcard_cache(sender, instance, **kwargs):
-    """Invalidate user's study cache when flashcards are modified."""
+def invalidate_flashcard_cache(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate user's study cache when flashcards are modified, and their
+    autocomplete index unless only study-tracking fields changed.
+    """
     invalidate_user_study_cache(instance.user_id)
+    if update_fields is not None and AUTOCOMPLETE_FIELDS.isdisjoint(update_fields):
+        return
+    invalidate_user_index(instance.user_id)
+
+
+@receiver(post_save, sender=Flashcard)
+def index_flashcard(sender, instance, update_fields=None, **kwargs):
+    """Refresh the search index row unless only study-tracking fields changed."""
+    if update_fields is not None and INDEXED_MODEL_FIELDS.isdisjoint(update_fields):
+        return
+    reindex_flashcards([instance.pk])
+
+
+@receiver(post_delete, sender=Flashcard)
+def unindex_flashcard(sender, instance, **kwargs):
+    remove_flashcards([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Definition)
+def reindex_definition_flashcard(sender, instance, **kwargs):
+    """Definitions are indexed with their flashcard."""
+    reindex_flashcards([instance.flashcard_id])
 
 
 @receiver([post_save, post_delete], sender=FavoriteFlashcard)
@@ -34,4 +61,11 @@ def invalidate_incorrect_words_cache(sender, instance, **kwargs):
 def invalidate_stats_cache_on_session_end(sender, instance, created, **kwargs):
     """Clear statistics cache when a study session is ended (session_end becomes set)."""
     if not created and instance.session_end is not None:
-        StatisticsCache.invalidate_user_stats(instance.user_id)
\ No newline at end of file
+        StatisticsCache.invalidate_user_stats(instance.user_id)
+
+@receiver(post_delete, sender=RequestProfile)
+def delete_profile_files(sender, instance, **kwargs):
+    """Profile reports live under PROFILE_ROOT; remove them with their row."""
+    for field in (instance.report, instance.stats_file):
+        if field:
+            field.delete(save=False)
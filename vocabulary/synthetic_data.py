@@ -0,0 +1,263 @@
+"""
+Synthetic data for benchmarks.
+
+Generates users with decks, flashcards and definitions, months of study
+history (sessions, answers, daily statistics) and processed dictation videos,
+all with bulk inserts so that 100k+ cards take seconds rather than hours.
+Generated users share an email prefix so they can be found and removed again.
+Everything is drawn from a seeded random generator: the same options always
+produce the same data.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .autocomplete import invalidate_user_index
+from .cache_utils import invalidate_user_study_cache
+from .models import DailyStatistics, Deck, Definition, Flashcard, StudySession, StudySessionAnswer
+from .search_index import rebuild_index
+
+EMAIL_DOMAIN = 'bench.example.com'
+PASSWORD = 'benchmark-password'
+BATCH_SIZE = 2000
+
+_ONSETS = ['b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'w',
+           'br', 'cl', 'dr', 'fl', 'gr', 'pl', 'pr', 'sh', 'st', 'str', 'th', 'tr']
+_VOWELS = ['a', 'e', 'i', 'o', 'u', 'ai', 'ea', 'ee', 'io', 'ou']
+_CODAS = ['', '', 'n', 'r', 's', 't', 'l', 'm', 'nd', 'nt', 'st', 'ck', 'ng']
+_SUFFIXES = ['', '', '', 'tion', 'ment', 'ness', 'able', 'ity', 'ous', 'ive', 'ly', 'er', 'ing']
+_PARTS_OF_SPEECH = ['noun', 'verb', 'adjective', 'adverb']
+_CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2', None]
+_DEFINITION_WORDS = (
+    'a the of to something that someone when used for describe place person feeling act way '
+    'quality state make become having very large small kind particular especially often'
+).split()
+_VIETNAMESE_WORDS = 'một cái người làm có không được những việc cảm thấy nơi rất lớn nhỏ'.split()
+_QUESTION_TYPES = ['mc', 'type', 'dictation']
+_TRANSCRIPT_WORDS = (
+    'we you they people time year way day thing world life hand part child eye woman place '
+    'work week case point government company number group problem fact think know take see '
+    'come want look use find give tell ask seem feel try leave call good new first last long '
+    'great little own other old right big high different small large next early young important'
+).split()
+_NAMES = ['London', 'Paris', 'Anna', 'Tokyo', 'Microsoft', 'Sarah', 'Hanoi', 'Google']
+
+
+@dataclass
+class SyntheticOptions:
+    users: int = 3
+    cards_per_user: int = 35000
+    decks_per_user: int = 20
+    days: int = 180
+    answers_per_day: int = 60
+    videos: int = 5
+    segments_per_video: int = 200
+    email_prefix: str = 'bench'
+    seed: int = 42
+
+
+@dataclass
+class SyntheticSummary:
+    users: list = field(default_factory=list)
+    decks: int = 0
+    flashcards: int = 0
+    definitions: int = 0
+    sessions: int = 0
+    answers: int = 0
+    daily_statistics: int = 0
+    videos: int = 0
+    segments: int = 0
+
+
+def synthetic_users(email_prefix: str = 'bench'):
+    return get_user_model().objects.filter(email__startswith=f'{email_prefix}-', email__endswith=f'@{EMAIL_DOMAIN}')
+
+
+def clear_synthetic_data(email_prefix: str = 'bench') -> int:
+    """Delete previously generated users (and, by cascade, all their data)."""
+    from dictation.models import DictationVideo
+
+    users = synthetic_users(email_prefix)
+    DictationVideo.objects.filter(video_id__startswith=f'{email_prefix}-').delete()
+    count = users.count()
+    users.delete()
+    rebuild_index()
+    return count
+
+
+def _word(rng: random.Random) -> str:
+    syllables = ''.join(
+        rng.choice(_ONSETS) + rng.choice(_VOWELS) + rng.choice(_CODAS)
+        for _ in range(rng.choice((1, 2, 2, 3)))
+    )
+    return syllables + rng.choice(_SUFFIXES)
+
+
+def _unique_words(rng: random.Random, count: int) -> list[str]:
+    words, seen = [], set()
+    while len(words) < count:
+        word = _word(rng)
+        if word in seen:
+            word = f'{word}{len(words)}'
+        seen.add(word)
+        words.append(word)
+    return words
+
+
+def _sentence(rng: random.Random, vocabulary, low: int, high: int) -> str:
+    return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(low, high)))
+
+
+def _bulk(model, objects):
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def generate(options: SyntheticOptions, log=lambda message: None) -> SyntheticSummary:
+    """Create the synthetic data set described by `options`."""
+    rng = random.Random(options.seed)
+    summary = SyntheticSummary()
+    User = get_user_model()
+
+    for index in range(options.users):
+        email = f'{options.email_prefix}-{index}@{EMAIL_DOMAIN}'
+        with transaction.atomic():
+            user = User.objects.create_user(email=email, password=PASSWORD)
+            cards = _generate_cards(rng, user, options, summary)
+            _generate_history(rng, user, cards, options, summary)
+        invalidate_user_study_cache(user.id)
+        invalidate_user_index(user.id)
+        summary.users.append(email)
+        log(f'{email}: {len(cards)} cards')
+
+    _generate_videos(rng, options, summary)
+    rebuild_index()
+    return summary
+
+
+def _generate_cards(rng, user, options, summary) -> list[Flashcard]:
+    decks = _bulk(Deck, [Deck(user=user, name=f'Deck {i + 1}') for i in range(options.decks_per_user)])
+    summary.decks += len(decks)
+
+    now = timezone.now()
+    cards = []
+    for word in _unique_words(rng, options.cards_per_user):
+        reviews = rng.randint(0, 30)
+        cards.append(Flashcard(
+            user=user,
+            deck=rng.choice(decks),
+            word=word,
+            phonetic=f'/{word}/',
+            part_of_speech=rng.choice(_PARTS_OF_SPEECH),
+            general_synonyms=', '.join(_word(rng) for _ in range(rng.randint(0, 3))) or None,
+            difficulty_score=rng.choice((None, 0.0, 0.33, 0.67, 1.0)),
+            total_reviews=reviews,
+            correct_reviews=rng.randint(0, reviews),
+            last_reviewed=now - timedelta(days=rng.randint(0, options.days)) if reviews else None,
+            cefr_level=rng.choice(_CEFR_LEVELS),
+        ))
+    cards = _bulk(Flashcard, cards)
+    summary.flashcards += len(cards)
+
+    definitions = [
+        Definition(
+            flashcard=card,
+            english_definition=_sentence(rng, _DEFINITION_WORDS, 5, 14),
+            vietnamese_definition=_sentence(rng, _VIETNAMESE_WORDS, 3, 8),
+        )
+        for card in cards
+        for _ in range(rng.choice((1, 1, 2)))
+    ]
+    _bulk(Definition, definitions)
+    summary.definitions += len(definitions)
+    return cards
+
+
+def _generate_history(rng, user, cards, options, summary):
+    today = timezone.localdate()
+    sessions, day_answers, daily = [], [], []
+    for offset in range(options.days, 0, -1):
+        day = today - timedelta(days=offset)
+        if rng.random() < 0.3:  # Days off
+            continue
+        started = timezone.make_aware(datetime.combine(day, time(hour=rng.randint(6, 22))))
+        answers = rng.randint(options.answers_per_day // 2, options.answers_per_day * 3 // 2)
+        correct = 0
+        rows = []
+        for n in range(answers):
+            is_correct = rng.random() < 0.75
+            correct += is_correct
+            rows.append((rng.choice(cards), is_correct, started + timedelta(seconds=8 * n)))
+        duration = 8 * answers
+        sessions.append(StudySession(
+            user=user, session_end=started + timedelta(seconds=duration), study_mode='deck',
+            total_questions=answers, correct_answers=correct, incorrect_answers=answers - correct,
+            session_duration_seconds=duration, words_studied=len({card.pk for card, _, _ in rows}),
+            average_response_time=round(rng.uniform(2, 9), 2),
+        ))
+        day_answers.append((started, rows))
+        daily.append(DailyStatistics(
+            user=user, date=day, total_study_time_seconds=duration, total_questions_answered=answers,
+            correct_answers=correct, incorrect_answers=answers - correct,
+            unique_words_studied=len({card.pk for card, _, _ in rows}), study_sessions_count=1,
+            average_session_duration=duration, is_study_day=True,
+        ))
+
+    sessions = _bulk(StudySession, sessions)
+    for session, (started, _) in zip(sessions, day_answers):
+        session.session_start = started
+    # bulk_update bypasses auto_now_add, which bulk_create would apply
+    StudySession.objects.bulk_update(sessions, ['session_start'], batch_size=BATCH_SIZE)
+
+    answers, answered_at = [], []
+    for session, (_, rows) in zip(sessions, day_answers):
+        for card, is_correct, timestamp in rows:
+            before = rng.choice((0.0, 0.33, 0.67, 1.0))
+            answers.append(StudySessionAnswer(
+                session=session, flashcard=card, is_correct=is_correct,
+                response_time_seconds=round(rng.uniform(1, 15), 2),
+                question_type=rng.choice(_QUESTION_TYPES),
+                difficulty_before=before, difficulty_after=before,
+            ))
+            answered_at.append(timestamp)
+    answers = _bulk(StudySessionAnswer, answers)
+    for answer, value in zip(answers, answered_at):
+        answer.answered_at = value
+    StudySessionAnswer.objects.bulk_update(answers, ['answered_at'], batch_size=BATCH_SIZE)
+
+    _bulk(DailyStatistics, daily)
+    summary.sessions += len(sessions)
+    summary.answers += len(answers)
+    summary.daily_statistics += len(daily)
+
+
+def _generate_videos(rng, options, summary):
+    from dictation.models import DictationSegment, DictationVideo
+
+    vocabulary = _TRANSCRIPT_WORDS + _NAMES
+    for index in range(options.videos):
+        video = DictationVideo.objects.create(
+            video_id=f'{options.email_prefix}-{index}'[:20],
+            title=f'Synthetic video {index + 1}',
+            duration_seconds=options.segments_per_video * 8,
+            is_processed=True,
+            status=DictationVideo.STATUS_READY,
+            progress=1.0,
+            segment_count=options.segments_per_video,
+        )
+        segments = []
+        for order in range(1, options.segments_per_video + 1):
+            transcript = _sentence(rng, vocabulary, 6, 18).capitalize() + '.'
+            segment = DictationSegment(
+                video=video, order=order, start_time=(order - 1) * 8.0, end_time=order * 8.0,
+                transcript=transcript, word_count=len(transcript.split()),
+            )
+            segment.prepare_reference()
+            segments.append(segment)
+        _bulk(DictationSegment, segments)
+        summary.videos += 1
+        summary.segments += len(segments)
@@ -0,0 +1,119 @@
+"""
+Maintenance tasks for the job queue (see vocabulary.jobs).
+
+Each function is a plain module-level function with JSON-friendly arguments,
+so it can be queued with `jobs.enqueue(...)` or listed in
+settings.JOB_SCHEDULE, and it walks its table by id in chunks, reporting
+progress as it goes.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from . import jobs
+from .models import BackgroundJob, Flashcard, StudySession
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 200
+
+
+def _chunks(queryset, chunk_size: int = CHUNK_SIZE):
+    """Yield lists of rows ordered by id, re-querying after each chunk."""
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id')[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1].pk
+        yield rows
+
+
+def backfill_audio(user_id: int = None, deck_id: int = None) -> dict:
+    """Fetch pronunciation audio for cards that have none."""
+    from .audio_service import fetch_audio_for_word
+    from .cache_utils import invalidate_user_study_cache
+
+    cards = Flashcard.objects.filter(Q(audio_url__isnull=True) | Q(audio_url=''))
+    if user_id:
+        cards = cards.filter(user_id=user_id)
+    if deck_id:
+        cards = cards.filter(deck_id=deck_id)
+    total = cards.count()
+    processed = found = 0
+    users = set()
+    for chunk in _chunks(cards):
+        for card in chunk:
+            try:
+                audio_url = fetch_audio_for_word(card.word)
+            except Exception as e:
+                logger.warning("Audio lookup for %r failed: %s", card.word, e)
+                audio_url = None
+            if audio_url:
+                Flashcard.objects.filter(pk=card.pk).update(audio_url=audio_url)
+                users.add(card.user_id)
+                found += 1
+        processed += len(chunk)
+        jobs.set_progress(processed / total if total else 1.0, f'{processed}/{total} cards')
+    for uid in users:
+        invalidate_user_study_cache(uid)
+    return {'processed': processed, 'found': found}
+
+
+def reclassify_cefr(user_id: int = None, only_auto: bool = True) -> dict:
+    """Re-run CEFR classification; by default leaves levels the user set by hand alone."""
+    from .cefr_service import cefr_classifier
+
+    cards = Flashcard.objects.all()
+    if user_id:
+        cards = cards.filter(user_id=user_id)
+    if only_auto:
+        cards = cards.filter(Q(cefr_level_auto=True) | Q(cefr_level__isnull=True) | Q(cefr_level=''))
+    total = cards.count()
+    processed = changed = 0
+    for chunk in _chunks(cards.only('id', 'word', 'cefr_level', 'cefr_level_auto')):
+        updated = []
+        for card in chunk:
+            level = cefr_classifier.get_word_level(card.word)
+            if level and level != card.cefr_level:
+                card.cefr_level, card.cefr_level_auto = level, True
+                updated.append(card)
+        Flashcard.objects.bulk_update(updated, ['cefr_level', 'cefr_level_auto'])
+        changed += len(updated)
+        processed += len(chunk)
+        jobs.set_progress(processed / total if total else 1.0, f'{processed}/{total} cards')
+    return {'processed': processed, 'changed': changed}
+
+
+def rebuild_statistics(days: int = 2, user_id: int = None) -> dict:
+    """Recompute daily and weekly statistics for the last `days` days of finished sessions."""
+    from django.contrib.auth import get_user_model
+
+    from .statistics_utils import update_daily_statistics, update_weekly_statistics
+
+    since = timezone.now() - timedelta(days=days)
+    sessions = StudySession.objects.filter(session_start__gte=since, session_end__isnull=False)
+    if user_id:
+        sessions = sessions.filter(user_id=user_id)
+    pairs = sorted({
+        (uid, timezone.localtime(start).date())
+        for uid, start in sessions.values_list('user_id', 'session_start')
+    })
+    users = get_user_model().objects.in_bulk({uid for uid, _ in pairs})
+    for n, (uid, day) in enumerate(pairs, 1):
+        update_daily_statistics(users[uid], day)
+        update_weekly_statistics(users[uid], day)
+        jobs.set_progress(n / len(pairs), f'{n}/{len(pairs)} user-days')
+    return {'user_days': len(pairs)}
+
+
+def prune_jobs(days: int = 14) -> int:
+    """Delete finished jobs older than `days` days; returns how many."""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.STATUS_DONE, BackgroundJob.STATUS_FAILED], finished_at__lt=cutoff,
+    ).delete()
+    return deleted
@@ -345,16 +345,19 @@ class FlashcardUpdateTestCase(TestCase):
         self.assertIn(response.status_code, [302, 404])
 
 
+def _llm_reply(content):
+    return {'choices': [{'message': {'content': content}}]}
+
+
 class VSTEPSuggestionsServiceTest(TestCase):
-    @patch('vocabulary.ai_service.requests.post')
-    def test_get_vstep_suggestions_returns_words(self, mock_post):
+    def setUp(self):
+        from vocabulary import llm_client
+        llm_client.breaker.reset()
+
+    @patch('vocabulary.llm_client._send')
+    def test_get_vstep_suggestions_returns_words(self, mock_send):
         """Test that get_vstep_suggestions returns a list of words from LLM."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '["phenomenon", "substantial", "prevalent"]'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        mock_send.return_value = _llm_reply('["phenomenon", "substantial", "prevalent"]')
 
         from vocabulary.ai_service import get_vstep_suggestions
         result = get_vstep_suggestions(['hello', 'world'])
@@ -362,27 +365,24 @@ class VSTEPSuggestionsServiceTest(TestCase):
         self.assertEqual(len(result), 3)
         self.assertIn('phenomenon', result)
 
-    @patch('vocabulary.ai_service.requests.post')
-    def test_get_vstep_suggestions_filters_existing_words(self, mock_post):
+    @patch('vocabulary.llm_client._send')
+    def test_get_vstep_suggestions_filters_existing_words(self, mock_send):
         """Test that words already in existing_words are filtered out."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '["hello", "phenomenon", "world"]'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        mock_send.return_value = _llm_reply('["hello", "phenomenon", "world"]')
 
         from vocabulary.ai_service import get_vstep_suggestions
         result = get_vstep_suggestions(['hello', 'world'])
         self.assertEqual(result, ['phenomenon'])
 
-    @patch('vocabulary.ai_service.requests.post')
-    def test_get_vstep_suggestions_handles_llm_failure(self, mock_post):
+    @patch('vocabulary.llm_client._send')
+    def test_get_vstep_suggestions_handles_llm_failure(self, mock_send):
         """Test graceful handling when LLM request fails."""
-        mock_post.side_effect = Exception('Connection refused')
+        import requests
+        from vocabulary.llm_client import LLMUnavailable
+        mock_send.side_effect = requests.ConnectionError('Connection refused')
 
         from vocabulary.ai_service import get_vstep_suggestions
-        with self.assertRaises(Exception):
+        with self.assertRaises(LLMUnavailable):
             get_vstep_suggestions([])
 
 
@@ -438,3 +438,1289 @@ class VSTEPSuggestionsViewTest(TestCase):
         self.assertEqual(response.status_code, 500)
         data = json.loads(response.content)
         self.assertFalse(data['success'])
+
+
+class TranslationServiceTest(TestCase):
+    @patch('vocabulary.translation_service.GoogleTranslator')
+    def test_translate_batch_uses_one_upstream_call(self, mock_translator_cls):
+        """A batch of texts is joined into a single upstream request."""
+        mock_translator_cls.return_value.translate.return_value = 'một\nhai\nba'
+
+        from vocabulary.translation_service import translate_batch
+        result = translate_batch(['one', 'two', 'three'], src='en', dest='vi')
+        self.assertEqual(result, ['một', 'hai', 'ba'])
+        self.assertEqual(mock_translator_cls.return_value.translate.call_count, 1)
+
+    @patch('vocabulary.translation_service.GoogleTranslator')
+    def test_translations_are_served_from_persistent_cache(self, mock_translator_cls):
+        """Cached texts are answered from the database without calling upstream."""
+        mock_translator_cls.return_value.translate.return_value = 'xin chào'
+
+        from vocabulary.models import TranslationCache
+        from vocabulary.translation_service import translate_text
+        self.assertEqual(translate_text('hello', src='en', dest='vi'), 'xin chào')
+        self.assertEqual(translate_text('hello', src='en', dest='vi'), 'xin chào')
+        self.assertEqual(mock_translator_cls.return_value.translate.call_count, 1)
+        self.assertTrue(TranslationCache.objects.filter(source_text='hello', target_lang='vi').exists())
+
+    @patch('vocabulary.translation_service.GoogleTranslator')
+    def test_line_count_mismatch_falls_back_to_single_calls(self, mock_translator_cls):
+        """If the joined batch comes back with the wrong line count, texts are retried one by one."""
+        mock_translator_cls.return_value.translate.side_effect = ['gộp lại', 'một', 'hai']
+
+        from vocabulary.translation_service import translate_batch
+        self.assertEqual(translate_batch(['one', 'two'], src='en', dest='vi'), ['một', 'hai'])
+
+    def test_overlapping_batches_share_in_flight_texts(self):
+        """A text already being translated for another batch is waited for, not sent again."""
+        import threading
+        from vocabulary.concurrency import SingleFlight
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        sent = []
+
+        def translate(keys):
+            sent.append(keys)
+            started.set()
+            release.wait(5)
+            return {k: k.upper() for k in keys}
+
+        first = threading.Thread(target=flight.do_many, args=(['one', 'two'], translate))
+        first.start()
+        started.wait(5)
+        results = {}
+        second = threading.Thread(target=lambda: results.update(flight.do_many(['two', 'three'], translate)))
+        second.start()
+        while len(sent) < 2:
+            release.wait(0.01)
+        release.set()
+        first.join()
+        second.join()
+        self.assertEqual(sent, [['one', 'two'], ['three']])
+        self.assertEqual(results, {'two': 'TWO', 'three': 'THREE'})
+
+
+class TranslateBatchViewTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(email='translate@example.com', password='testpass123')
+        self.client.login(email='translate@example.com', password='testpass123')
+
+    @patch('vocabulary.views.translate_batch')
+    def test_translate_batch_returns_translations(self, mock_fn):
+        mock_fn.return_value = ['một', 'hai']
+        response = self.client.post(
+            reverse('api_translate_batch'),
+            data=json.dumps({'texts': ['one', 'two']}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['translations'], ['một', 'hai'])
+
+    def test_translate_batch_rejects_non_list(self):
+        response = self.client.post(
+            reverse('api_translate_batch'),
+            data=json.dumps({'texts': 'one'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_translate_batch_rejects_bad_languages(self):
+        for languages in ({'source': ['en']}, {'target': 5}, {'target': 'klingon'}, {'source': 'xx'},
+                          {'target': 'auto'}):
+            response = self.client.post(
+                reverse('api_translate_batch'), data=json.dumps({'texts': ['one'], **languages}),
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 400, languages)
+
+    def test_translate_batch_rejects_non_object_body(self):
+        for body in (['one', 'two'], 'one'):
+            response = self.client.post(
+                reverse('api_translate_batch'), data=json.dumps(body), content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 400)
+
+
+class AutocompleteIndexTest(TestCase):
+    def setUp(self):
+        from vocabulary import autocomplete
+        from vocabulary.cefr_service import cefr_classifier
+        autocomplete.reset_indexes()
+        self.addCleanup(autocomplete.reset_indexes)
+        self.wordlist_patch = patch.dict(cefr_classifier.wordlist_data, {
+            'A1': {'apple'}, 'A2': set(), 'B1': {'application'},
+            'B2': set(), 'C1': {'apparatus'}, 'C2': set(),
+        })
+        self.wordlist_patch.start()
+        self.addCleanup(self.wordlist_patch.stop)
+        self.user = User.objects.create_user(email='autocomplete@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Deck')
+
+    def test_prefix_results_are_ranked_by_cefr_level(self):
+        from vocabulary.autocomplete import suggest
+        self.assertEqual(suggest('app'), ['apple', 'application', 'apparatus'])
+        self.assertEqual(suggest('a'), ['apple', 'application', 'apparatus'])
+
+    def test_user_cards_are_included(self):
+        from vocabulary.autocomplete import suggest
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='Appease')
+        self.assertIn('appease', suggest('appe', user_id=self.user.id))
+
+    def test_study_saves_keep_the_user_index(self):
+        from vocabulary import autocomplete
+        card = Flashcard.objects.create(user=self.user, deck=self.deck, word='appease')
+        autocomplete.suggest('appe', user_id=self.user.id)
+        card.times_seen_today = 1
+        card.save(update_fields=['times_seen_today'])
+        self.assertIn(self.user.id, autocomplete._user_indexes)
+        card.word = 'appeal'
+        card.save(update_fields=['word'])
+        self.assertNotIn(self.user.id, autocomplete._user_indexes)
+
+    @patch('vocabulary.autocomplete.GLOBAL_MIN_USERS', 2)
+    def test_private_words_are_not_suggested_to_other_users(self):
+        from vocabulary import autocomplete
+        other = User.objects.create_user(email='autocomplete-other@example.com', password='testpass123')
+        Flashcard.objects.create(user=other, word='appleby')
+        self.assertNotIn('appleby', autocomplete.suggest('appl', user_id=self.user.id))
+
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='Appleby')
+        autocomplete.reset_indexes()
+        third = User.objects.create_user(email='autocomplete-third@example.com', password='testpass123')
+        self.assertIn('appleby', autocomplete.suggest('appl', user_id=third.id))
+
+    def test_stale_index_is_served_while_it_is_rebuilt(self):
+        from vocabulary import autocomplete
+        autocomplete.suggest('app')
+        stale = autocomplete.get_global_index()
+        autocomplete._global_built_at -= autocomplete.GLOBAL_INDEX_TTL + 1
+        with patch('vocabulary.autocomplete.background.submit') as submit:
+            self.assertIs(autocomplete.get_global_index(), stale)
+            self.assertIs(autocomplete.get_global_index(), stale)
+        submit.assert_called_once_with(autocomplete._rebuild_global_index)
+        submit.call_args.args[0]()
+        self.assertIsNot(autocomplete.get_global_index(), stale)
+
+    @patch('vocabulary.autocomplete.get_word_suggestions_from_datamuse')
+    def test_datamuse_only_called_without_local_hits(self, mock_datamuse):
+        from vocabulary.autocomplete import suggest
+        mock_datamuse.return_value = ['zeitgeber']
+        suggest('app')
+        mock_datamuse.assert_not_called()
+        self.assertEqual(suggest('zeitg'), ['zeitgeber'])
+        mock_datamuse.assert_called_once_with('zeitg')
+
+    @patch('vocabulary.api_services.requests.get')
+    def test_datamuse_responses_are_cached(self, mock_get):
+        from vocabulary.api_services import get_word_suggestions_from_datamuse
+        mock_get.return_value.json.return_value = [{'word': 'zeitgeist'}]
+        self.assertEqual(get_word_suggestions_from_datamuse('zeitg'), ['zeitgeist'])
+        self.assertEqual(get_word_suggestions_from_datamuse('zeitg'), ['zeitgeist'])
+        self.assertEqual(mock_get.call_count, 1)
+
+
+class FlashcardSearchIndexTest(TestCase):
+    def setUp(self):
+        from vocabulary.models import Definition
+        self.client = Client()
+        self.user = User.objects.create_user(email='search@example.com', password='testpass123')
+        self.other = User.objects.create_user(email='search-other@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Search Deck')
+        self.card = Flashcard.objects.create(user=self.user, deck=self.deck, word='resilient',
+                                             general_synonyms='tough, hardy')
+        Definition.objects.create(flashcard=self.card, english_definition='able to recover quickly',
+                                  vietnamese_definition='kiên cường')
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='resign')
+        Flashcard.objects.create(user=self.other, word='resilience')
+
+    def _words(self, text, **kwargs):
+        from vocabulary.search_index import search_flashcards
+        return [r['word'] for r in search_flashcards(self.user, text, **kwargs).results]
+
+    def test_matches_word_prefix_definitions_and_synonyms(self):
+        self.assertEqual(self._words('resi'), ['resign', 'resilient'])
+        self.assertEqual(self._words('recover'), ['resilient'])
+        self.assertEqual(self._words('hardy'), ['resilient'])
+        self.assertEqual(self._words('kien cuong'), ['resilient'])
+
+    def test_exact_match_ranks_first_and_users_are_isolated(self):
+        self.assertEqual(self._words('resilient'), ['resilient'])
+        self.assertNotIn('resilience', self._words('resil'))
+
+    def test_word_substrings_are_searched_only_without_index_matches(self):
+        self.assertEqual(self._words('ilien'), ['resilient'])
+        # Only words are scanned, not definitions
+        self.assertEqual(self._words('ecove'), [])
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='presign')
+        self.assertEqual(self._words('sign'), ['presign', 'resign'])
+        # The index has matches: no substring scan is added to them
+        self.assertEqual(self._words('res'), ['resign', 'resilient'])
+        self.assertEqual(self._words('ilien', page=2, page_size=1), [])
+        self.client.login(email='search@example.com', password='testpass123')
+        data = json.loads(self.client.get(reverse('api_get_word_suggestions'), {'partial': 'ilien'}).content)
+        self.assertEqual([s['word'] for s in data['suggestions']], ['resilient'])
+        # Suggestions keep substring matches after the prefix matches
+        data = json.loads(self.client.get(reverse('api_get_word_suggestions'), {'partial': 'res'}).content)
+        self.assertEqual([s['word'] for s in data['suggestions']], ['resign', 'resilient', 'presign'])
+
+    def test_page_past_the_end_keeps_the_total(self):
+        from vocabulary.search_index import search_flashcards
+        page = search_flashcards(self.user, 'res', page=5, page_size=1)
+        self.assertEqual((page.results, page.total), ([], 2))
+        page = search_flashcards(self.user, 'ilien', page=3, page_size=1)
+        self.assertEqual((page.results, page.total), ([], 1))
+        self.client.login(email='search@example.com', password='testpass123')
+        data = json.loads(self.client.get(reverse('api_search_word_in_decks'), {'word': 'res', 'page': 5}).content)
+        self.assertTrue(data['found'])
+        self.assertEqual(data['total_matches'], 2)
+
+    def test_index_follows_edits_and_deletes(self):
+        self.card.word = 'robust'
+        self.card.save()
+        self.assertEqual(self._words('robu'), ['robust'])
+        self.card.delete()
+        self.assertEqual(self._words('robu'), [])
+
+    def test_results_page_with_preview_in_one_query(self):
+        from vocabulary.search_index import search_flashcards
+        search_flashcards(self.user, 'warmup')
+        with self.assertNumQueries(1):
+            page = search_flashcards(self.user, 'res', page=1, page_size=1)
+        self.assertEqual(page.total, 2)
+        self.assertTrue(page.has_more)
+        second = search_flashcards(self.user, 'res', page=2, page_size=1)
+        self.assertEqual(second.results[0]['definition_preview'], 'able to recover quickly')
+
+    def test_search_view_groups_results_by_deck(self):
+        self.client.login(email='search@example.com', password='testpass123')
+        response = self.client.get(reverse('api_search_word_in_decks'), {'word': 'resilient'})
+        data = json.loads(response.content)
+        self.assertTrue(data['found'])
+        self.assertEqual(data['total_matches'], 1)
+        word = data['results'][0]['words'][0]
+        self.assertTrue(word['exact_match'])
+        self.assertEqual(word['definition_preview'], 'able to recover quickly')
+
+
+class DeckCardsPaginationTest(TestCase):
+    def setUp(self):
+        from vocabulary.models import Definition
+        self.client = Client()
+        self.user = User.objects.create_user(email='pages@example.com', password='testpass123')
+        self.first = Deck.objects.create(user=self.user, name='First')
+        self.deck = Deck.objects.create(user=self.user, name='Big Deck')
+        self.last = Deck.objects.create(user=self.user, name='Last')
+        self.cards = [
+            Flashcard.objects.create(user=self.user, deck=self.deck, word=f'word{i:03d}')
+            for i in range(45)
+        ]
+        for card in self.cards:
+            Definition.objects.create(flashcard=card, english_definition=f'meaning of {card.word}',
+                                      vietnamese_definition='nghĩa')
+        self.client.login(email='pages@example.com', password='testpass123')
+
+    def _deck_detail_queries(self, deck):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('deck_detail', args=[deck.id]))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_deck_detail_renders_first_page_and_navigation(self):
+        from vocabulary.pagination import DEFAULT_PAGE_SIZE
+        response, _ = self._deck_detail_queries(self.deck)
+        self.assertEqual(len(response.context['flashcards']), DEFAULT_PAGE_SIZE)
+        self.assertEqual(response.context['next_cursor'], self.cards[DEFAULT_PAGE_SIZE - 1].id)
+        self.assertEqual(response.context['previous_deck'], self.first)
+        self.assertEqual(response.context['next_deck'], self.last)
+        self.assertEqual(response.context['deck_position'], 2)
+        self.assertEqual(response.context['total_decks'], 3)
+        self.assertContains(response, 'meaning of word000')
+        self.assertNotContains(response, 'meaning of word044')
+
+    def test_deck_detail_query_count_does_not_grow_with_deck_size(self):
+        small = Deck.objects.create(user=self.user, name='Small Deck')
+        Flashcard.objects.create(user=self.user, deck=small, word='lonely')
+        _, small_queries = self._deck_detail_queries(small)
+        _, big_queries = self._deck_detail_queries(self.deck)
+        self.assertEqual(small_queries, big_queries)
+
+    def test_deck_cards_api_walks_all_pages(self):
+        seen, after = [], None
+        while True:
+            params = {'limit': 20}
+            if after:
+                params['after'] = after
+            data = json.loads(self.client.get(reverse('api_deck_cards', args=[self.deck.id]), params).content)
+            seen += [card['id'] for card in data['cards']]
+            self.assertEqual(data['html'].count('class="flex-shrink-0 snap-center"'), len(data['cards']))
+            if not data['has_more']:
+                break
+            after = data['next_cursor']
+        self.assertEqual(seen, [card.id for card in self.cards])
+        self.assertEqual(data['cards'][-1]['definitions'][0]['english_definition'], 'meaning of word044')
+
+    def test_deck_cards_api_pages_backward_from_the_end(self):
+        url = reverse('api_deck_cards', args=[self.deck.id])
+        data = json.loads(self.client.get(url, {'direction': 'backward', 'limit': 20}).content)
+        self.assertEqual([card['id'] for card in data['cards']], [card.id for card in self.cards[25:]])
+        self.assertEqual(data['next_cursor'], self.cards[25].id)
+        data = json.loads(self.client.get(
+            url, {'direction': 'backward', 'after': data['next_cursor'], 'limit': 20}).content)
+        self.assertEqual([card['id'] for card in data['cards']], [card.id for card in self.cards[5:25]])
+        self.assertEqual(self.client.get(url, {'direction': 'sideways'}).status_code, 400)
+
+    def test_deck_cards_keep_alphabetical_order_across_pages(self):
+        deck = Deck.objects.create(user=self.user, name='Unsorted')
+        words = ['pear', 'apple', 'mango', 'banana', 'kiwi', 'cherry', 'fig']
+        for word in words:
+            Flashcard.objects.create(user=self.user, deck=deck, word=word)
+        response = self.client.get(reverse('deck_detail', args=[deck.id]))
+        self.assertEqual([card.word for card in response.context['flashcards']], sorted(words))
+
+        url = reverse('api_deck_cards', args=[deck.id])
+        seen, after = [], None
+        while True:
+            data = json.loads(self.client.get(url, {'limit': 3, **({'after': after} if after else {})}).content)
+            seen += [card['word'] for card in data['cards']]
+            if not data['has_more']:
+                break
+            after = data['next_cursor']
+        self.assertEqual(seen, sorted(words))
+        last = json.loads(self.client.get(url, {'direction': 'backward', 'limit': 3}).content)
+        self.assertEqual([card['word'] for card in last['cards']], sorted(words)[-3:])
+        self.assertEqual(self.client.get(url, {'after': 999999}).status_code, 400)
+
+    def test_deck_counts_and_audio_filter_cover_cards_not_loaded_yet(self):
+        Flashcard.objects.filter(id__in=[self.cards[3].id, self.cards[40].id]).update(audio_url='https://a.mp3')
+        Flashcard.objects.filter(id=self.cards[41].id).update(audio_url='')
+        response, _ = self._deck_detail_queries(self.deck)
+        self.assertEqual(response.context['audio_stats'], {'total': 45, 'with_audio': 2, 'without_audio': 43})
+        self.assertContains(response, 'data-total-cards="45"')
+
+        url = reverse('api_deck_cards', args=[self.deck.id])
+        data = json.loads(self.client.get(url, {'audio': 'with-audio'}).content)
+        self.assertEqual([card['id'] for card in data['cards']], [self.cards[3].id, self.cards[40].id])
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['stats'], response.context['audio_stats'])
+        data = json.loads(self.client.get(url, {'audio': 'without-audio', 'limit': 100}).content)
+        self.assertEqual(data['total'], 43)
+        self.assertIn(self.cards[41].id, [card['id'] for card in data['cards']])
+        self.assertEqual(self.client.get(url, {'audio': 'loud'}).status_code, 400)
+
+    def test_deck_cards_api_rejects_other_users_deck(self):
+        other = User.objects.create_user(email='pages-other@example.com', password='testpass123')
+        foreign = Deck.objects.create(user=other, name='Foreign')
+        response = self.client.get(reverse('api_deck_cards', args=[foreign.id]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('api_deck_cards', args=[self.deck.id]), {'after': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_flashcards_api_lists_newest_first(self):
+        data = json.loads(self.client.get(reverse('api_flashcards'), {'limit': 5}).content)
+        self.assertEqual([c['word'] for c in data['cards']], ['word044', 'word043', 'word042', 'word041', 'word040'])
+        data = json.loads(self.client.get(reverse('api_flashcards'), {'after': data['next_cursor'], 'limit': 1}).content)
+        self.assertEqual(data['cards'][0]['word'], 'word039')
+
+
+class BulkSaveFlashcardsTest(TestCase):
+    def setUp(self):
+        from vocabulary.models import Definition
+        self.client = Client()
+        self.user = User.objects.create_user(email='bulk@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Bulk Deck')
+        self.existing = Flashcard.objects.create(user=self.user, word='resilient', cefr_level='C2')
+        Definition.objects.create(flashcard=self.existing, english_definition='old meaning',
+                                  vietnamese_definition='cũ')
+        self.client.login(email='bulk@example.com', password='testpass123')
+
+    def _post(self, cards):
+        data = {'deck_id': self.deck.id}
+        for idx, card in enumerate(cards):
+            for field, value in card.items():
+                data[f'flashcards-{idx}-{field}'] = value
+        return self.client.post(reverse('save_flashcards'), data)
+
+    def _cards(self, count):
+        return [{'word': f'bulkword{i}', 'english_definition': f'meaning {i}',
+                 'vietnamese_definition': f'nghĩa {i}'} for i in range(count)]
+
+    def test_upserts_cards_and_replaces_definitions(self):
+        response = self._post([
+            {'word': 'resilient', 'phonetic': '/rɪˈzɪliənt/', 'english_definition': 'able to recover',
+             'vietnamese_definition': 'kiên cường'},
+            {'word': 'cat', 'english_definition': 'a small animal', 'vietnamese_definition': 'con mèo'},
+            {'word': ''},
+        ])
+        self.assertEqual(json.loads(response.content), {'success': True, 'saved': ['resilient', 'cat']})
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.deck, self.deck)
+        self.assertEqual(self.existing.phonetic, '/rɪˈzɪliənt/')
+        self.assertEqual(self.existing.cefr_level, 'C2')
+        self.assertEqual([d.english_definition for d in self.existing.definitions.all()], ['able to recover'])
+
+        cat = Flashcard.objects.get(user=self.user, word='cat')
+        self.assertEqual(cat.cefr_level, 'A1')
+        self.assertTrue(cat.cefr_level_auto)
+        from vocabulary.search_index import search_flashcards
+        self.assertEqual([r['word'] for r in search_flashcards(self.user, 'recover').results], ['resilient'])
+
+    def test_form_save_replaces_definitions_even_when_blank(self):
+        self._post([{'word': 'resilient', 'english_definition': '', 'vietnamese_definition': ''}])
+        self.assertEqual([(d.english_definition, d.vietnamese_definition) for d in self.existing.definitions.all()],
+                         [('', '')])
+
+    def test_invalid_card_rejects_whole_batch(self):
+        cards = self._cards(2) + [{'word': 'x' * 300}]
+        response = self._post(cards)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('2', json.loads(response.content)['errors'])
+        self.assertFalse(Flashcard.objects.filter(word__startswith='bulkword').exists())
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as small:
+            self._post(self._cards(2))
+        Flashcard.objects.filter(word__startswith='bulkword').delete()
+        with CaptureQueriesContext(connection) as large:
+            self._post(self._cards(40))
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(Flashcard.objects.filter(deck=self.deck).count(), 40)
+
+
+class DeckImportTest(TestCase):
+    def setUp(self):
+        import tempfile
+        self.client = Client()
+        self.user = User.objects.create_user(email='import@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Imported')
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, content):
+        import os
+        path = os.path.join(self.tmp.name, name)
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+        with open(path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+            f.write(content)
+        return path
+
+    def _apkg(self, notes):
+        import os
+        import sqlite3
+        import zipfile
+        collection = os.path.join(self.tmp.name, 'collection.anki2')
+        db = sqlite3.connect(collection)
+        db.execute('CREATE TABLE notes (id INTEGER PRIMARY KEY, flds TEXT)')
+        db.executemany('INSERT INTO notes (flds) VALUES (?)', [('\x1f'.join(n),) for n in notes])
+        db.commit()
+        db.close()
+        path = os.path.join(self.tmp.name, 'deck.apkg')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.write(collection, 'collection.anki2')
+            archive.writestr('media', '{}')
+        return path
+
+    def test_parses_headed_csv_and_quizlet_tsv(self):
+        from vocabulary.deck_import import iter_rows
+        csv_path = self._write('words.csv', '﻿Term,Meaning,Vietnamese\nresilient,"able to recover, quickly",kiên cường\n')
+        self.assertEqual([card for card, _ in iter_rows(csv_path, 'csv')], [
+            {'word': 'resilient', 'english_definition': 'able to recover, quickly',
+             'vietnamese_definition': 'kiên cường'},
+        ])
+        tsv_path = self._write('quizlet.txt', 'cat\ta small animal\ndog\ta loyal animal\n')
+        rows = list(iter_rows(tsv_path, 'tsv'))
+        self.assertEqual([card['word'] for card, _ in rows], ['cat', 'dog'])
+        self.assertEqual(rows[-1][1], 1.0)
+
+    def test_parses_anki_package(self):
+        from vocabulary.deck_import import ImportFormatError, iter_rows
+        path = self._apkg([('<b>serendipity</b>[sound:s.mp3]', 'a happy&nbsp;accident<br>luck')])
+        self.assertEqual([card for card, _ in iter_rows(path, 'apkg')], [
+            {'word': 'serendipity', 'english_definition': 'a happy accident; luck'},
+        ])
+        with self.assertRaises(ImportFormatError):
+            list(iter_rows(self._write('bad.apkg', b'not a zip'), 'apkg'))
+
+    def test_imports_in_chunks_and_skips_invalid_rows(self):
+        from vocabulary.deck_import import import_rows
+        rows = [({'word': f'word{i}', 'english_definition': f'meaning {i}'}, (i + 1) / 5) for i in range(4)]
+        rows.append(({'word': 'x' * 300}, 1.0))
+        progress = []
+        stats = import_rows(self.user, self.deck, iter(rows), chunk_size=2,
+                            on_progress=lambda s: progress.append(s.rows_read))
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual((stats.imported, stats.skipped), (4, 1))
+        self.assertEqual(Flashcard.objects.filter(deck=self.deck).count(), 4)
+
+    def test_reimport_keeps_existing_card_fields_and_deck(self):
+        from vocabulary.deck_import import import_rows, iter_rows
+        from vocabulary.models import Definition
+        home = Deck.objects.create(user=self.user, name='Home')
+        card = Flashcard.objects.create(user=self.user, deck=home, word='resilient', phonetic='/rɪˈzɪliənt/',
+                                        part_of_speech='adjective', audio_url='https://audio.example.com/r.mp3')
+        Definition.objects.create(flashcard=card, english_definition='able to recover')
+
+        path = self._write('words.csv', 'word\nresilient\nnovel\n')
+        stats = import_rows(self.user, self.deck, iter_rows(path, 'csv'))
+        self.assertEqual(stats.imported, 2)
+
+        card.refresh_from_db()
+        self.assertEqual(card.deck, home)
+        self.assertEqual((card.phonetic, card.part_of_speech, card.audio_url),
+                         ('/rɪˈzɪliənt/', 'adjective', 'https://audio.example.com/r.mp3'))
+        self.assertEqual([d.english_definition for d in card.definitions.all()], ['able to recover'])
+        self.assertEqual(Flashcard.objects.get(user=self.user, word='novel').deck, self.deck)
+
+    @patch('vocabulary.audio_service.fetch_audio_for_word', return_value='https://audio.example.com/cat.mp3')
+    @patch('vocabulary.deck_import._lookup', return_value={
+        'phonetic': '/kæt/', 'part_of_speech': 'noun', 'english_definition': 'a small animal', 'audio_url': '',
+    })
+    @patch('vocabulary.translation_service.translate_batch', return_value=['con mèo'])
+    def test_upload_endpoint_imports_and_enriches_in_background(self, mock_translate, mock_lookup, mock_audio):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        self.client.login(email='import@example.com', password='testpass123')
+        animals = Deck.objects.create(user=self.user, name='Animals')
+        # A card already in the deck, without definitions or audio, is not the import's to enrich
+        dog = Flashcard.objects.create(user=self.user, deck=animals, word='dog')
+        upload = SimpleUploadedFile('words.csv', b'word\ncat\n', content_type='text/csv')
+        with override_settings(BACKGROUND_TASKS_EAGER=True, MEDIA_ROOT=self.tmp.name):
+            # The job runs once the row that queues it is committed
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('api_import_deck'), {'file': upload, 'deck_id': animals.id})
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        mock_lookup.assert_called_once_with('cat')
+        dog.refresh_from_db()
+        self.assertIsNone(dog.audio_url)
+
+        status = json.loads(self.client.get(data['status_url']).content)['job']
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual((status['imported'], status['enriched']), (1, 1))
+
+        card = Flashcard.objects.get(user=self.user, word='cat')
+        self.assertEqual(card.deck.name, 'Animals')
+        self.assertEqual((card.phonetic, card.part_of_speech), ('/kæt/', 'noun'))
+        self.assertEqual(card.audio_url, 'https://audio.example.com/cat.mp3')
+        self.assertEqual([(d.english_definition, d.vietnamese_definition) for d in card.definitions.all()],
+                         [('a small animal', 'con mèo')])
+
+    def test_upload_endpoint_rejects_a_non_numeric_deck_id(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        self.client.login(email='import@example.com', password='testpass123')
+        upload = SimpleUploadedFile('words.csv', b'word\ncat\n', content_type='text/csv')
+        response = self.client.post(reverse('api_import_deck'), {'file': upload, 'deck_id': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    @patch('vocabulary.deck_import.ENRICH_CHUNK_SIZE', 2)
+    @patch('vocabulary.deck_import._enrich_chunk', side_effect=len)
+    def test_enrichment_runs_one_chunk_per_job(self, mock_enrich):
+        from vocabulary.deck_import import enrich_import_chunk
+        from vocabulary.models import BackgroundJob, ImportJob
+        for i in range(5):
+            Flashcard.objects.create(user=self.user, deck=self.deck, word=f'word{i}')
+        job = ImportJob.objects.create(user=self.user, deck=self.deck, source_name='words.csv',
+                                       file_path='', imported_count=5, enrich=True,
+                                       status=ImportJob.STATUS_ENRICHING)
+
+        enrich_import_chunk(job.pk)
+        self.assertEqual([len(call.args[0]) for call in mock_enrich.call_args_list], [2])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.enriched_count), (ImportJob.STATUS_ENRICHING, 2))
+        queued = BackgroundJob.objects.get(task='vocabulary.deck_import.enrich_import_chunk')
+        self.assertEqual(queued.args[0], job.pk)
+
+        enrich_import_chunk(*queued.args)
+        enrich_import_chunk(job.pk, Flashcard.objects.get(word='word3').pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.enriched_count), (ImportJob.STATUS_DONE, 5))
+
+    def test_rejects_anki_collection_over_the_size_cap(self):
+        from vocabulary.deck_import import ImportFormatError, iter_rows
+        path = self._apkg([('word', 'meaning')])
+        with patch('vocabulary.deck_import.MAX_ANKI_COLLECTION_BYTES', 1024):
+            with self.assertRaisesMessage(ImportFormatError, 'too large'):
+                list(iter_rows(path, 'apkg'))
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        from vocabulary.models import DailyStatistics, Definition, StudySession, StudySessionAnswer
+        from datetime import date
+        self.client = Client()
+        self.user = User.objects.create_user(email='export@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Export Deck')
+        self.card = Flashcard.objects.create(user=self.user, deck=self.deck, word='resilient',
+                                             phonetic='/rɪˈzɪliənt/', cefr_level='C1')
+        Definition.objects.create(flashcard=self.card, english_definition='able to recover',
+                                  vietnamese_definition='kiên cường')
+        Definition.objects.create(flashcard=self.card, english_definition='elastic, "springy"',
+                                  vietnamese_definition='đàn hồi')
+        session = StudySession.objects.create(user=self.user)
+        for correct in (True, False):
+            StudySessionAnswer.objects.create(session=session, flashcard=self.card, is_correct=correct,
+                                              response_time_seconds=2.5, difficulty_before=0.5,
+                                              difficulty_after=0.67)
+        DailyStatistics.objects.create(user=self.user, date=date(2024, 1, 2), correct_answers=1)
+        other = User.objects.create_user(email='export-other@example.com', password='testpass123')
+        Flashcard.objects.create(user=other, word='private')
+        self.client.login(email='export@example.com', password='testpass123')
+
+    def _get(self, **params):
+        response = self.client.get(reverse('api_export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_flashcards(self):
+        import csv
+        import io
+        rows = list(csv.DictReader(io.StringIO(self._get(dataset='flashcards', format='csv'))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['word'], 'resilient')
+        self.assertEqual(rows[0]['english_definitions'], 'able to recover | elastic, "springy"')
+
+    def test_jsonl_combines_datasets(self):
+        lines = [json.loads(line) for line in self._get(dataset='all', format='jsonl').splitlines()]
+        self.assertEqual([line['type'] for line in lines], ['flashcards', 'answers', 'answers', 'daily'])
+        self.assertEqual([line['is_correct'] for line in lines[1:3]], [True, False])
+        self.assertEqual(lines[3]['date'], '2024-01-02')
+
+    def test_anki_notes_and_invalid_combinations(self):
+        body = self._get(dataset='flashcards', format='anki', deck=self.deck.id)
+        self.assertTrue(body.startswith('#separator:tab'))
+        front, back, deck, tags = body.splitlines()[-1].split('\t')
+        self.assertEqual(deck, 'Vocabulary::Export Deck')
+        self.assertEqual(tags, 'C1')
+        self.assertIn('able to recover <i>(kiên cường)</i>', back)
+        Flashcard.objects.filter(pk=self.card.pk).update(word='R&D <lab>')
+        front = self._get(dataset='flashcards', format='anki').splitlines()[-1].split('\t')[0]
+        self.assertTrue(front.startswith('R&amp;D &lt;lab&gt;<br><i>'))
+        response = self.client.get(reverse('api_export'), {'dataset': 'all', 'format': 'csv'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command_writes_csv(self):
+        import io
+        from django.core.management import call_command
+        out = io.StringIO()
+        call_command('export_user_data', user_email='export@example.com', dataset='answers', stdout=out)
+        self.assertEqual(len(out.getvalue().strip().splitlines()), 3)
+
+
+class TranslationBundleTest(TestCase):
+    def test_bundles_are_built_once_and_immutable(self):
+        from vocabulary.context_processors import get_translation_bundle
+        bundle = get_translation_bundle('en')
+        self.assertIs(get_translation_bundle('en'), bundle)
+        self.assertIs(get_translation_bundle('fr'), bundle)
+        with self.assertRaises(TypeError):
+            bundle.manual_texts['home'] = 'changed'
+        self.assertEqual(json.loads(bundle.js_json)['home'], 'Home')
+
+    def test_versioned_script_is_cached_long_term(self):
+        from vocabulary.context_processors import get_translation_bundle
+        bundle = get_translation_bundle('vi')
+        url = reverse('js_translations', args=['vi', bundle.version])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertTrue(response.content.decode().startswith('window.manual_texts = {'))
+
+        stale = self.client.get(reverse('js_translations', args=['vi', 'stale']))
+        self.assertEqual(stale['Cache-Control'], 'no-cache')
+        self.assertEqual(self.client.get(reverse('js_translations', args=['xx', bundle.version])).status_code, 404)
+
+    def test_pages_reference_the_versioned_script(self):
+        from vocabulary.context_processors import get_translation_bundle
+        User.objects.create_user(email='bundle@example.com', password='testpass123')
+        self.client.login(email='bundle@example.com', password='testpass123')
+        response = self.client.get(reverse('deck_list'))
+        self.assertContains(response, reverse('js_translations', args=['en', get_translation_bundle('en').version]))
+
+
+class SyntheticDataBenchmarkTest(TestCase):
+    def test_generated_data_is_deterministic_and_dated(self):
+        from vocabulary.models import StudySessionAnswer
+        from datetime import date, timedelta
+        from vocabulary.synthetic_data import SyntheticOptions, clear_synthetic_data, generate
+        options = SyntheticOptions(users=1, cards_per_user=50, decks_per_user=3, days=20,
+                                   answers_per_day=4, videos=1, segments_per_video=5)
+        summary = generate(options)
+        self.assertEqual(summary.flashcards, 50)
+        self.assertEqual(summary.segments, 5)
+        words = list(Flashcard.objects.order_by('id').values_list('word', flat=True))
+        oldest = StudySessionAnswer.objects.order_by('answered_at').first().answered_at
+        self.assertLess(oldest.date(), date.today() - timedelta(days=5))
+
+        self.assertEqual(clear_synthetic_data(), 1)
+        self.assertFalse(Flashcard.objects.exists())
+        generate(options)
+        self.assertEqual(list(Flashcard.objects.order_by('id').values_list('word', flat=True)), words)
+
+    def test_run_benchmarks_command_reports_every_benchmark(self):
+        import io
+        from django.core.management import call_command
+        from vocabulary.benchmarks import BENCHMARKS
+        call_command('generate_synthetic_data', users=1, cards_per_user=40, decks_per_user=2, days=5,
+                     answers_per_day=3, videos=1, segments_per_video=3, stdout=io.StringIO())
+        out = io.StringIO()
+        with patch('builtins.print'):
+            call_command('run_benchmarks', iterations=2, warmup=0, stdout=out, stderr=io.StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report['benchmarks']), set(BENCHMARKS))
+        dashboard = report['benchmarks']['dashboard']
+        self.assertEqual(dashboard['status_codes'], {'200': 2})
+        self.assertGreater(dashboard['queries']['mean'], 0)
+        self.assertLessEqual(dashboard['latency_ms']['p50'], dashboard['latency_ms']['max'])
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        from vocabulary import metrics
+        metrics.reset()
+        self.user = User.objects.create_user(email='metrics@example.com', password='testpass123')
+        self.client.login(email='metrics@example.com', password='testpass123')
+
+    def test_server_timing_header_reports_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('deck_list'))
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertRegex(timing, r'total;dur=[\d.]+$')
+
+    def test_cache_and_outbound_http_are_counted(self):
+        import requests
+        from django.core.cache import cache
+        from vocabulary import metrics
+        metrics.install_http_instrumentation()
+        with metrics.collect() as collected, patch('requests.adapters.HTTPAdapter.send') as send:
+            send.return_value = MagicMock(status_code=200, is_redirect=False, headers={})
+            cache.set('metrics-key', 1)
+            cache.get('metrics-key')
+            cache.get_many(['metrics-key', 'missing-key'])
+            requests.Session().send(requests.Request('GET', 'https://example.com').prepare())
+        self.assertEqual((collected.cache_hits, collected.cache_misses), (2, 1))
+        self.assertEqual(collected.http_calls, 1)
+        self.assertGreater(collected.queries, 0)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get(reverse('deck_list'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        with self.settings(METRICS_TOKEN='scrape-me'):
+            self.client.logout()
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-me')
+        self.assertEqual(response.status_code, 200)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.login(email='metrics@example.com', password='testpass123')
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="deck_list"} 1', body)
+        self.assertIn('http_requests_total{view="deck_list",status="2xx"} 1', body)
+        self.assertIn('http_request_queries_bucket{view="deck_list",le="+Inf"} 1', body)
+
+
+class RequestProfilerTest(TestCase):
+    def setUp(self):
+        import shutil
+        import tempfile
+        media_root, profile_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, profile_root, ignore_errors=True)
+        self.profile_root = profile_root
+        override = self.settings(MEDIA_ROOT=media_root, PROFILE_ROOT=profile_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user(email='profiler@example.com', password='testpass123')
+        self.client.login(email='profiler@example.com', password='testpass123')
+
+    def test_only_staff_can_profile(self):
+        from vocabulary.models import RequestProfile
+        response = self.client.get(reverse('deck_list'), {'_profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_profile_report_has_call_tree_and_sql(self):
+        from vocabulary.models import RequestProfile
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('deck_list'), HTTP_X_PROFILE='1')
+        profile = RequestProfile.objects.get(pk=response['X-Profile-Id'])
+        self.assertEqual(profile.view_name, 'deck_list')
+        self.assertGreater(profile.query_count, 0)
+        import os
+        report_path = profile.report.path
+        # Kept out of MEDIA_ROOT under an unguessable name
+        self.assertTrue(report_path.startswith(self.profile_root))
+        self.assertRegex(os.path.basename(report_path), r'-deck_list-[0-9a-f]{16}\.txt$')
+        with profile.report.open('rb') as f:
+            report = f.read().decode()
+        self.assertIn('== Functions by cumulative time ==', report)
+        self.assertIn('deck_list', report)
+        self.assertIn(f'== SQL ({profile.query_count} statements) ==', report)
+
+        download = reverse('admin:vocabulary_requestprofile_download', args=[profile.pk, 'report'])
+        self.assertEqual(self.client.get(download).status_code, 404)  # Staff without view permission
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertEqual(b''.join(self.client.get(download).streaming_content).decode(), report)
+
+        profile.delete()
+        self.assertFalse(os.path.exists(report_path))
+
+
+class SQLiteTuningTest(TestCase):
+    def test_new_connections_get_the_configured_pragmas(self):
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+    def test_pragma_values_are_validated(self):
+        from vocabulary.db_tuning import pragma_statements
+        statements = pragma_statements({'synchronous': 'NORMAL', 'cache_size': -2000,
+                                        'temp_store': 'MEMORY; DROP TABLE x', 'user_version': 3})
+        self.assertEqual(statements, ['PRAGMA synchronous = NORMAL', 'PRAGMA cache_size = -2000'])
+
+    def test_db_maintenance_reports_fragmentation(self):
+        import io
+        from django.core.management import call_command
+        out = io.StringIO()
+        call_command('db_maintenance', skip_analyze=True, stdout=out)
+        self.assertIn('fragmentation', out.getvalue())
+        self.assertIn('PRAGMA optimize', out.getvalue())
+
+    def test_tuned_writers_do_not_hit_locked_errors(self):
+        from vocabulary.benchmarks import sqlite_write_throughput
+        report = sqlite_write_throughput(writers=4, transactions=25)
+        self.assertEqual(report['tuned']['commits'], 100)
+        self.assertEqual(report['tuned']['locked_errors'], 0)
+
+
+class RandomSelectionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='sampling@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Sampling')
+        Flashcard.objects.bulk_create([Flashcard(user=self.user, deck=self.deck, word=f'word{i}') for i in range(10)])
+
+    def test_random_row_reaches_every_row_without_order_by_random(self):
+        import random
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from vocabulary.sampling import random_row
+        qs = Flashcard.objects.filter(user=self.user)
+        rng = random.Random(1)
+        with CaptureQueriesContext(connection) as queries:
+            seen = {random_row(qs, count=10, rng=rng).word for _ in range(200)}
+        self.assertEqual(len(seen), 10)
+        self.assertFalse(any('RANDOM()' in q['sql'].upper() for q in queries))
+        # A known count leaves one offset read per row
+        self.assertEqual(len(queries), 200)
+        self.assertIsNone(random_row(qs.filter(word='missing')))
+        # A stale count still returns a row
+        self.assertIsNotNone(random_row(qs, count=50, rng=rng))
+
+    def test_random_row_is_uniform_across_key_gaps(self):
+        import random
+        from vocabulary.sampling import random_row
+        other = User.objects.create_user(email='other-sampling@example.com', password='testpass123')
+        other_deck = Deck.objects.create(user=other, name='Other')
+        # Another user's cards leave a wide gap before the next card of ours
+        Flashcard.objects.bulk_create([Flashcard(user=other, deck=other_deck, word=f'other{i}') for i in range(200)])
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='after_gap')
+        qs = Flashcard.objects.filter(user=self.user)
+        rng = random.Random(5)
+        picks = [random_row(qs, count=11, rng=rng).word for _ in range(1100)]
+        # Uniform odds give about 100 picks; gap-weighted probing gave most of them
+        self.assertLess(picks.count('after_gap'), 160)
+
+    def test_random_sample_returns_distinct_rows(self):
+        from vocabulary.sampling import random_sample
+        words = random_sample(Flashcard.objects.filter(user=self.user).values_list('word', flat=True), 3)
+        self.assertEqual(len(set(words)), 3)
+        self.assertEqual(len(random_sample(Flashcard.objects.filter(user=self.user), 50)), 10)
+        self.assertEqual(random_sample(Flashcard.objects.none(), 3), [])
+
+    def test_random_sample_is_not_drawn_from_one_window(self):
+        import random
+        from vocabulary.sampling import random_sample
+        Flashcard.objects.bulk_create([Flashcard(user=self.user, deck=self.deck, word=f'extra{i}') for i in range(90)])
+        qs = Flashcard.objects.filter(user=self.user)
+        rng = random.Random(3)
+        spans = []
+        for _ in range(20):
+            ids = [card.id for card in random_sample(qs, 5, rng=rng)]
+            spans.append(max(ids) - min(ids))
+        # Five rows out of 100 chosen independently are almost never within 20 ids of each other
+        self.assertGreater(sorted(spans)[len(spans) // 2], 40)
+
+
+class QueryPlanTest(TestCase):
+    def test_catalogued_queries_use_indexes(self):
+        from vocabulary.query_plans import check_plans
+        flagged = {report.name: report.problems for report in check_plans() if report.problems}
+        self.assertEqual(flagged, {})
+
+    def test_scans_and_temp_btrees_are_flagged(self):
+        from vocabulary.query_plans import plan_problems
+        plan = ['SCAN vocabulary_flashcard', 'SEARCH vocabulary_deck USING INDEX x (user_id=?)',
+                'USE TEMP B-TREE FOR ORDER BY', 'SCAN U0 USING COVERING INDEX y']
+        self.assertEqual(plan_problems(plan), ['full scan: SCAN vocabulary_flashcard',
+                                               'temp b-tree: USE TEMP B-TREE FOR ORDER BY'])
+        self.assertEqual(plan_problems(plan, allow=('vocabulary_flashcard', 'ORDER BY')), [])
+
+    def test_suggest_index_orders_equality_range_then_partial_condition(self):
+        from vocabulary.models import IncorrectWordReview
+        from vocabulary.query_plans import suggest_index
+        qs = Flashcard.objects.filter(user_id=1, deck_id__in=[1, 2], times_seen_today__lt=5)
+        self.assertEqual(suggest_index(qs),
+                         "Flashcard: models.Index(fields=['deck', 'user', 'times_seen_today'], name=...)")
+        qs = IncorrectWordReview.objects.filter(user_id=1, is_resolved=False).order_by('-last_error_date')
+        self.assertEqual(suggest_index(qs), "IncorrectWordReview: models.Index(fields=['user', '-last_error_date'], "
+                                            "condition=models.Q(is_resolved=False), name=...)")
+
+
+def _record(value):
+    _record.calls.append(value)
+    return {'value': value}
+
+
+_record.calls = []
+
+
+def _explode():
+    raise ValueError('boom')
+
+
+def _record_options(**options):
+    _record.calls.append(options)
+
+
+class BackgroundJobTest(TestCase):
+    def setUp(self):
+        _record.calls = []
+
+    def test_eager_job_runs_after_commit_and_stores_result(self):
+        from django.test import override_settings
+        from vocabulary import jobs
+        from vocabulary.models import BackgroundJob
+        with override_settings(BACKGROUND_TASKS_EAGER=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                job = jobs.enqueue(_record, 7)
+                self.assertEqual(_record.calls, [])
+        job.refresh_from_db()
+        self.assertEqual(_record.calls, [7])
+        self.assertEqual((job.status, job.attempts, job.result), (BackgroundJob.STATUS_DONE, 1, {'value': 7}))
+
+    def test_dedup_key_returns_the_active_job(self):
+        from vocabulary import jobs
+        first = jobs.enqueue(_record, 1, dedup_key='same', dispatch=False)
+        self.assertEqual(jobs.enqueue(_record, 2, dedup_key='same', dispatch=False).pk, first.pk)
+        self.assertEqual(jobs.work_off('test'), 1)
+        self.assertEqual(_record.calls, [1])
+        # Once the first job is done the key is free again
+        self.assertNotEqual(jobs.enqueue(_record, 3, dedup_key='same', dispatch=False).pk, first.pk)
+
+    def test_workers_claim_by_priority_and_retry_with_backoff(self):
+        from django.utils import timezone
+        from vocabulary import jobs
+        from vocabulary.models import BackgroundJob
+        failing = jobs.enqueue(_explode, max_attempts=2, dispatch=False)
+        jobs.enqueue(_record, 'low', dispatch=False)
+        jobs.enqueue(_record, 'high', priority=5, dispatch=False)
+        self.assertEqual(jobs.claim_next('test').args, ['high'])
+
+        self.assertEqual(jobs.work_off('test'), 2)
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (BackgroundJob.STATUS_QUEUED, 1))
+        self.assertIn('ValueError: boom', failing.error)
+        self.assertGreater(failing.run_after, timezone.now())  # Backing off, not due yet
+
+        BackgroundJob.objects.filter(pk=failing.pk).update(run_after=timezone.now())
+        jobs.work_off('test')
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (BackgroundJob.STATUS_FAILED, 2))
+
+    def test_stale_running_jobs_are_requeued(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from vocabulary import jobs
+        from vocabulary.models import BackgroundJob
+        job = jobs.enqueue(_record, 1, max_attempts=2, dispatch=False)
+        jobs.claim(job.pk, 'dead-worker')
+        self.assertEqual(jobs.requeue_stale(), 0)
+        self.assertEqual(jobs.requeue_stale(now=timezone.now() + timedelta(hours=1)), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (BackgroundJob.STATUS_QUEUED, ''))
+
+    def test_scheduler_queues_each_periodic_task_once_per_interval(self):
+        from django.test import override_settings
+        from vocabulary import jobs
+        path = f'{__name__}._record'
+        with override_settings(JOB_SCHEDULE={path: 3600}):
+            self.assertEqual([job.task for job in jobs.enqueue_due()], [path])
+            self.assertEqual(jobs.enqueue_due(), [])
+
+    def test_housekeeping_renews_own_leases_and_recovers_dead_workers_jobs(self):
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+        from vocabulary import jobs
+        from vocabulary.models import BackgroundJob
+        long_ago = timezone.now() - timedelta(hours=1)
+        mine = jobs.enqueue(_record, 1, dispatch=False)
+        jobs.claim(mine.pk, 'this-process')
+        dead = jobs.enqueue(_record, 2, dedup_key='ingest:1', max_attempts=2, dispatch=False)
+        jobs.claim(dead.pk, 'restarted-process')
+        BackgroundJob.objects.update(locked_at=long_ago)
+
+        jobs._running.add(mine.pk)
+        self.addCleanup(jobs._running.discard, mine.pk)
+        with override_settings(JOB_SCHEDULE={f'{__name__}._explode': 3600}):
+            scheduled = jobs.maintain()
+        self.assertEqual(len(scheduled), 1)
+        mine.refresh_from_db()
+        dead.refresh_from_db()
+        self.assertEqual(mine.status, BackgroundJob.STATUS_RUNNING)
+        self.assertGreater(mine.locked_at, long_ago)
+        self.assertEqual(dead.status, BackgroundJob.STATUS_QUEUED)
+        self.assertEqual(jobs.enqueue(_record, 3, dedup_key='ingest:1', dispatch=False).pk, dead.pk)
+
+        # The web process only runs jobs when asked to
+        with override_settings(BACKGROUND_TASKS_EAGER=False):
+            self.assertFalse(jobs.start_in_process_worker())
+
+    def test_run_workers_once_runs_due_jobs(self):
+        import io
+        from django.core.management import call_command
+        from vocabulary import jobs
+        jobs.enqueue(_record, 1, dispatch=False)
+        out = io.StringIO()
+        call_command('run_workers', once=True, no_scheduler=True, stdout=out)
+        self.assertIn('Ran 1 jobs', out.getvalue())
+        self.assertEqual(_record.calls, [1])
+
+
+    def test_interactive_jobs_have_a_lane_long_jobs_cannot_fill(self):
+        from django.test import override_settings
+        from vocabulary import jobs
+        with override_settings(BACKGROUND_TASKS_EAGER=False, JOBS_RUN_IN_PROCESS=True), \
+                patch('vocabulary.jobs.background') as lanes:
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue(_record, 'import', priority=5)
+                jobs.enqueue(_record, 'check', priority=jobs.INTERACTIVE_PRIORITY)
+        lanes.submit.assert_called_once_with(jobs.work_off)
+        lanes.submit_interactive.assert_called_once_with(jobs.work_off, min_priority=jobs.INTERACTIVE_PRIORITY)
+
+        # The interactive lane only takes interactive jobs
+        self.assertEqual(jobs.work_off('test', min_priority=jobs.INTERACTIVE_PRIORITY), 1)
+        self.assertEqual(_record.calls, ['check'])
+        self.assertEqual(jobs.work_off('test', min_priority=jobs.INTERACTIVE_PRIORITY), 0)
+
+    def test_web_process_runs_its_jobs_while_no_worker_is_alive(self):
+        from django.core.cache import cache
+        from django.test import override_settings
+        from vocabulary import jobs
+        self.addCleanup(cache.delete, jobs.WORKERS_ALIVE_KEY)
+        with override_settings(BACKGROUND_TASKS_EAGER=False, JOBS_RUN_IN_PROCESS=False), \
+                patch('vocabulary.jobs.background') as lanes:
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue(_record, 'alone')
+            lanes.submit.assert_called_once_with(jobs.work_off)
+
+            # A live run_workers takes the queue; the web process leaves it alone
+            jobs.mark_workers_alive()
+            lanes.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue(_record, 'worker')
+            lanes.submit.assert_not_called()
+
+    def test_enqueue_job_passes_kwargs_named_like_enqueue_options_to_the_task(self):
+        import io
+        from django.core.management import call_command
+        from vocabulary import jobs
+        options = {'priority': 'high', 'delay': 3, 'dedup_key': 'k', 'max_attempts': 9}
+        call_command('enqueue_job', f'{__name__}._record_options', kwargs=json.dumps(options), stdout=io.StringIO())
+        self.assertEqual(jobs.work_off('test'), 1)
+        self.assertEqual(_record.calls, [options])
+
+
+class LLMClientTest(TestCase):
+    def setUp(self):
+        from vocabulary import llm_client
+        llm_client.breaker.reset()
+        self.addCleanup(llm_client.breaker.reset)
+
+    @patch('vocabulary.llm_client._send')
+    def test_replies_are_cached_by_request(self, mock_send):
+        from vocabulary import llm_client
+        mock_send.return_value = _llm_reply(' ["a"] ')
+        self.assertEqual(llm_client.chat('same prompt', cache_timeout=60), '["a"]')
+        self.assertEqual(llm_client.chat('same prompt', cache_timeout=60), '["a"]')
+        self.assertEqual(mock_send.call_count, 1)
+        llm_client.chat('same prompt', temperature=0, cache_timeout=60)  # Different request
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_identical_prompts_in_flight_share_one_call(self):
+        import threading
+        from vocabulary import llm_client
+        release = threading.Event()
+        calls = []
+
+        def slow_send(url, payload, timeout):
+            calls.append(payload)
+            release.wait(5)
+            return _llm_reply('ok')
+
+        results = []
+        with patch('vocabulary.llm_client._send', side_effect=slow_send):
+            threads = [threading.Thread(target=lambda: results.append(llm_client.chat('shared'))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            while not calls:
+                release.wait(0.01)
+            release.wait(0.1)  # Let the other callers join the in-flight call
+            release.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ['ok'] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_uncoalesced_prompts_each_get_their_own_call(self):
+        import threading
+        from vocabulary import llm_client
+        both_sent = threading.Barrier(2, timeout=5)
+        calls = []
+
+        def send(url, payload, timeout):
+            calls.append(payload)
+            both_sent.wait()  # Both calls are in flight at once
+            return _llm_reply('quiz')
+
+        results = []
+        with patch('vocabulary.llm_client._send', side_effect=send):
+            threads = [threading.Thread(target=lambda: results.append(llm_client.chat('quiz', coalesce=False)))
+                       for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ['quiz', 'quiz'])
+        self.assertEqual(len(calls), 2)
+
+    @patch('vocabulary.llm_client._send')
+    def test_breaker_fails_fast_while_the_proxy_is_down(self, mock_send):
+        import requests
+        from vocabulary import llm_client
+        mock_send.side_effect = requests.ConnectTimeout('timed out')
+        for _ in range(llm_client.breaker.failure_threshold):
+            with self.assertRaises(llm_client.LLMUnavailable):
+                llm_client.chat('ping')
+        calls = mock_send.call_count
+        with self.assertRaises(llm_client.LLMUnavailable):
+            llm_client.chat('ping')
+        self.assertEqual(mock_send.call_count, calls)  # Not even attempted
+        self.assertTrue(llm_client.breaker.is_open)
+
+    def test_breaker_lets_one_trial_call_through_after_the_reset_timeout(self):
+        from vocabulary.concurrency import CircuitBreaker, CircuitOpenError
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+        breaker.record_failure()
+        breaker.before_call()  # Still closed after one failure
+        breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        now[0] = 31
+        breaker.before_call()  # The trial call
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()  # Only one at a time
+        breaker.record_success()
+        breaker.before_call()
+        self.assertFalse(breaker.is_open)
+
+    @patch('vocabulary.llm_client._send')
+    def test_client_errors_do_not_trip_the_breaker(self, mock_send):
+        import requests
+        from vocabulary import llm_client
+        response = requests.Response()
+        response.status_code = 400
+        mock_send.side_effect = requests.HTTPError(response=response)
+        for _ in range(llm_client.breaker.failure_threshold + 1):
+            with self.assertRaises(llm_client.LLMError) as raised:
+                llm_client.chat('bad request')
+            self.assertNotIsInstance(raised.exception, llm_client.LLMUnavailable)
+        self.assertFalse(llm_client.breaker.is_open)
+
+    def test_api_key_is_only_sent_to_the_proxy(self):
+        from vocabulary import llm_client
+        session = llm_client._get_session()
+        self.assertNotIn('Authorization', session.headers)
+        with patch.object(session, 'post') as mock_post, patch.object(session, 'get') as mock_get:
+            mock_post.return_value.json.return_value = _llm_reply('ok')
+            llm_client.chat('ping')
+            llm_client.download('https://cdn.example.com/image.png')
+        self.assertTrue(mock_post.call_args.kwargs['headers']['Authorization'].startswith('Bearer '))
+        self.assertNotIn('headers', mock_get.call_args.kwargs)
+
+
+class VSTEPPoolTest(TestCase):
+    def setUp(self):
+        from vocabulary.models import VSTEPWord
+        self.user = User.objects.create_user(email='pool@example.com', password='testpass123')
+        self.deck = Deck.objects.create(user=self.user, name='Known')
+        VSTEPWord.objects.bulk_create([VSTEPWord(word=f'word{i}', level='B2', rank=i) for i in range(30)])
+        Flashcard.objects.create(user=self.user, deck=self.deck, word='Word0')
+        Flashcard.objects.create(user=self.user, deck=self.deck, word=' word1!')
+
+    @patch('vocabulary.views.get_vstep_suggestions')
+    def test_suggestions_come_from_the_pool_without_the_llm(self, mock_fn):
+        self.client.login(email='pool@example.com', password='testpass123')
+        data = json.loads(self.client.post(reverse('api_vstep_suggestions')).content)
+        self.assertEqual(data['words'], [f'word{i}' for i in range(2, 22)])
+        mock_fn.assert_not_called()
+
+    def test_exhausted_or_empty_pool_falls_back(self):
+        from vocabulary.models import BackgroundJob, VSTEPWord
+        from vocabulary.vstep_pool import POOL_CACHE_KEY, suggestions_for
+        from django.core.cache import cache
+        self.assertIsNone(suggestions_for([f'word{i}' for i in range(15)]))
+        self.assertFalse(BackgroundJob.objects.exists())
+
+        VSTEPWord.objects.all().delete()
+        cache.delete(POOL_CACHE_KEY)
+        self.assertIsNone(suggestions_for([]))
+        self.assertEqual(BackgroundJob.objects.get().task, 'vocabulary.vstep_pool.refresh_pool')
+
+    @patch('vocabulary.vstep_pool.llm_client.chat')
+    def test_refresh_interleaves_bands_and_replaces_the_pool(self, mock_chat):
+        from vocabulary.models import VSTEPWord
+        from vocabulary import vstep_pool
+        mock_chat.side_effect = lambda prompt, **kwargs: json.dumps(
+            [f'{level.lower()}-{i}' for i in range(60) for level in ['B1', 'B2', 'C1'] if f'level {level}' in prompt]
+            + ['Phenomenon.'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(vstep_pool.refresh_pool(), 181)
+        self.assertEqual(vstep_pool.pool_words()[:4], ['b1-0', 'b2-0', 'c1-0', 'b1-1'])
+        self.assertTrue(VSTEPWord.objects.filter(word='phenomenon').exists())
+        self.assertFalse(VSTEPWord.objects.filter(word='word5').exists())
+
+    @patch('vocabulary.vstep_pool.llm_client.chat', return_value='["only", "a", "few"]')
+    def test_short_reply_keeps_the_current_pool(self, mock_chat):
+        from vocabulary.llm_client import LLMError
+        from vocabulary.models import VSTEPWord
+        from vocabulary.vstep_pool import refresh_pool
+        with self.assertRaises(LLMError):
+            refresh_pool()
+        self.assertEqual(VSTEPWord.objects.count(), 30)
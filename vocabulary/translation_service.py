@@ -0,0 +1,128 @@
+"""
+Translation service with a persistent cache.
+
+Translations are stored in the TranslationCache table keyed by
+(text, source language, target language), so repeated lookups survive server
+restarts and never reach Google Translate twice. Batches are sent upstream as a
+single newline-joined request. Concurrent requests are coalesced per text: a
+text already being translated for another request is waited for rather than
+sent upstream again, even when the two batches only overlap.
+"""
+
+import hashlib
+import logging
+
+from deep_translator import GoogleTranslator
+from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+
+from .concurrency import SingleFlight
+from .models import TranslationCache
+
+logger = logging.getLogger(__name__)
+
+# Google Translate rejects payloads over 5000 characters.
+MAX_BATCH_CHARS = 4500
+_BATCH_SEPARATOR = '\n'
+
+_inflight = SingleFlight()
+
+# Language codes Google Translate accepts; 'auto' is only valid as a source.
+LANGUAGE_CODES = frozenset(GOOGLE_LANGUAGES_TO_CODES.values())
+
+
+def text_hash(text: str) -> str:
+    """Return the cache key digest for a piece of source text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _get_cached(texts: list[str], src: str, dest: str) -> dict[str, str]:
+    """Return {text: translation} for the texts already in the cache."""
+    by_hash = {text_hash(t): t for t in texts}
+    rows = TranslationCache.objects.filter(
+        text_hash__in=list(by_hash), source_lang=src, target_lang=dest
+    ).values_list('text_hash', 'translated_text')
+    return {by_hash[h]: translated for h, translated in rows}
+
+
+def _store(translations: dict[str, str], src: str, dest: str):
+    TranslationCache.objects.bulk_create(
+        [
+            TranslationCache(
+                text_hash=text_hash(text),
+                source_lang=src,
+                target_lang=dest,
+                source_text=text,
+                translated_text=translated,
+            )
+            for text, translated in translations.items()
+            if translated
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _chunk(texts: list[str]) -> list[list[str]]:
+    """Group texts into newline-joinable chunks that fit in one upstream request."""
+    chunks, current, size = [], [], 0
+    for text in texts:
+        # Multi-line texts cannot be split back out of a joined batch.
+        if _BATCH_SEPARATOR in text or len(text) >= MAX_BATCH_CHARS:
+            chunks.append([text])
+            continue
+        if current and size + len(text) + 1 > MAX_BATCH_CHARS:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text) + 1
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _translate_upstream(texts: list[str], src: str, dest: str) -> dict[str, str]:
+    """Translate uncached texts, one upstream request per chunk."""
+    translator = GoogleTranslator(source=src, target=dest)
+    results = {}
+    for chunk in _chunk(texts):
+        if len(chunk) == 1:
+            results[chunk[0]] = translator.translate(chunk[0]) or ''
+            continue
+
+        joined = translator.translate(_BATCH_SEPARATOR.join(chunk)) or ''
+        parts = [p.strip() for p in joined.split(_BATCH_SEPARATOR)]
+        if len(parts) == len(chunk):
+            results.update(zip(chunk, parts))
+        else:
+            # The translator merged or split lines; fall back to one call per text.
+            logger.warning("Batch translation returned %d lines for %d texts", len(parts), len(chunk))
+            for text in chunk:
+                results[text] = translator.translate(text) or ''
+    _store(results, src, dest)
+    return results
+
+
+def translate_batch(texts: list[str], src: str = 'auto', dest: str = 'vi') -> list[str]:
+    """
+    Translate a list of texts, serving cached entries locally.
+
+    Returns translations in the same order as `texts`. Empty input strings map
+    to empty translations.
+    """
+    wanted = list(dict.fromkeys(t for t in texts if t))
+    translations = _get_cached(wanted, src, dest)
+    missing = [t for t in wanted if t not in translations]
+    if missing:
+        by_key = {(text_hash(t), src, dest): t for t in missing}
+
+        def translate_keys(keys):
+            translated = _translate_upstream([by_key[k] for k in keys], src, dest)
+            return {k: translated.get(by_key[k], '') for k in keys}
+
+        for key, translated in _inflight.do_many(list(by_key), translate_keys).items():
+            translations[by_key[key]] = translated or ''
+    return [translations.get(t, '') if t else '' for t in texts]
+
+
+def translate_text(text: str, src: str = 'auto', dest: str = 'vi') -> str:
+    """Translate a single text through the cache."""
+    return translate_batch([text], src=src, dest=dest)[0]
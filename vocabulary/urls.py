@@ -25,4 +25,5 @@ urlpatterns = [
     
     path('test-statistics/', views.test_statistics_view, name='test_statistics'),
     path('debug-study/', views.debug_study_template, name='debug_study'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
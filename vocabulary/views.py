@@ -1,16 +1,17 @@
 from django.shortcuts import render, redirect
-from django.http import HttpResponse, JsonResponse
-from .models import Flashcard, Definition, Deck, StudySession, StudySessionAnswer, IncorrectWordReview, FavoriteFlashcard, BlacklistFlashcard # Import Deck model
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from .models import Flashcard, Definition, Deck, StudySession, StudySessionAnswer, IncorrectWordReview, FavoriteFlashcard, BlacklistFlashcard, ImportJob # Import Deck model
 from django.conf import settings # Import settings
-from .api_services import get_word_suggestions_from_datamuse # Import new service functions
+from .autocomplete import suggest as suggest_completions
 from .word_details_service import get_word_details # Import the new service function
-from googletrans import Translator
 import requests
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST, require_GET
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Min, Q
 from django.db import transaction
 from django.core.paginator import Paginator
 from datetime import datetime, timedelta
@@ -18,11 +19,26 @@ from django.utils import timezone
 import re
 import os
 import json
-import sys
+import logging
 from django.contrib.auth.decorators import login_required
-from deep_translator import GoogleTranslator
+from django.utils.crypto import constant_time_compare
 from django.db.models.functions import Random
 from .ai_service import get_vstep_suggestions
+from .llm_client import LLMUnavailable
+from . import vstep_pool
+from .translation_service import LANGUAGE_CODES, translate_batch, translate_text
+from .bulk_import import BatchValidationError, save_flashcard_batch
+from .deck_import import detect_format as detect_import_format, job_status as import_job_status, start_import_job
+from .deck_export import (
+    CONTENT_TYPES as EXPORT_CONTENT_TYPES, DATASETS as EXPORT_DATASETS, ExportError, export_filename, export_lines,
+)
+from .search_index import search_flashcards, word_suggestions, DEFAULT_PAGE_SIZE as DEFAULT_SEARCH_PAGE_SIZE
+from .pagination import keyset_page, parse_page_params, DEFAULT_PAGE_SIZE as PAGE_SIZE
+from .sampling import random_row, random_sample
+from .context_processors import SUPPORTED_LANGUAGES, get_translation_bundle
+from . import metrics as request_metrics
+
+logger = logging.getLogger(__name__)
 
 # Difficulty-Based Card Selection Configuration
 SPACED_REPETITION_CONFIG = {
@@ -255,14 +271,14 @@ def _get_next_card_enhanced(user, deck_ids=None, seen_card_ids=None):
 
     if not weighted_pool:
         # No cards available in any group, try to get any card at all as a fallback
-        return base_qs.order_by('?').first()
+        return random_row(base_qs)
 
     # Randomly select a difficulty level from the weighted pool
     selected_difficulty = _rnd_local.choice(weighted_pool)
 
     # Fetch one random card from the selected difficulty group
     selected_qs = difficulty_groups[selected_difficulty]
-    card = selected_qs.order_by('?').first()
+    card = random_row(selected_qs, count=difficulty_counts[selected_difficulty])
 
     return card
 
@@ -305,14 +321,12 @@ def _update_card_difficulty(card, correct: bool, grade: int = None):
     if grade is not None:
         # Use explicit grade from user feedback (0-3)
         difficulty_level = grade
-        print(f"DIFFICULTY UPDATE: Using grade {grade} -> difficulty_level={difficulty_level}", file=sys.stderr)
     else:
         # Default mapping for correct/incorrect answers
         if correct:
             difficulty_level = 2  # Good (medium difficulty)
         else:
             difficulty_level = 0  # Again (highest difficulty)
-        print(f"DIFFICULTY UPDATE: Using correct={correct} -> difficulty_level={difficulty_level}", file=sys.stderr)
 
     # Store the difficulty level (0-3) in the difficulty_score field
     # We'll repurpose this field: 0.0=Again, 0.33=Hard, 0.67=Good, 1.0=Easy
@@ -334,9 +348,12 @@ def _update_card_difficulty(card, correct: bool, grade: int = None):
     card.interval = 0       # Not used
     card.next_review = timezone.now().date()  # Always available
 
-    print(f"DIFFICULTY UPDATE: Card '{card.word}' set to difficulty_score={card.difficulty_score} (level {difficulty_level})", file=sys.stderr)
+    logger.debug("Card %s set to difficulty_score=%s (level %s)", card.pk, card.difficulty_score, difficulty_level)
 
-    card.save()
+    card.save(update_fields=[
+        'total_reviews', 'correct_reviews', 'difficulty_score', 'last_reviewed',
+        'ease_factor', 'repetitions', 'interval', 'next_review',
+    ])
 
 
 @login_required
@@ -418,7 +435,7 @@ def api_next_question(request):
             qs = qs.filter(cefr_level__in=cefr_levels)
             logger.info(f"Applied CEFR filter for levels: {cefr_levels}")
         
-        card = qs.order_by('?').first()
+        card = random_row(qs)
 
     elif study_mode == 'favorites':
         blacklisted_card_ids = BlacklistFlashcard.objects.filter(user=request.user).values_list('flashcard_id', flat=True)
@@ -427,7 +444,7 @@ def api_next_question(request):
             favorite_qs = favorite_qs.exclude(flashcard_id__in=seen_card_ids)
         if blacklisted_card_ids.exists():
             favorite_qs = favorite_qs.exclude(flashcard_id__in=blacklisted_card_ids)
-        favorite_card = favorite_qs.order_by('?').first()
+        favorite_card = random_row(favorite_qs)
         if favorite_card:
             card = favorite_card.flashcard
 
@@ -441,7 +458,7 @@ def api_next_question(request):
             seen_card_ids = []  # Reset for infinite loop
             unseen_incorrect_qs = incorrect_qs
 
-        incorrect_word = unseen_incorrect_qs.select_related('flashcard').order_by('?').first()
+        incorrect_word = random_row(unseen_incorrect_qs.select_related('flashcard'))
         if incorrect_word:
             card = incorrect_word.flashcard
             original_question_type = incorrect_word.question_type
@@ -502,8 +519,9 @@ def api_next_question(request):
     }
 
     if mode == 'mc':
-        distractor_candidates = list(Flashcard.objects.filter(user=request.user)
-                                     .exclude(word=card.word).order_by('?').values_list('word', flat=True)[:50])
+        distractor_candidates = random_sample(
+            Flashcard.objects.filter(user=request.user).exclude(word=card.word).values_list('word', flat=True), 50,
+        )
         filtered_distractors = _filter_semantic_distractors(card.word, distractor_candidates)
         final_distractors = filtered_distractors[:3]
         if len(final_distractors) < 3:
@@ -884,7 +902,7 @@ def suggest_words(request):
     if settings.ENABLE_DEBUG:
         print(f"[DEBUG] suggest_words called with query: {query}")
 
-    suggestions = get_word_suggestions_from_datamuse(query)
+    suggestions = suggest_completions(query, user_id=request.user.id)
 
     if settings.ENABLE_DEBUG:
         print(f"[DEBUG] Returning suggestions: {suggestions}")
@@ -930,7 +948,6 @@ def save_flashcards(request):
         else:
             return JsonResponse({'success': False, 'error': 'Vui lòng chọn một bộ thẻ.'}, status=400)
             
-        saved_words = []
         data = {}
 
         # Group data by index from request.POST and request.FILES
@@ -952,44 +969,27 @@ def save_flashcards(request):
                     data[idx] = {}
                 data[idx][field] = value
 
-        # Process each flashcard group
-        for idx in sorted(data.keys()):
-            card_data = data[idx]
-            word = card_data.get('word')
-            if not word:
-                continue
-
-            # Use update_or_create to avoid IntegrityError for existing words
-            # and allow users to update existing flashcards.
-            defaults = {
-                'phonetic': card_data.get('phonetic'),
-                'part_of_speech': card_data.get('part_of_speech'),
-                'audio_url': card_data.get('audio_url'),
-                'deck': deck
-            }
-            
-            # Only update image if a new one is provided
-            if 'image' in card_data:
-                defaults['image'] = card_data.get('image')
-
-            flashcard, created = Flashcard.objects.update_or_create(
-                user=request.user,
-                word=word,
-                defaults=defaults
-            )
-
-            # Update CEFR level for new or updated flashcards
-            if created or not flashcard.cefr_level:
-                flashcard.update_cefr_level(save=True)
+        # Fill in missing Vietnamese definitions with one batched translation
+        untranslated = [
+            card_data for card_data in data.values()
+            if card_data.get('word') and card_data.get('english_definition')
+            and not card_data.get('vietnamese_definition', '').strip()
+        ]
+        if untranslated:
+            try:
+                translations = translate_batch(
+                    [card_data['english_definition'] for card_data in untranslated], src='en', dest='vi'
+                )
+                for card_data, translated in zip(untranslated, translations):
+                    card_data['vietnamese_definition'] = translated
+            except Exception as e:
+                logger.warning("Batch translation failed while saving flashcards: %s", e)
 
-            # Clear old definitions and create new one(s)
-            flashcard.definitions.all().delete()
-            Definition.objects.create(
-                flashcard=flashcard,
-                english_definition=card_data.get('english_definition'),
-                vietnamese_definition=card_data.get('vietnamese_definition', '')
-            )
-            saved_words.append(word)
+        # Validate the whole batch, then upsert cards and definitions in bulk
+        try:
+            saved_words = save_flashcard_batch(request.user, deck, data)
+        except BatchValidationError as e:
+            return JsonResponse({'success': False, 'error': str(e), 'errors': e.errors}, status=400)
 
         if not saved_words:
             return JsonResponse({'success': False, 'error': 'No valid flashcard data received.'})
@@ -1015,34 +1015,131 @@ def deck_list(request):
 
 @login_required
 def deck_detail(request, deck_id):
-    try:
-        deck = Deck.objects.get(id=deck_id, user=request.user)
-        flashcards = Flashcard.objects.filter(deck=deck).prefetch_related('definitions')
-
-        # Get navigation information for deck-to-deck navigation
-        user_decks = Deck.objects.filter(user=request.user).order_by('id')
-
-        # Find previous and next decks
-        previous_deck = user_decks.filter(id__lt=deck_id).order_by('-id').first()
-        next_deck = user_decks.filter(id__gt=deck_id).order_by('id').first()
-
-        # Get deck position information
-        deck_position = user_decks.filter(id__lte=deck_id).count()
-        total_decks = user_decks.count()
-
-        context = {
-            'deck': deck,
-            'flashcards': flashcards,
-            'previous_deck': previous_deck,
-            'next_deck': next_deck,
-            'deck_position': deck_position,
-            'total_decks': total_decks,
-            'has_navigation': total_decks > 1,  # Show navigation only if user has multiple decks
-        }
-        return render(request, 'vocabulary/deck_detail.html', context)
-    except Deck.DoesNotExist:
+    # Previous/next deck ids, this deck's position and the deck count in one query
+    navigation = Deck.objects.filter(user=request.user).aggregate(
+        previous_id=Max('id', filter=Q(id__lt=deck_id)),
+        next_id=Min('id', filter=Q(id__gt=deck_id)),
+        position=Count('id', filter=Q(id__lte=deck_id)),
+        total=Count('id'),
+    )
+    decks = Deck.objects.filter(
+        user=request.user,
+        id__in=[deck_id, navigation['previous_id'], navigation['next_id']],
+    ).in_bulk()
+    deck = decks.get(deck_id)
+    if deck is None:
         return redirect('deck_list')
 
+    # Only the first page is rendered; deck_detail.js fetches the rest from api_deck_cards
+    page = keyset_page(Flashcard.objects.filter(deck=deck), ordering=DECK_CARD_ORDER)
+
+    context = {
+        'deck': deck,
+        'flashcards': page.items,
+        'next_cursor': page.next_cursor,
+        'audio_stats': _deck_audio_stats(deck),
+        'previous_deck': decks.get(navigation['previous_id']),
+        'next_deck': decks.get(navigation['next_id']),
+        'deck_position': navigation['position'],
+        'total_decks': navigation['total'],
+        'has_navigation': navigation['total'] > 1,  # Show navigation only if user has multiple decks
+    }
+    return render(request, 'vocabulary/deck_detail.html', context)
+
+
+# Deck pages list cards alphabetically, as Flashcard.Meta.ordering does
+DECK_CARD_ORDER = ('word', 'id')
+
+# Values of the deck detail audio filter
+AUDIO_FILTERS = {
+    'with-audio': Q(audio_url__isnull=False) & ~Q(audio_url=''),
+    'without-audio': Q(audio_url__isnull=True) | Q(audio_url=''),
+}
+
+
+def _deck_audio_stats(deck):
+    """Card counts for the whole deck, with and without audio, in one query."""
+    stats = Flashcard.objects.filter(deck=deck).aggregate(
+        total=Count('id'),
+        with_audio=Count('id', filter=AUDIO_FILTERS['with-audio']),
+    )
+    stats['without_audio'] = stats['total'] - stats['with_audio']
+    return stats
+
+
+@login_required
+@require_GET
+def api_deck_cards(request, deck_id):
+    """
+    Return the next page of a deck's cards for the deck detail carousel.
+
+    Each page carries the cards as JSON plus the same slides pre-rendered as
+    HTML, and `next_cursor` to pass back as `after` for the following page.
+    With `direction=backward` the page holds the cards just before `after`
+    (the deck's last cards without it), still in deck order, and `next_cursor`
+    continues backwards. `audio` (with-audio / without-audio) restricts the
+    cards to the audio filter. Since the page only holds part of the deck, the
+    deck-wide audio `stats` and the `total` number of cards matching the
+    filter come with it.
+    """
+    try:
+        after, limit = parse_page_params(request.GET)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid page parameters'}, status=400)
+    audio = request.GET.get('audio') or 'all'
+    if audio != 'all' and audio not in AUDIO_FILTERS:
+        return JsonResponse({'success': False, 'error': 'Invalid audio filter'}, status=400)
+    direction = request.GET.get('direction') or 'forward'
+    if direction not in ('forward', 'backward'):
+        return JsonResponse({'success': False, 'error': 'Invalid direction'}, status=400)
+
+    deck = Deck.objects.filter(id=deck_id, user=request.user).first()
+    if deck is None:
+        return JsonResponse({'success': False, 'error': 'Deck not found'}, status=404)
+
+    flashcards = Flashcard.objects.filter(deck=deck)
+    if audio != 'all':
+        flashcards = flashcards.filter(AUDIO_FILTERS[audio])
+    stats = _deck_audio_stats(deck)
+    backward = direction == 'backward'
+    try:
+        page = keyset_page(flashcards, after=after, limit=limit, descending=backward, ordering=DECK_CARD_ORDER)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid page parameters'}, status=400)
+    cards = page.items[::-1] if backward else page.items
+    html = render_to_string(
+        'vocabulary/partials/deck_card_slides.html', {'flashcards': cards}, request=request
+    )
+    return JsonResponse({
+        'success': True,
+        'cards': [_serialize_card(card) for card in cards],
+        'html': html,
+        'next_cursor': page.next_cursor,
+        'has_more': page.has_more,
+        'stats': stats,
+        'total': {'all': stats['total'], 'with-audio': stats['with_audio'],
+                  'without-audio': stats['without_audio']}[audio],
+    })
+
+
+def _serialize_card(card):
+    return {
+        'id': card.id,
+        'word': card.word,
+        'phonetic': card.phonetic or '',
+        'part_of_speech': card.part_of_speech or '',
+        'audio_url': card.audio_url or '',
+        'cefr_level': card.cefr_level or '',
+        'deck_id': card.deck_id,
+        'definitions': [
+            {
+                'english_definition': d.english_definition,
+                'vietnamese_definition': d.vietnamese_definition,
+            }
+            for d in card.definitions.all()
+        ],
+    }
+
 
 @login_required
 @require_POST
@@ -1081,12 +1178,39 @@ def delete_deck(request, deck_id):
 
 @login_required
 def flashcard_list(request):
-    flashcards = Flashcard.objects.filter(user=request.user).order_by('-created_at')
-    flashcard_defs = []
-    for card in flashcards:
-        definitions = card.definitions.all()
-        flashcard_defs.append((card, definitions))
-    return render(request, 'vocabulary/flashcard_list.html', {'flashcard_defs': flashcard_defs})
+    try:
+        after, limit = parse_page_params(request.GET)
+    except ValueError:
+        after, limit = None, PAGE_SIZE
+    # Newest first; ids grow with created_at so the id cursor keeps that order
+    page = keyset_page(Flashcard.objects.filter(user=request.user), after=after, limit=limit, descending=True)
+    flashcard_defs = [(card, card.definitions.all()) for card in page.items]
+    return render(request, 'vocabulary/flashcard_list.html', {
+        'flashcard_defs': flashcard_defs,
+        'next_cursor': page.next_cursor,
+    })
+
+
+@login_required
+@require_GET
+def api_flashcards(request):
+    """Keyset-paginated JSON list of the user's cards, newest first, optionally for one deck."""
+    try:
+        after, limit = parse_page_params(request.GET)
+        deck_id = int(request.GET['deck']) if request.GET.get('deck') else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid page parameters'}, status=400)
+
+    flashcards = Flashcard.objects.filter(user=request.user)
+    if deck_id is not None:
+        flashcards = flashcards.filter(deck_id=deck_id)
+    page = keyset_page(flashcards, after=after, limit=limit, descending=True)
+    return JsonResponse({
+        'success': True,
+        'cards': [_serialize_card(card) for card in page.items],
+        'next_cursor': page.next_cursor,
+        'has_more': page.has_more,
+    })
 
 @login_required
 @require_GET
@@ -1100,7 +1224,8 @@ def check_word_exists(request):
 def api_search_word_in_decks(request):
     """
     Search for a specific word across all user's decks.
-    Returns which decks contain the word and deck information.
+    Matches words, definitions and synonyms through the search index and
+    returns one ranked page of results grouped by deck.
     """
     search_word = request.GET.get('word', '').strip()
 
@@ -1111,13 +1236,15 @@ def api_search_word_in_decks(request):
         }, status=400)
 
     try:
-        # Search for the word in user's flashcards (case-insensitive)
-        matching_cards = Flashcard.objects.filter(
-            user=request.user,
-            word__icontains=search_word
-        ).select_related('deck').order_by('word')
+        page = int(request.GET.get('page', 1))
+        page_size = int(request.GET.get('page_size', DEFAULT_SEARCH_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid page parameters'}, status=400)
 
-        if not matching_cards.exists():
+    try:
+        search_page = search_flashcards(request.user, search_word, page=page, page_size=page_size)
+
+        if not search_page.results and search_page.page == 1:
             return JsonResponse({
                 'success': True,
                 'found': False,
@@ -1125,48 +1252,37 @@ def api_search_word_in_decks(request):
                 'results': []
             })
 
-        # Group results by deck
+        # Group results by deck, keeping the ranking order
         deck_results = {}
-        for card in matching_cards:
-            deck_id = card.deck.id
-            deck_name = card.deck.name
-
+        for card in search_page.results:
+            deck_id = card['deck_id']
             if deck_id not in deck_results:
                 deck_results[deck_id] = {
                     'deck_id': deck_id,
-                    'deck_name': deck_name,
+                    'deck_name': card['deck_name'],
                     'words': []
                 }
 
-            # Get first definition for preview
-            first_definition = card.definitions.first()
-            definition_preview = ""
-            if first_definition:
-                if first_definition.english_definition:
-                    definition_preview = first_definition.english_definition[:100]
-                elif first_definition.vietnamese_definition:
-                    definition_preview = first_definition.vietnamese_definition[:100]
-
             deck_results[deck_id]['words'].append({
-                'id': card.id,
-                'word': card.word,
-                'phonetic': card.phonetic or '',
-                'part_of_speech': card.part_of_speech or '',
-                'definition_preview': definition_preview,
-                'exact_match': card.word.lower() == search_word.lower()
+                'id': card['id'],
+                'word': card['word'],
+                'phonetic': card['phonetic'],
+                'part_of_speech': card['part_of_speech'],
+                'definition_preview': card['definition_preview'],
+                'exact_match': card['word'].lower() == search_word.lower()
             })
 
-        # Convert to list and sort by exact matches first
         results = list(deck_results.values())
-        for deck_result in results:
-            deck_result['words'].sort(key=lambda x: (not x['exact_match'], x['word'].lower()))
 
         return JsonResponse({
             'success': True,
-            'found': True,
+            'found': bool(search_page.total),
             'search_word': search_word,
-            'total_matches': matching_cards.count(),
+            'total_matches': search_page.total,
             'deck_count': len(results),
+            'page': search_page.page,
+            'page_size': search_page.page_size,
+            'has_more': search_page.has_more,
             'results': results
         })
 
@@ -1192,44 +1308,20 @@ def api_get_word_suggestions(request):
         })
 
     try:
-        # Get words that start with or contain the partial word
-        # Prioritize words that start with the partial word
-        start_matches = Flashcard.objects.filter(
-            user=request.user,
-            word__istartswith=partial_word
-        ).select_related('deck').order_by('word')[:5]
-
-        contain_matches = Flashcard.objects.filter(
-            user=request.user,
-            word__icontains=partial_word
-        ).exclude(
-            word__istartswith=partial_word
-        ).select_related('deck').order_by('word')[:5]
-
-        # Combine results, prioritizing start matches
-        all_matches = list(start_matches) + list(contain_matches)
-
-        suggestions = []
-        seen_words = set()
-
-        for card in all_matches[:8]:  # Limit to 8 suggestions
-            if card.word.lower() not in seen_words:
-                seen_words.add(card.word.lower())
-
-                # Get first definition for preview
-                first_definition = card.definitions.first()
-                definition_preview = ""
-                if first_definition and first_definition.english_definition:
-                    definition_preview = first_definition.english_definition[:50]
-
-                suggestions.append({
-                    'word': card.word,
-                    'phonetic': card.phonetic or '',
-                    'part_of_speech': card.part_of_speech or '',
-                    'definition_preview': definition_preview,
-                    'deck_name': card.deck.name,
-                    'starts_with': card.word.lower().startswith(partial_word.lower())
-                })
+        # Exact and prefix matches first, then words containing the input
+        matches = word_suggestions(request.user, partial_word, limit=8)
+
+        suggestions = [
+            {
+                'word': card['word'],
+                'phonetic': card['phonetic'],
+                'part_of_speech': card['part_of_speech'],
+                'definition_preview': card['definition_preview'][:50],
+                'deck_name': card['deck_name'],
+                'starts_with': card['word'].lower().startswith(partial_word.lower())
+            }
+            for card in matches
+        ]
 
         return JsonResponse({
             'success': True,
@@ -1275,8 +1367,7 @@ def translate_to_vietnamese(request):
     if not text_to_translate:
         return JsonResponse({'error': 'No text provided'}, status=400)
     try:
-        # Sử dụng deep-translator
-        translated_text = GoogleTranslator(source='auto', target='vi').translate(text_to_translate)
+        translated_text = translate_text(text_to_translate, src='auto', dest='vi')
         return JsonResponse({'translated_text': translated_text})
     except Exception as e:
         # Ghi lại lỗi để debug
@@ -1284,6 +1375,119 @@ def translate_to_vietnamese(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required
+@require_POST
+def api_translate_batch(request):
+    """Translate many texts (e.g. every definition of a multi-card form) in one upstream call."""
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+
+    texts = data.get('texts')
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return JsonResponse({'error': 'texts must be a list of strings'}, status=400)
+    if len(texts) > 200:
+        return JsonResponse({'error': 'Too many texts (max 200)'}, status=400)
+    source = data.get('source', 'auto')
+    target = data.get('target', 'vi')
+    if not isinstance(source, str) or (source != 'auto' and source not in LANGUAGE_CODES):
+        return JsonResponse({'error': 'source must be a language code or "auto"'}, status=400)
+    if not isinstance(target, str) or target not in LANGUAGE_CODES:
+        return JsonResponse({'error': 'target must be a language code'}, status=400)
+
+    try:
+        translations = translate_batch(texts, src=source, dest=target)
+        return JsonResponse({'translations': translations})
+    except Exception as e:
+        return JsonResponse({'error': f'Translation failed: {str(e)}'}, status=500)
+
+
+@login_required
+@require_POST
+def api_import_deck(request):
+    """
+    Start importing an uploaded CSV/TSV (Quizlet) or Anki .apkg file into a deck.
+
+    The file is stored and imported in the background; poll the returned
+    status URL for progress.
+    """
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'error': 'No file uploaded'}, status=400)
+
+    fmt = request.POST.get('format') or detect_import_format(upload.name)
+    if fmt not in dict(ImportJob.FORMAT_CHOICES):
+        return JsonResponse({'success': False, 'error': f'Unsupported format: {fmt}'}, status=400)
+
+    deck_id = request.POST.get('deck_id')
+    deck_name = request.POST.get('deck_name', '').strip()
+    if deck_id:
+        try:
+            deck_id = int(deck_id)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid deck_id'}, status=400)
+        deck = Deck.objects.filter(id=deck_id, user=request.user).first()
+        if deck is None:
+            return JsonResponse({'success': False, 'error': 'Deck not found'}, status=404)
+    elif deck_name:
+        deck, _ = Deck.objects.get_or_create(user=request.user, name=deck_name)
+    else:
+        return JsonResponse({'success': False, 'error': 'deck_id or deck_name is required'}, status=400)
+
+    job = start_import_job(request.user, deck, upload, fmt, enrich=request.POST.get('enrich', '1') != '0')
+    job.refresh_from_db()
+    return JsonResponse({
+        'success': True,
+        'job': import_job_status(job),
+        'status_url': reverse('api_import_status', args=[job.id]),
+    }, status=202)
+
+
+@login_required
+@require_GET
+def api_import_status(request, job_id):
+    """Progress of one of the user's deck imports."""
+    job = ImportJob.objects.filter(id=job_id, user=request.user).first()
+    if job is None:
+        return JsonResponse({'success': False, 'error': 'Import not found'}, status=404)
+    return JsonResponse({'success': True, 'job': import_job_status(job)})
+
+
+@login_required
+@require_GET
+def api_export(request):
+    """
+    Stream the user's flashcards, answer history or daily statistics.
+
+    Query parameters: dataset (flashcards, answers, daily or a comma-separated
+    list; "all" for every dataset), format (csv, jsonl, anki) and an optional
+    deck id.
+    """
+    dataset = request.GET.get('dataset', 'flashcards')
+    datasets = list(EXPORT_DATASETS) if dataset == 'all' else [d.strip() for d in dataset.split(',') if d.strip()]
+    fmt = request.GET.get('format', 'csv')
+
+    deck_id = request.GET.get('deck') or None
+    if deck_id is not None:
+        if not deck_id.isdigit():
+            return JsonResponse({'success': False, 'error': 'Invalid deck id'}, status=400)
+        deck_id = int(deck_id)
+        if not Deck.objects.filter(id=deck_id, user=request.user).exists():
+            return JsonResponse({'success': False, 'error': 'Deck not found'}, status=404)
+
+    try:
+        lines = export_lines(request.user, datasets, fmt, deck_id=deck_id)
+    except ExportError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    response = StreamingHttpResponse(lines, content_type=EXPORT_CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(datasets, fmt)}"'
+    return response
+
+
 @login_required
 @require_GET
 def translate_word_to_vietnamese(request):
@@ -1294,15 +1498,11 @@ def translate_word_to_vietnamese(request):
         return JsonResponse({'error': 'No word provided'}, status=400)
     
     try:
-        translator = Translator()
-        # For single words, we want to get the meaning rather than direct translation
-        # First try to get a more contextual translation
-        result = translator.translate(f"The meaning of {word}", src='en', dest='vi')
-        meaning_translation = result.text
-        
-        # Also get direct word translation
-        direct_result = translator.translate(word, src='en', dest='vi')
-        direct_translation = direct_result.text
+        # For single words, we want to get the meaning rather than direct translation.
+        # Both phrasings go upstream together in a single batched request.
+        meaning_translation, direct_translation = translate_batch(
+            [f"The meaning of {word}", word], src='en', dest='vi'
+        )
         
         # Clean up the meaning translation (remove "The meaning of" part)
         if 'ý nghĩa của' in meaning_translation.lower():
@@ -1384,6 +1584,50 @@ def get_related_image(request):
 
 ## Removed debug_language and language_test since i18n is disabled
 
+JS_TRANSLATIONS_MAX_AGE = 60 * 60 * 24 * 365
+
+
+@require_GET
+def js_translations(request, lang, version):
+    """
+    Serve a language's window.manual_texts bundle as a cacheable script.
+
+    The URL carries the bundle's content hash, so the current version is
+    cached by browsers indefinitely; a stale version gets the current content
+    without long-term caching.
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        return HttpResponse(status=404)
+    bundle = get_translation_bundle(lang)
+    response = HttpResponse(
+        f"window.manual_texts = {bundle.js_json};\n",
+        content_type='application/javascript; charset=utf-8',
+    )
+    if version == bundle.version:
+        response['Cache-Control'] = f'public, max-age={JS_TRANSLATIONS_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@require_GET
+def metrics(request):
+    """
+    Per-endpoint request metrics in the Prometheus text format.
+
+    Readable by staff users, or by a scraper sending the METRICS_TOKEN bearer token.
+    """
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if not authorized and token:
+        authorized = constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not authorized:
+        return HttpResponse(status=403)
+    response = HttpResponse(request_metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
 @require_POST
 def api_set_language(request):
     """Set UI language in session for manual_texts system (en/vi)."""
@@ -2120,14 +2364,7 @@ def api_resolve_incorrect_word(request):
 @require_GET
 def api_get_incorrect_words_count(request):
     """Get count of incorrect words for the user."""
-    import sys
     try:
-        print("=" * 80, file=sys.stderr)
-        print("=== API_GET_INCORRECT_WORDS_COUNT CALLED ===", file=sys.stderr)
-        print(f"User authenticated: {request.user.is_authenticated}", file=sys.stderr)
-        print(f"User ID: {request.user.id if request.user.is_authenticated else 'None'}", file=sys.stderr)
-        print(f"User email: {getattr(request.user, 'email', 'No email')}", file=sys.stderr)
-
         # Count unresolved incorrect words grouped by question type
         counts = {
             'total': 0,
@@ -2136,27 +2373,18 @@ def api_get_incorrect_words_count(request):
             'dictation': 0
         }
 
-        # Debug: Check total IncorrectWordReview records for this user
-        total_records = IncorrectWordReview.objects.filter(user=request.user).count()
-        unresolved_records = IncorrectWordReview.objects.filter(user=request.user, is_resolved=False).count()
-        print(f"Total IncorrectWordReview records for user: {total_records}", file=sys.stderr)
-        print(f"Unresolved IncorrectWordReview records for user: {unresolved_records}", file=sys.stderr)
-
         incorrect_words = IncorrectWordReview.objects.filter(
             user=request.user,
             is_resolved=False
         ).values('question_type').annotate(count=Count('id'))
 
-        print(f"Query result: {list(incorrect_words)}", file=sys.stderr)
-
         for item in incorrect_words:
             question_type = item['question_type']
             count = item['count']
             counts[question_type] = count
             counts['total'] += count
 
-        print(f"Final counts: {counts}", file=sys.stderr)
-        print("=" * 80, file=sys.stderr)
+        logger.debug("Incorrect word counts for user %s: %s", request.user.id, counts)
 
         return JsonResponse({
             'success': True,
@@ -2164,7 +2392,7 @@ def api_get_incorrect_words_count(request):
         })
 
     except Exception as e:
-        print(f"Error in api_get_incorrect_words_count: {e}", file=sys.stderr)
+        logger.exception("Error counting incorrect words")
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
@@ -2539,7 +2767,7 @@ def api_ai_word_examples(request):
         from .ai_service import get_word_examples
         sentences = get_word_examples(word)
         return JsonResponse({'success': True, 'word': word, 'sentences': sentences})
-    except requests.exceptions.ConnectionError:
+    except LLMUnavailable:
         return JsonResponse(
             {'success': False, 'error': 'Cannot connect to LM Studio. Make sure it is running.'},
             status=503,
@@ -2551,14 +2779,17 @@ def api_ai_word_examples(request):
 @login_required
 @require_POST
 def api_vstep_suggestions(request):
-    """Return 20 AI-generated VSTEP vocabulary words the user doesn't already know."""
+    """Return 20 VSTEP vocabulary words the user doesn't already know."""
     try:
         existing_words = list(
             Flashcard.objects.filter(user=request.user).values_list('word', flat=True)
         )
-        words = get_vstep_suggestions(existing_words)
+        # Served from the shared pool; the LLM is only asked when the pool runs dry
+        words = vstep_pool.suggestions_for(existing_words)
+        if words is None:
+            words = get_vstep_suggestions(existing_words)
         return JsonResponse({'success': True, 'words': words})
-    except requests.exceptions.ConnectionError:
+    except LLMUnavailable:
         return JsonResponse(
             {'success': False, 'error': 'Cannot connect to LLM service. Make sure it is running.'},
             status=503,
@@ -0,0 +1,116 @@
+"""
+Shared pool of VSTEP vocabulary suggestions.
+
+The LLM is asked once, per CEFR band, for the words VSTEP exams test most
+often, and the combined list is stored as VSTEPWord rows ranked by
+frequency. A user's suggestions are then the first pool words that are not
+already among their flashcards, compared after normalising both sides, so
+the request is a database read instead of an LLM call carrying the user's
+whole vocabulary.
+
+The pool is refreshed weekly by the job scheduler (settings.JOB_SCHEDULE),
+or on demand with
+`python manage.py enqueue_job vocabulary.vstep_pool.refresh_pool`. An empty
+pool queues a refresh. `suggestions_for()` returns None when the pool is
+empty or the user already knows nearly all of it; the caller then falls
+back to asking the LLM for that user (ai_service.get_vstep_suggestions).
+"""
+
+import logging
+import re
+
+from django.core.cache import cache
+from django.db import transaction
+
+from . import jobs, llm_client
+from .ai_service import parse_list_reply
+from .models import VSTEPWord
+
+logger = logging.getLogger(__name__)
+
+# (CEFR band, words requested); the bands are interleaved by rank
+POOL_BANDS = (('B1', 150), ('B2', 150), ('C1', 100))
+MIN_POOL_SIZE = 100
+SUGGESTION_COUNT = 20
+POOL_CACHE_KEY = 'vstep_pool:words'
+POOL_CACHE_TIMEOUT = 60 * 60
+
+_NON_WORD = re.compile(r"[^\w\s'-]")
+_SPACES = re.compile(r'\s+')
+
+_PROMPT = (
+    'You are a VSTEP exam preparation expert. '
+    'List exactly {count} English vocabulary words at CEFR level {level} that are most commonly tested '
+    'in VSTEP exams.\n\n'
+    'Rules:\n'
+    '- Order them by frequency of appearance in VSTEP exams (most common first)\n'
+    '- Focus on academic and general English words used across Reading, Listening, Writing sections\n'
+    '- Single words only, in their base form\n'
+    '- Return ONLY a JSON array of {count} strings, no explanation\n'
+    '- Example: ["phenomenon", "substantial", "prevalent"]'
+)
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase, drop punctuation other than apostrophes and hyphens, collapse spaces."""
+    return _SPACES.sub(' ', _NON_WORD.sub('', word.lower())).strip(" '-")
+
+
+def pool_words() -> list[str]:
+    """The pool in rank order (cached)."""
+    return cache.get_or_set(
+        POOL_CACHE_KEY, lambda: list(VSTEPWord.objects.values_list('word', flat=True)), POOL_CACHE_TIMEOUT,
+    )
+
+
+def queue_refresh():
+    return jobs.enqueue(refresh_pool, dedup_key='vstep_pool.refresh', max_attempts=3)
+
+
+def suggestions_for(existing_words, count: int = SUGGESTION_COUNT) -> list[str] | None:
+    """
+    The first `count` pool words not in `existing_words`, or None when the
+    pool cannot fill the list (empty, or the user knows nearly all of it).
+    """
+    pool = pool_words()
+    if not pool:
+        queue_refresh()
+        return None
+    known = {normalize_word(w) for w in existing_words}
+    fresh = [w for w in pool if w not in known]
+    if len(fresh) < count:
+        return None
+    return fresh[:count]
+
+
+def _generate_band(level: str, count: int) -> list[str]:
+    content = llm_client.chat(_PROMPT.format(level=level, count=count), temperature=0.3,
+                              max_tokens=count * 12)
+    return [normalize_word(w) for w in parse_list_reply(content)]
+
+
+def refresh_pool() -> int:
+    """Regenerate the pool from the LLM and replace the stored one; returns its size."""
+    bands = []
+    for n, (level, count) in enumerate(POOL_BANDS, 1):
+        bands.append((level, _generate_band(level, count)))
+        jobs.set_progress(n / (len(POOL_BANDS) + 1), f'{level} generated')
+
+    # Interleave the bands so the top of each one comes first
+    ranked, seen = [], set()
+    for index in range(max(len(words) for _, words in bands)):
+        for level, words in bands:
+            if index < len(words) and words[index] and words[index] not in seen and len(words[index]) <= 100:
+                seen.add(words[index])
+                ranked.append(VSTEPWord(word=words[index], level=level, rank=len(ranked)))
+
+    if len(ranked) < MIN_POOL_SIZE:
+        # Keep serving the old pool rather than a truncated one
+        raise llm_client.LLMError(f'Only {len(ranked)} usable words generated; keeping the current pool')
+
+    with transaction.atomic():
+        VSTEPWord.objects.all().delete()
+        VSTEPWord.objects.bulk_create(ranked)
+    transaction.on_commit(lambda: cache.delete(POOL_CACHE_KEY))
+    logger.info('VSTEP pool refreshed with %s words', len(ranked))
+    return len(ranked)